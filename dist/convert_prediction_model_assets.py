@@ -0,0 +1,31 @@
+from modules.utils.Utils import Utils
+from modules.configuration.Configuration import Configuration
+from modules.candlestick.Candlestick import Candlestick
+from modules.epoch.Epoch import Epoch
+from modules.prediction_model.PredictionModelAssets import PredictionModelAssets
+
+
+# CONVERT PREDICTION MODEL ASSETS
+# Converts the JSON prediction model assets of an epoch that was initialized prior to the
+# binary format.
+endpoint_name: str = "CONVERT PREDICTION MODEL ASSETS"
+Utils.endpoint_header(Configuration.VERSION, endpoint_name)
+
+
+
+# Initialize the Epoch
+Epoch.init()
+
+
+# Initialize the Candlesticks on the Test Dataset Range
+Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.TEST_DS_START, Epoch.TEST_DS_END)
+
+
+
+# Run the process
+PredictionModelAssets.convert_json()
+
+
+
+# End of Script
+Utils.endpoint_footer(endpoint_name)
\ No newline at end of file
@@ -0,0 +1,30 @@
+from modules.utils.Utils import Utils
+from modules.configuration.Configuration import Configuration
+from modules.candlestick.Candlestick import Candlestick
+from modules.epoch.Epoch import Epoch
+from modules.prediction_model.PredictionModelAssets import PredictionModelAssets
+
+
+# EXPORT PREDICTION MODEL ASSETS
+# Exports the binary prediction model assets as JSON files so they can be analyzed externally.
+endpoint_name: str = "EXPORT PREDICTION MODEL ASSETS"
+Utils.endpoint_header(Configuration.VERSION, endpoint_name)
+
+
+
+# Initialize the Epoch
+Epoch.init()
+
+
+# Initialize the Candlesticks on the Test Dataset Range
+Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.TEST_DS_START, Epoch.TEST_DS_END)
+
+
+
+# Run the process
+PredictionModelAssets.export_json()
+
+
+
+# End of Script
+Utils.endpoint_footer(endpoint_name)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from typing import Union
 from argparse import ArgumentParser
 from modules.utils.Utils import Utils
 from modules.configuration.Configuration import Configuration
@@ -9,30 +10,36 @@ from modules.prediction_model.PredictionModel import PredictionModel
 # FIND PROFITABLE CONFIGS
 # Args:
 #   --batch_file_name "_ALPHA_1_10.json"
-endpoint_name: str = "FIND PROFITABLE CONFIGS"
-Utils.endpoint_header(Configuration.VERSION, endpoint_name)
+#   --workers? "8"
+# Keep in mind that the configs are evaluated by spawned processes which import this
+# file. Therefore, the script can only be executed as the main module.
+if __name__ == "__main__":
+    endpoint_name: str = "FIND PROFITABLE CONFIGS"
+    Utils.endpoint_header(Configuration.VERSION, endpoint_name)
 
 
 
-# Extract the args
-parser = ArgumentParser()
-parser.add_argument("--batch_file_name", dest="batch_file_name")
-args = parser.parse_args()
+    # Extract the args
+    parser = ArgumentParser()
+    parser.add_argument("--batch_file_name", dest="batch_file_name")
+    parser.add_argument("--workers", dest="workers", nargs='?')
+    args = parser.parse_args()
+    workers: Union[int, None] = int(args.workers) if isinstance(args.workers, str) and args.workers.isdigit() else None
 
 
-# Initialize the Epoch
-Epoch.init()
+    # Initialize the Epoch
+    Epoch.init()
 
 
-# Initialize the Candlesticks on the Test Dataset Range
-Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.TEST_DS_START, Epoch.TEST_DS_END)
+    # Initialize the Candlesticks on the Test Dataset Range
+    Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.TEST_DS_START, Epoch.TEST_DS_END)
 
 
 
-# Initialize the instance of the Prediction Model and run the process
-PredictionModel().find_profitable_configs(args.batch_file_name)
+    # Initialize the instance of the Prediction Model and run the process
+    PredictionModel().find_profitable_configs(args.batch_file_name, workers)
 
 
 
-# End of Script
-Utils.endpoint_footer(endpoint_name)
\ No newline at end of file
+    # End of Script
+    Utils.endpoint_footer(endpoint_name)
\ No newline at end of file
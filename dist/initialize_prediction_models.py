@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Union
 from argparse import ArgumentParser
 from modules.utils.Utils import Utils
 from modules.configuration.Configuration import Configuration
@@ -11,36 +11,42 @@ from modules.prediction_model.PredictionModelAssets import PredictionModelAssets
 # INITIALIZE PREDICTION MODELS
 # Args:
 #   --regression_ids "KR_LSTM_S2_c064c7c8-9208-472a-b963-007225372c08,KR_CDNN_S4_0c5cd87e-b71d-409a-887a-4cd12a8bf6ee,..."
-endpoint_name: str = "INITIALIZE PREDICTION MODELS"
-Utils.endpoint_header(Configuration.VERSION, endpoint_name)
+#   --workers? "4"
+# Keep in mind that the features are predicted by spawned processes which import this
+# file. Therefore, the script can only be executed as the main module.
+if __name__ == "__main__":
+    endpoint_name: str = "INITIALIZE PREDICTION MODELS"
+    Utils.endpoint_header(Configuration.VERSION, endpoint_name)
 
 
 
-# Extract the args
-parser = ArgumentParser()
-parser.add_argument("--regression_ids", dest="regression_ids")
-args = parser.parse_args()
-regression_ids: List[str] = args.regression_ids.split(",")
+    # Extract the args
+    parser = ArgumentParser()
+    parser.add_argument("--regression_ids", dest="regression_ids")
+    parser.add_argument("--workers", dest="workers", nargs='?')
+    args = parser.parse_args()
+    regression_ids: List[str] = args.regression_ids.split(",")
+    workers: Union[int, None] = int(args.workers) if isinstance(args.workers, str) and args.workers.isdigit() else None
 
 
-# Initialize the Epoch
-Epoch.init()
+    # Initialize the Epoch
+    Epoch.init()
 
 
-# Initialize the Candlesticks on the Test Dataset Range
-Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.TEST_DS_START, Epoch.TEST_DS_END)
+    # Initialize the Candlesticks on the Test Dataset Range
+    Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.TEST_DS_START, Epoch.TEST_DS_END)
 
 
 
-# Build the assets
-PredictionModelAssets.build(regression_ids, PredictionModelConfig.PRICE_CHANGE_REQUIREMENTS)
+    # Build the assets
+    PredictionModelAssets.build(regression_ids, PredictionModelConfig.PRICE_CHANGE_REQUIREMENTS, workers)
 
 
 
-# Create the configs
-PredictionModelConfig.create(regression_ids)
+    # Create the configs
+    PredictionModelConfig.create(regression_ids)
 
 
 
-# End of Script
-Utils.endpoint_footer(endpoint_name)
\ No newline at end of file
+    # End of Script
+    Utils.endpoint_footer(endpoint_name)
\ No newline at end of file
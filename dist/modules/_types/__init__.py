@@ -4,4 +4,5 @@ from modules._types.keras_utils_types import *
 from modules._types.discovery_types import *
 from modules._types.regression_types import *
 from modules._types.prediction_model_types import *
-from modules._types.epoch_types import *
\ No newline at end of file
+from modules._types.epoch_types import *
+from modules._types.benchmark_types import *
\ No newline at end of file
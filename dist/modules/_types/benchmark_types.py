@@ -0,0 +1,52 @@
+from typing import TypedDict, List
+from modules._types.utils_types import IProfilerStage
+
+
+
+
+
+# Benchmark Config
+# The size of the synthetic epoch the pipeline is benchmarked on.
+class IBenchmarkConfig(TypedDict):
+    # The seed used to generate the synthetic data
+    seed: int
+
+    # The number of months that comprise the synthetic epoch
+    epoch_width: int
+
+    # The number of dummy regressions the prediction model assets are built with
+    regressions: int
+
+    # The number of configurations evaluated when looking for profitable configs
+    configs: int
+
+    # The number of configurations backtested when building prediction models
+    backtests: int
+
+    # The number of processes used to predict the features and evaluate the configs
+    workers: int
+
+
+
+
+
+# Benchmark Result
+# The outcome of a benchmark run. It is saved as a JSON file so runs can be compared.
+class IBenchmarkResult(TypedDict):
+    # The version of the Epoch Builder
+    version: str
+
+    # The time in which the benchmark was executed
+    creation: int
+
+    # The size of the benchmark
+    config: IBenchmarkConfig
+
+    # The stages measured by the Profiler
+    stages: List[IProfilerStage]
+
+    # The total number of seconds taken by the benchmark
+    duration: float
+
+    # The peak memory of the process (MB)
+    peak_memory: float
@@ -1,4 +1,4 @@
-from typing import Tuple, TypedDict
+from typing import Tuple, TypedDict, List
 
 
 
@@ -10,6 +10,26 @@ class ICandlestickConfig(TypedDict):
 
 
 
+# Candlesticks Cache Metadata
+# The candlesticks are cached in binary columns next to their CSV file. The metadata
+# contains the signature of the source CSV so the cache can be rebuilt whenever it changes.
+class ICandlestickCacheMeta(TypedDict):
+    # Source CSV Signature
+    size: int       # Size in bytes
+    mtime: int      # Last modification time in nanoseconds
+    hash: str       # SHA256 of the file's contents
+
+    # The columns in the order they are placed in the CSV
+    columns: List[str]
+
+    # The number of rows
+    rows: int
+
+    # True if the open and close times are sorted ascendingly
+    sorted: bool
+
+
+
 # Candlestick Build Payload
 # This dict is generated when the candlesticks are built during the Epoch Creation Process.
 class ICandlestickBuildPayload(TypedDict):
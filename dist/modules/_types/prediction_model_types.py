@@ -1,6 +1,8 @@
-from typing import TypedDict, List, Literal, Dict, Union
+from typing import TypedDict, List, Literal, Dict, Union, Tuple
+from numpy import dtype
 from modules._types.regression_types import IRegressionConfig
 from modules._types.discovery_types import IDiscovery
+from modules._types.utils_types import IProfilerStage
 
 
 
@@ -44,6 +46,41 @@ class IPredictionModelMinifiedConfig(TypedDict):
 
 
 
+# Configuration Space
+# The configurations are never materialized. Instead, the space is described by the regressions
+# and the hyperparameters and any configuration can be decoded on demand based on its index. 
+# The indexes are mapped to the combinations through a permutation generated with the seed, so 
+# the configurations are evenly shuffled across the batches.
+class IPredictionModelConfigSpace(TypedDict):
+    # The regressions that will be combined, following the order of the combinations
+    regression_ids: List[str]
+
+    # The lists of hyperparameters
+    price_change_requirements: List[float]
+    min_sum_functions: List[IMinSumFunction]
+    min_sum_adjustment_factors: List[float]
+    regressions_per_model: List[IRegressionsPerModel]
+
+    # The seed used to generate the permutation
+    seed: int
+
+    # The total number of configurations in the space
+    size: int
+
+
+
+
+
+# Configuration Batch
+# A batch is a range of indexes within the configuration space.
+class IPredictionModelConfigBatch(TypedDict):
+    start: int  # Index of the first configuration
+    end: int    # Index after the last configuration
+
+
+
+
+
 
 
 
@@ -90,6 +127,46 @@ ITestDatasetFeatures = Dict[str, List[float]]
 
 
 
+# Assets Metadata
+# The binary assets are stored as numpy arrays that can be memory mapped. The metadata
+# file contains everything needed in order to interpret them:
+# feature_ids: the regression ID of each row in the features matrix.
+# features_num: the number of features per regression.
+# price_change_requirements: the requirement (in string format) of each row in the labels matrix.
+# labels_num: the number of labels of each requirement. The rest of the row is padded with 0s.
+# lookback_indexer_start|end: the open times of the first and last 1m candlesticks 
+#   the lookback indexer is aligned to.
+# lookback_indexer_num: the number of 1m candlesticks in the lookback indexer.
+class IPredictionModelAssetsMeta(TypedDict):
+    feature_ids: List[str]
+    features_num: int
+    price_change_requirements: List[str]
+    labels_num: List[int]
+    lookback_indexer_start: int
+    lookback_indexer_end: int
+    lookback_indexer_num: int
+
+
+
+
+
+
+# Features Cache Metadata
+# The features of each regression are cached once predicted. They are only reused 
+# if the model file and the range of the input dataset haven't changed. The metadata
+# also holds the regression's configuration so the models don't need to be loaded
+# in order to build the certificates.
+class IRegressionFeaturesCacheMeta(TypedDict):
+    model_hash: str
+    input_start: int
+    input_end: int
+    config: IRegressionConfig
+
+
+
+
+
+
 
 
 
@@ -299,6 +376,10 @@ class IPredictionModelCertificate(TypedDict):
     # The backtest performance of the model
     backtest: IBacktestPerformance
 
+    # The stages measured by the build the certificate belongs to. Only present if the 
+    # profiler is enabled
+    timings: List[IProfilerStage]
+
 
 
     
@@ -307,6 +388,50 @@ class IPredictionModelCertificate(TypedDict):
 
 
 
+######################
+## Batch Evaluation ##
+######################
+
+
+
+
+# Shared Array
+# The descriptor used by the batch evaluator's workers in order to attach to an
+# array that lives in shared memory.
+class ISharedArray(TypedDict):
+    # The name of the shared memory block
+    name: str
+
+    # The shape and the data type of the array
+    shape: Tuple[int, ...]
+    dtype: dtype
+
+
+
+# Batch Evaluator Shared Arrays
+# The descriptors of all the arrays the workers need in order to evaluate configurations.
+class IBatchEvaluatorSharedArrays(TypedDict):
+    # The features matrix (regressions x features)
+    features: ISharedArray
+
+    # The labels arrays by price change requirement
+    labels: Dict[str, ISharedArray]
+
+    # The indexed 1m candlestick records
+    candlesticks: ISharedArray
+
+
+
+
+
+
+
+
+
+
+
+
+
 #######################################
 ## Profitable Configurations Journal ##
 #######################################
@@ -325,5 +450,9 @@ class IProfitableConfigurationsJournal(TypedDict):
     # The index when the last profitable configuration was saved 
     current_index: int
 
-    # The list of profitable configurations found so far
-    configs: List[IPredictionModelMinifiedConfig]
+    # The indexes of the profitable configurations found so far
+    indexes: List[int]
+
+    # The stages measured by the Profiler, including the ones still running. Only present
+    # if the profiler is enabled
+    timings: List[IProfilerStage]
@@ -3,6 +3,7 @@ from numpy import ndarray
 from modules._types.keras_utils_types import IKerasActivation, IKerasModelConfig, IKerasModelTrainingHistory, IKerasOptimizer, \
     IKerasLoss, IKerasMetric, IKerasOptimizerName, IKerasModelSummary, IKerasModelTemplateName
 from modules._types.discovery_types import IDiscovery
+from modules._types.utils_types import IProfilerStage
 
 
 
@@ -289,6 +290,8 @@ class IRegressionTrainingCertificate(TypedDict):
     # Training
     training_start: int     # Time in which the training started
     training_end: int       # Time in which the training ended
+    training_wall_time: float       # Seconds taken by the job
+    training_throughput: float      # Train samples processed per second
 
     # Training performance by epoch
     training_history: IKerasModelTrainingHistory
@@ -302,6 +305,9 @@ class IRegressionTrainingCertificate(TypedDict):
     # The configuration of the Regression
     regression_config: IRegressionConfig
 
+    # The stages measured by the Profiler. Only present if the profiler is enabled
+    timings: List[IProfilerStage]
+
 
 
 
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, TypedDict, Union
 
 
 
@@ -6,4 +6,43 @@ from typing import Literal
 
 # File Extension
 # The extensions for all the files that are managed by the Epoch Builder.
-IFileExtension = Literal[".json", ".h5"]
\ No newline at end of file
+IFileExtension = Literal[".json", ".h5"]
+
+
+
+
+
+# Profiler Stage Status
+# A stage is running until it completes or raises an error.
+IProfilerStageStatus = Literal["running", "completed", "failed"]
+
+
+
+
+
+# Profiler Stage
+# The record of a stage of the pipeline measured by the Profiler. The throughput is only
+# populated when the number of items processed by the stage is known.
+class IProfilerStage(TypedDict):
+    # The name of the stage
+    name: str
+
+    # The time in which the stage started (ms)
+    start: int
+
+    # The number of seconds taken by the stage. If the stage is still running, it is the
+    # time elapsed so far
+    duration: float
+
+    # The number of items processed by the stage and their unit (candles, labels, configs...)
+    items: Union[int, None]
+    unit: Union[str, None]
+
+    # The number of items processed per second
+    throughput: Union[float, None]
+
+    # The peak memory of the process (MB) when the stage completed
+    peak_memory: float
+
+    # The state of the stage
+    status: IProfilerStageStatus
@@ -0,0 +1,367 @@
+from typing import List, Dict, Any
+from math import ceil
+from os import getcwd, chdir
+from time import time
+from tempfile import mkdtemp
+from uuid import uuid4
+from numpy import ndarray, arange, exp, cumsum, concatenate, maximum, minimum, absolute, around, zeros, float32
+from numpy.random import default_rng, Generator
+from pandas import DataFrame
+from h5py import File as h5pyFile
+from tensorflow.python.keras.saving.hdf5_format import save_model_to_hdf5
+from keras import Sequential
+from keras.layers import Input, Dense
+from modules._types import IBenchmarkConfig, IBenchmarkResult, IPredictionModelCertificate, IProfilerStage
+from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
+from modules.configuration.Configuration import Configuration
+from modules.candlestick.Candlestick import Candlestick
+from modules.epoch.Epoch import Epoch
+from modules.prediction_model.PredictionModelConfig import PredictionModelConfig
+from modules.prediction_model.PredictionModelAssets import PredictionModelAssets
+from modules.prediction_model.PredictionModel import PredictionModel
+
+
+
+
+class Benchmark:
+    """Benchmark Class
+
+    This singleton measures the throughput of the pipeline on a synthetic epoch. The candlestick
+    bundle is generated from a seeded random walk and the regressions are small dummy models
+    that extrapolate the momentum of the prices, therefore, the benchmark requires no network
+    access, no GPU and no trained regressions. The epoch is created in a temporary workspace
+    that is removed once the benchmark completes, so the project's epoch is never affected.
+
+    Class Properties:
+        RESULTS_PATH: str
+            The directory in which the results are stored.
+        EPOCH_ID: str
+            The identifier of the synthetic epoch.
+        START: int
+            The open time of the first synthetic candlestick.
+        INITIAL_PRICE: float
+            The price the random walk starts at.
+        VOLATILITY: float
+            The standard deviation of the 1 minute log returns.
+    """
+    # Results Directory
+    RESULTS_PATH: str = "benchmarks"
+
+    # Synthetic Epoch Identifier
+    EPOCH_ID: str = "_BENCHMARK"
+
+    # Synthetic Candlesticks
+    START: int = 1609459200000 # 01/01/2021 00:00:00 UTC
+    INITIAL_PRICE: float = 30000
+    VOLATILITY: float = 0.0008
+
+
+
+
+    @staticmethod
+    def run(
+        epoch_width: int = 6,
+        regressions: int = 16,
+        configs: int = 2000,
+        backtests: int = 100,
+        workers: int = 1
+    ) -> IBenchmarkResult:
+        """Runs the pipeline on a synthetic epoch and saves the measurements of each
+        stage in the results directory.
+
+        Args:
+            epoch_width: int
+                The number of months that comprise the synthetic epoch.
+            regressions: int
+                The number of dummy regressions the assets will be built with.
+            configs: int
+                The number of configurations that will be evaluated when looking for
+                profitable configs.
+            backtests: int
+                The number of configurations that will be backtested when building the
+                prediction models. These configurations are backtested regardless of their
+                profitability so the size of the stage is always the same.
+            workers: int
+                The number of processes that will predict the features and evaluate the
+                configurations.
+
+        Returns:
+            IBenchmarkResult
+
+        Raises:
+            ValueError:
+                If any of the provided values is invalid.
+        """
+        # Validate the provided values
+        if not isinstance(regressions, int) or regressions < 16:
+            raise ValueError(f"The provided regressions value is invalid {regressions}. It must be an int greater than or equal to 16.")
+        if not isinstance(configs, int) or configs < 1:
+            raise ValueError(f"The provided configs value is invalid {configs}. It must be an int greater than 0.")
+        if not isinstance(backtests, int) or backtests < 1:
+            raise ValueError(f"The provided backtests value is invalid {backtests}. It must be an int greater than 0.")
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError(f"The provided workers value is invalid {workers}. It must be an int greater than 0.")
+
+        # Init the config
+        config: IBenchmarkConfig = {
+            "seed": Epoch.DEFAULTS["seed"],
+            "epoch_width": epoch_width,
+            "regressions": regressions,
+            "configs": configs,
+            "backtests": backtests,
+            "workers": workers
+        }
+
+        # Enable the profiler and init the time
+        Profiler.enable()
+        Profiler.reset()
+        creation: int = Utils.get_time()
+        start: float = time()
+
+        # Run the pipeline within a temporary workspace. The package file is copied into
+        # it as it is read by every process that imports the configuration, including the workers.
+        root_path: str = getcwd()
+        workspace_path: str = mkdtemp(prefix="epoch_builder_benchmark_")
+        try:
+            Utils.copy_file_or_dir("package.json", f"{workspace_path}/package.json")
+            chdir(workspace_path)
+            Utils.write("./.gitignore", "")
+            stages: List[IProfilerStage] = Benchmark._run_pipeline(config)
+        finally:
+            chdir(root_path)
+            Utils.remove_directory(workspace_path)
+
+        # Build the result
+        result: IBenchmarkResult = {
+            "version": Configuration.VERSION,
+            "creation": creation,
+            "config": config,
+            "stages": stages,
+            "duration": round(time() - start, 2),
+            "peak_memory": Utils.get_peak_memory()
+        }
+
+        # Finally, save it and return it
+        Utils.write(f"{Benchmark.RESULTS_PATH}/{creation}.json", result, indent=4)
+        return result
+
+
+
+
+
+
+    @staticmethod
+    def _run_pipeline(config: IBenchmarkConfig) -> List[IProfilerStage]:
+        """Runs every stage of the pipeline on the synthetic epoch. Keep in mind that
+        this function must be invoked within the benchmark's workspace.
+
+        Args:
+            config: IBenchmarkConfig
+                The size of the benchmark.
+
+        Returns:
+            List[IProfilerStage]
+            The stages measured throughout the pipeline. Since the evaluation and the
+            build reset the profiler, the stages are collected before each of them.
+        """
+        # Generate the candlestick bundle
+        print("\n\nGenerating synthetic candlesticks...")
+        Benchmark._generate_candlesticks(config["seed"], config["epoch_width"], Epoch.DEFAULTS["sma_window_size"])
+
+        # Create and initialize the epoch
+        print("\n\nCreating synthetic epoch...")
+        Epoch.create(
+            seed=config["seed"],
+            id=Benchmark.EPOCH_ID,
+            epoch_width=config["epoch_width"],
+            sma_window_size=Epoch.DEFAULTS["sma_window_size"],
+            train_split=Epoch.DEFAULTS["train_split"],
+            validation_split=Epoch.DEFAULTS["validation_split"],
+            regression_lookback=Epoch.DEFAULTS["regression_lookback"],
+            regression_predictions=Epoch.DEFAULTS["regression_predictions"],
+            exchange_fee=Epoch.DEFAULTS["exchange_fee"],
+            position_size=Epoch.DEFAULTS["position_size"],
+            leverage=Epoch.DEFAULTS["leverage"],
+            idle_minutes_on_position_close=Epoch.DEFAULTS["idle_minutes_on_position_close"]
+        )
+        Epoch.init()
+
+        # Initialize the candlesticks on the test dataset range
+        Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.TEST_DS_START, Epoch.TEST_DS_END)
+
+        # Save the dummy regressions
+        print("\n\nSaving dummy regressions...")
+        regression_ids: List[str] = Benchmark._save_dummy_regressions(config["seed"], config["regressions"])
+
+        # Build the prediction model assets and create the configurations in a single batch
+        PredictionModelAssets.build(regression_ids, PredictionModelConfig.PRICE_CHANGE_REQUIREMENTS, config["workers"])
+        PredictionModelConfig.create(regression_ids, batch_size=config["configs"])
+        batches: int = ceil(PredictionModelConfig.get_space().size / config["configs"])
+        batch_file_name: str = f"{Epoch.ID}_1_{batches}.json"
+
+        # Evaluate the configurations of the first batch
+        prediction_model: PredictionModel = PredictionModel()
+        stages: List[IProfilerStage] = Profiler.reset()
+        prediction_model.find_profitable_configs(batch_file_name, config["workers"])
+
+        # Replace the profitable configurations with a fixed sample and build the prediction models
+        backtests: int = min(config["backtests"], PredictionModelConfig.get_space().size)
+        PredictionModelConfig.save_profitable_configs(batch_file_name, list(range(backtests)))
+        stages += Profiler.reset()
+        prediction_model.build(backtests)
+
+        # Export the epoch with the first prediction model in the build
+        build: List[IPredictionModelCertificate] = Utils.read(Epoch.PATH.prediction_models_build())
+        with Profiler.stage("export_epoch"):
+            Epoch.export(build[0]["id"])
+
+        # Finally, return all the stages
+        return stages + Profiler.reset()
+
+
+
+
+
+
+
+
+
+
+
+    ############################
+    ## Synthetic Candlesticks ##
+    ############################
+
+
+
+
+    @staticmethod
+    def _generate_candlesticks(seed: int, epoch_width: int, sma_window_size: int) -> None:
+        """Generates the candlestick bundle based on a seeded geometric random walk. The
+        bundle contains enough prediction candlesticks to build the epoch's simple
+        moving averages.
+
+        Args:
+            seed: int
+                The seed of the random walk.
+            epoch_width: int
+                The number of months that comprise the epoch.
+            sma_window_size: int
+                The window size of the simple moving averages.
+        """
+        with Profiler.stage("synthetic_candlesticks", "candles") as stage:
+            # Calculate the number of candlesticks
+            interval: int = Candlestick.PREDICTION_CANDLESTICK_CONFIG["interval_minutes"]
+            prediction_candles: int = int(24 * 60 / interval) * ceil(epoch_width * 30) + sma_window_size * 2
+            candles: int = prediction_candles * interval
+
+            # Generate the close prices and derive the rest of the 1 minute candlesticks from them
+            rng: Generator = default_rng(seed)
+            c: ndarray = around(Benchmark.INITIAL_PRICE * exp(cumsum(rng.normal(0, Benchmark.VOLATILITY, candles))), 2)
+            o: ndarray = concatenate(([Benchmark.INITIAL_PRICE], c[:-1]))
+            wick: ndarray = absolute(rng.normal(0, Benchmark.VOLATILITY / 2, (2, candles)))
+            h: ndarray = around(maximum(o, c) * (1 + wick[0]), 2)
+            l: ndarray = around(minimum(o, c) * (1 - wick[1]), 2)
+            ot: ndarray = Benchmark.START + arange(candles, dtype="int64") * 60000
+            Utils.make_directory(Candlestick.ASSETS_PATH)
+            DataFrame({"ot": ot, "ct": ot + 59999, "o": o, "h": h, "l": l, "c": c})\
+                .to_csv(Candlestick.DEFAULT_CANDLESTICK_CONFIG["csv_file"], index=False)
+
+            # Aggregate the 1 minute candlesticks into prediction candlesticks
+            pred_ot: ndarray = ot[::interval]
+            DataFrame({
+                "ot": pred_ot,
+                "ct": pred_ot + interval * 60000 - 1,
+                "o": o[::interval],
+                "h": h.reshape(prediction_candles, interval).max(axis=1),
+                "l": l.reshape(prediction_candles, interval).min(axis=1),
+                "c": c[interval-1::interval],
+                "v": around(rng.uniform(1000000, 50000000, prediction_candles), 2)
+            }).to_csv(Candlestick.PREDICTION_CANDLESTICK_CONFIG["csv_file"], index=False)
+
+            # Set the number of candlesticks generated
+            stage["items"] = candles
+
+
+
+
+
+
+
+
+
+
+
+    #######################
+    ## Dummy Regressions ##
+    #######################
+
+
+
+
+    @staticmethod
+    def _save_dummy_regressions(seed: int, regressions: int) -> List[str]:
+        """Builds and saves small regressions that extrapolate the momentum of the
+        prices. Each regression looks back a different number of candlesticks and
+        applies a different strength so the features vary between regressions.
+
+        Args:
+            seed: int
+                The seed used to generate the momentum parameters.
+            regressions: int
+                The number of regressions to be saved.
+
+        Returns:
+            List[str]
+        """
+        # Init values
+        rng: Generator = default_rng(seed)
+        lookback: int = Epoch.REGRESSION_LOOKBACK
+        predictions: int = Epoch.REGRESSION_PREDICTIONS
+        ids: List[str] = []
+
+        # Build and save each regression
+        for _ in range(regressions):
+            # Init the identity and the momentum parameters
+            id: str = f"KR_BENCHMARK_{uuid4()}"
+            description: str = "Benchmark dummy regression."
+            window: int = int(rng.integers(1, lookback))
+            strength: float = float(rng.uniform(0.5, 4))
+
+            # Build the model. Each prediction is the last price plus a fraction of the momentum
+            model: Sequential = Sequential([
+                Input(shape=(lookback,), name="Input_1"),
+                Dense(predictions, use_bias=False, name="Dense_Output")
+            ])
+            weights: ndarray = zeros((lookback, predictions), dtype=float32)
+            steps: ndarray = strength * arange(1, predictions + 1, dtype=float32) / predictions
+            weights[-1] += 1 + steps
+            weights[-1 - window] -= steps
+            model.set_weights([weights])
+
+            # Save the model with the required metadata
+            Utils.make_directory(Epoch.PATH.regressions(id))
+            with h5pyFile(Epoch.PATH.regression_model(id), mode="w") as f:
+                save_model_to_hdf5(model, f)
+                f.attrs["id"] = id
+                f.attrs["description"] = description
+                f.attrs["lookback"] = lookback
+                f.attrs["predictions"] = predictions
+
+            # Save the certificate so the regression can be exported
+            certificate: Dict[str, Any] = {
+                "id": id,
+                "description": description,
+                "regression_config": {
+                    "id": id,
+                    "description": description,
+                    "lookback": lookback,
+                    "predictions": predictions
+                }
+            }
+            Utils.write(Epoch.PATH.regression_certificate(id), certificate)
+            ids.append(id)
+
+        # Finally, return the ids
+        return ids
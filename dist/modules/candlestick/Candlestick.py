@@ -1,7 +1,12 @@
-from typing import Union
+from typing import Union, Dict, Tuple
 from math import ceil
+from os import stat
+from os.path import splitext
+from numpy import ndarray, array, load, searchsorted, all as np_all
 from pandas import DataFrame, read_csv
-from modules._types import ICandlestickConfig, ICandlestickBuildPayload
+from modules._types import ICandlestickConfig, ICandlestickBuildPayload, ICandlestickCacheMeta
+from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
 
 
 
@@ -99,16 +104,18 @@ class Candlestick:
             ValueError: 
                 If it cannot load the DataFrames for any reason or the values are invalid.
         """
-        # Init the Candlestick DataFrames
-        Candlestick.DF: DataFrame = Candlestick.load_df(Candlestick.DEFAULT_CANDLESTICK_CONFIG, start, end)
-        Candlestick.PREDICTION_DF: DataFrame = Candlestick.load_df(Candlestick.PREDICTION_CANDLESTICK_CONFIG, start, end)
-        Candlestick.NORMALIZED_PREDICTION_DF: DataFrame = Candlestick.load_df(Candlestick.NORMALIZED_PREDICTION_CANDLESTICK_CONFIG, start, end)
-
-        # The models need data prior to the current time to perform predictions. Since the default candlesticks
-        # will be used for simulating, the df needs to start from a point in which there are enough prediction
-        # candlesticks in order to make a prediction. Once the subsetting is done, reset the indexes.
-        Candlestick.DF = Candlestick.DF[Candlestick.DF["ot"] >= Candlestick.PREDICTION_DF.iloc[lookback]["ot"]]
-        Candlestick.DF.reset_index(drop=True, inplace=True)
+        with Profiler.stage("candlestick_init", "candles") as stage:
+            # Init the Candlestick DataFrames
+            Candlestick.DF: DataFrame = Candlestick.load_df(Candlestick.DEFAULT_CANDLESTICK_CONFIG, start, end)
+            Candlestick.PREDICTION_DF: DataFrame = Candlestick.load_df(Candlestick.PREDICTION_CANDLESTICK_CONFIG, start, end)
+            Candlestick.NORMALIZED_PREDICTION_DF: DataFrame = Candlestick.load_df(Candlestick.NORMALIZED_PREDICTION_CANDLESTICK_CONFIG, start, end)
+
+            # The models need data prior to the current time to perform predictions. Since the default candlesticks
+            # will be used for simulating, the df needs to start from a point in which there are enough prediction
+            # candlesticks in order to make a prediction. Once the subsetting is done, reset the indexes.
+            Candlestick.DF = Candlestick.DF[Candlestick.DF["ot"] >= Candlestick.PREDICTION_DF.iloc[lookback]["ot"]]
+            Candlestick.DF.reset_index(drop=True, inplace=True)
+            stage["items"] = Candlestick.DF.shape[0]
 
         # The default df should start at the same time as the prediction df at the lookback index
         if Candlestick.DF.iloc[0]["ot"] != Candlestick.PREDICTION_DF.iloc[lookback]["ot"]:
@@ -246,6 +253,16 @@ class Candlestick:
         pred_df.to_csv(Candlestick.PREDICTION_CANDLESTICK_CONFIG["csv_file"], index=False)
         sma_df.to_csv(Candlestick.NORMALIZED_PREDICTION_CANDLESTICK_CONFIG["csv_file"], index=False)
 
+        # Build the caches so the epoch starts fast. Keep in mind that the caches are built from 
+        # the saved files as the CSV format does not preserve the exact floats of the DataFrames
+        # and every machine must load the same values.
+        for config in [
+            Candlestick.DEFAULT_CANDLESTICK_CONFIG, 
+            Candlestick.PREDICTION_CANDLESTICK_CONFIG, 
+            Candlestick.NORMALIZED_PREDICTION_CANDLESTICK_CONFIG
+        ]:
+            Candlestick._build_cache(config, read_csv(config["csv_file"], usecols=config["columns"]))
+
         # Finally, return the payload
         return {
             "start": start,
@@ -277,7 +294,8 @@ class Candlestick:
     @staticmethod
     def load_df(config: ICandlestickConfig, start: Union[int, None]=None, end: Union[int, None]=None) -> DataFrame:
         """ Retrieves the DataFrame for the candlesticks based on the start-end range. If no start or end
-        are provided, it will load all the candlesticks.
+        are provided, it will load all the candlesticks. The data is read from the memory-mapped
+        cache of the CSV file, which is built in case it doesn't exist or is outdated.
 
         Args:
             config: ICandlestickConfig
@@ -295,13 +313,24 @@ class Candlestick:
                 If the data frame does not contain at least 1 row.
                 If the data frame does not contain the correct number of columns.
         """
-        # Retrieve the CSV File
-        df: DataFrame = read_csv(config["csv_file"], usecols=config["columns"])
+        # Retrieve the cached columns
+        meta, columns = Candlestick._load_cache(config)
 
         # Modify the DataFrame's date range if applies
         if isinstance(start, int) and isinstance(end, int):
-            df = df[(df["ot"] >= start) & (df["ct"] <= end)]
-            df.reset_index(drop=True, inplace=True)
+            # If the times are sorted, the range is a slice
+            if meta["sorted"]:
+                first: int = int(searchsorted(columns["ot"], start, side="left"))
+                last: int = max(int(searchsorted(columns["ct"], end, side="right")), first)
+                columns = { name: values[first:last] for name, values in columns.items() }
+
+            # Otherwise, filter the rows
+            else:
+                mask: ndarray = (columns["ot"] >= start) & (columns["ct"] <= end)
+                columns = { name: values[mask] for name, values in columns.items() }
+
+        # Build the DataFrame
+        df: DataFrame = DataFrame({ name: array(columns[name]) for name in meta["columns"] })
         
         # Make sure it has the correct amount of rows & columns
         if df.shape[0] == 0:
@@ -310,4 +339,153 @@ class Candlestick:
             raise ValueError(f"The candlesticks dataframe does not have the correct amount of columns. Expected {len(config['columns'])} but got {df.shape[1]}")
         
         # Return the DataFrame
-        return df
\ No newline at end of file
+        return df
+
+
+
+
+
+
+
+
+
+
+
+
+
+    #######################
+    ## Candlestick Cache ##
+    #######################
+
+
+
+    @staticmethod
+    def _load_cache(config: ICandlestickConfig) -> Tuple[ICandlestickCacheMeta, Dict[str, ndarray]]:
+        """Loads the cache of a candlesticks CSV file. The columns are memory-mapped so only 
+        the rows that are used are read from disk. If the cache does not exist or the CSV
+        file changed, the cache is rebuilt.
+
+        Args:
+            config: ICandlestickConfig
+                The configuration of the candlesticks.
+
+        Returns:
+            Tuple[ICandlestickCacheMeta, Dict[str, ndarray]]
+            (meta, columns)
+        """
+        # Rebuild the cache if it is not valid
+        meta: Union[ICandlestickCacheMeta, None] = Candlestick._get_valid_cache_meta(config)
+        if meta is None:
+            meta = Candlestick._build_cache(config, read_csv(config["csv_file"], usecols=config["columns"]))
+
+        # Finally, memory-map the columns
+        return meta, { 
+            name: load(Candlestick._cache_path(config, f"{name}.npy"), mmap_mode="r") for name in meta["columns"] 
+        }
+
+
+
+
+
+
+    @staticmethod
+    def _get_valid_cache_meta(config: ICandlestickConfig) -> Union[ICandlestickCacheMeta, None]:
+        """Retrieves the metadata of the cache as long as it is still valid. The cache
+        is valid if it has the same columns, all of them have been saved and the CSV file 
+        has the same size and modification time. If only the modification time changed, 
+        the contents' hash is compared instead.
+
+        Args:
+            config: ICandlestickConfig
+                The configuration of the candlesticks.
+
+        Returns:
+            Union[ICandlestickCacheMeta, None]
+        """
+        # Load the metadata
+        meta: Union[ICandlestickCacheMeta, None] = Utils.read(Candlestick._cache_path(config, "meta.json"), allow_empty=True)
+
+        # Make sure the cache exists and has the same columns
+        if meta is None or sorted(meta["columns"]) != sorted(config["columns"]):
+            return None
+
+        # Make sure all the columns have been saved
+        if not all(Utils.file_exists(Candlestick._cache_path(config, f"{name}.npy")) for name in meta["columns"]):
+            return None
+
+        # Make sure the size of the file is the same
+        file_stat = stat(config["csv_file"])
+        if file_stat.st_size != meta["size"]:
+            return None
+
+        # If the file was modified, make sure the contents are the same
+        if file_stat.st_mtime_ns != meta["mtime"]:
+            if Utils.get_file_hash(config["csv_file"]) != meta["hash"]:
+                return None
+            meta["mtime"] = file_stat.st_mtime_ns
+            Utils.write_atomic(Candlestick._cache_path(config, "meta.json"), meta)
+
+        # Finally, return the valid metadata
+        return meta
+
+
+
+
+
+
+    @staticmethod
+    def _build_cache(config: ICandlestickConfig, df: DataFrame) -> ICandlestickCacheMeta:
+        """Builds the cache of a candlesticks CSV file based on the DataFrame that was read from
+        it. Each column is stored in its own binary file. The files are written atomically so processes 
+        loading the cache at the same time never read partial files.
+
+        Args:
+            config: ICandlestickConfig
+                The configuration of the candlesticks.
+            df: DataFrame
+                The DataFrame that was read from the CSV file.
+
+        Returns:
+            ICandlestickCacheMeta
+        """
+        # Save the columns
+        for name in df.columns:
+            Utils.write_atomic(Candlestick._cache_path(config, f"{name}.npy"), df[name].to_numpy())
+
+        # Build the metadata based on the CSV file
+        file_stat = stat(config["csv_file"])
+        meta: ICandlestickCacheMeta = {
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime_ns,
+            "hash": Utils.get_file_hash(config["csv_file"]),
+            "columns": list(df.columns),
+            "rows": df.shape[0],
+            "sorted": bool(np_all(df["ot"].diff().iloc[1:] >= 0) and np_all(df["ct"].diff().iloc[1:] >= 0))
+        }
+
+        # Save the metadata and return it
+        Utils.write_atomic(Candlestick._cache_path(config, "meta.json"), meta)
+        return meta
+
+
+
+
+
+
+    @staticmethod
+    def _cache_path(config: ICandlestickConfig, file_name: Union[str, None] = None) -> str:
+        """Builds the path of the cache directory of a candlesticks CSV file. If a 
+        file name is provided, it will return the path of the file instead. 
+        For example: candlesticks/candlesticks.csv -> candlesticks/candlesticks_cache
+
+        Args:
+            config: ICandlestickConfig
+                The configuration of the candlesticks.
+            file_name: Union[str, None]
+                The name of the file within the cache directory.
+
+        Returns:
+            str
+        """
+        cache_dir: str = f"{splitext(config['csv_file'])[0]}_cache"
+        return f"{cache_dir}/{file_name}" if isinstance(file_name, str) else cache_dir
\ No newline at end of file
@@ -6,6 +6,7 @@ from tensorflow import random as tf_random
 from modules._types import IEpochConfig, IEpochDefaults, ICandlestickBuildPayload, IPredictionModelCertificate,\
     IRegressionTrainingCertificate
 from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
 from modules.configuration.Configuration import Configuration
 from modules.candlestick.Candlestick import Candlestick
 from modules.epoch.EpochPath import EpochPath
@@ -208,11 +209,13 @@ class Epoch:
 
         # Build the candlestick assets
         print("1/5) Building Candlestick Assets...")
-        candlesticks_payload: ICandlestickBuildPayload = Candlestick.build_candlesticks(
-            epoch_width=epoch_width,
-            sma_window_size=sma_window_size,
-            train_split=train_split
-        )
+        with Profiler.stage("build_candlesticks", "candles") as stage:
+            candlesticks_payload: ICandlestickBuildPayload = Candlestick.build_candlesticks(
+                epoch_width=epoch_width,
+                sma_window_size=sma_window_size,
+                train_split=train_split
+            )
+            stage["items"] = int((candlesticks_payload["end"] - candlesticks_payload["start"] + 1) / 60000)
 
         # Initialize the Epoch's directories
         print("2/5) Creating Epoch Directories...")
@@ -432,6 +435,9 @@ class Epoch:
         receipt += f"Start: {Utils.from_milliseconds_to_date_string(config['test_ds_start'])}\n"
         receipt += f"End: {Utils.from_milliseconds_to_date_string(config['test_ds_end'])}\n"
 
+        # Timings (if the profiler is enabled)
+        receipt += Profiler.build_receipt()
+
         # Finally, save the receipt
         Utils.write(f"{config['id']}/{config['id']}_receipt.txt", receipt)
 
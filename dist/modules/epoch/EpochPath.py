@@ -113,6 +113,55 @@ class EpochPath:
 
 
 
+
+    def regression_training_lock(self, id: str) -> str:
+        """Builds the path for the file that is locked by the process training a
+        regression. It is kept once the certificate is saved so every process claims
+        the same file.
+
+        Args:
+            id: str
+                The identifier of the regression.
+
+        Returns:
+            str
+        """
+        return self.p(f"regression_training_checkpoints/{id}.lock")
+
+
+
+
+
+
+
+    def regression_dataset_source(self, start: Union[int, None] = None, end: Union[int, None] = None) -> str:
+        """Builds the path for the cached sources of the regression datasets. Since the
+        datasets can be built for different ranges, each file is named after the open time
+        of the first candlestick and the close time of the last one. If the range is not
+        provided, it will return the root directory instead.
+
+        Args:
+            start: Union[int, None]
+                The open time of the first normalized prediction candlestick.
+            end: Union[int, None]
+                The close time of the last normalized prediction candlestick.
+
+        Returns:
+            str
+        """
+        # Check if the range was provided
+        if isinstance(start, int) and isinstance(end, int):
+            return self.p(f"regression_dataset/{start}_{end}.npy")
+
+        # Otherwise, return the root directory
+        else:
+            return self.p("regression_dataset")
+
+
+
+
+
+
     def regression_batched_certificates(self) -> str:
         """Builds the path for the regression batched training certificates.
 
@@ -263,6 +312,107 @@ class EpochPath:
 
 
 
+
+    def prediction_models_assets_meta(self) -> str:
+        """Builds the path for the prediction models binary assets' metadata file.
+
+        Returns:
+            str
+        """
+        return f"{self.prediction_models_assets()}/meta.json"
+
+
+
+
+
+
+
+    def prediction_models_features_matrix(self) -> str:
+        """Builds the path for the prediction models features matrix file.
+
+        Returns:
+            str
+        """
+        return f"{self.prediction_models_assets()}/features.npy"
+
+
+
+
+
+
+
+    def prediction_models_labels_matrix(self) -> str:
+        """Builds the path for the prediction models labels matrix file.
+
+        Returns:
+            str
+        """
+        return f"{self.prediction_models_assets()}/labels.npy"
+
+
+
+
+
+
+
+    def prediction_models_lookback_indexer_array(self) -> str:
+        """Builds the path for the prediction models lookback indexer array file.
+
+        Returns:
+            str
+        """
+        return f"{self.prediction_models_assets()}/lookback_indexer.npy"
+
+
+
+
+
+
+
+
+    def prediction_models_features_cache(self, regression_id: Union[str, None] = None) -> str:
+        """Builds the path for the cached features of a regression. If the regression id
+        is not provided, it will return the root directory instead.
+
+        Args:
+            regression_id: Union[str, None]
+                The identifier of the regression.
+
+        Returns:
+            str
+        """
+        # Check if the regression id was provided
+        if isinstance(regression_id, str):
+            return f"{self.prediction_models_assets()}/features_cache/{regression_id}.npy"
+
+        # Otherwise, return the root directory
+        else:
+            return f"{self.prediction_models_assets()}/features_cache"
+
+
+
+
+
+
+
+    def prediction_models_features_cache_meta(self, regression_id: str) -> str:
+        """Builds the path for the metadata of the cached features of a regression.
+
+        Args:
+            regression_id: str
+                The identifier of the regression.
+
+        Returns:
+            str
+        """
+        return f"{self.prediction_models_features_cache()}/{regression_id}.json"
+
+
+
+
+
+
+
     def profitable_configs_journal(self) -> str:
         """Builds the path for the profitable prediction models journal file.
 
@@ -276,6 +426,19 @@ class EpochPath:
 
 
 
+    def prediction_models_config_space(self) -> str:
+        """Builds the path for the descriptor of the configuration space.
+
+        Returns:
+            str
+        """
+        return f"{self.prediction_models()}/config_space.json"
+
+
+
+
+
+
     def prediction_models_configs_receipt(self) -> str:
         """Builds the path for the configurations receipt.
 
@@ -487,6 +650,7 @@ class EpochPath:
         """
         Utils.make_directory(f"{epoch_id}/regression_training_configs")
         Utils.make_directory(f"{epoch_id}/regression_training_checkpoints")
+        Utils.make_directory(f"{epoch_id}/regression_dataset")
         Utils.make_directory(f"{epoch_id}/regression_batched_certificates")
         Utils.make_directory(f"{epoch_id}/regressions")
         Utils.make_directory(f"{epoch_id}/prediction_models")
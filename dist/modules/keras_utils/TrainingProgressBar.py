@@ -8,9 +8,9 @@ from modules.utils.Utils import Utils
 # Progress Bar embedded into Keras Callbacks
 class TrainingProgressBar(Callback):
     # Init
-    def __init__(self, active_epoch_path: str, initial_epoch: int, max_epochs: int, progress_bar_description: str):
+    def __init__(self, active_epoch_path: str, initial_epoch: int, max_epochs: int, progress_bar_description: str, disable: bool = False):
         self.max_epochs: int = max_epochs
-        self.progress_bar: tqdm = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=max_epochs)
+        self.progress_bar: tqdm = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=max_epochs, disable=disable)
         self.progress_bar.set_description(progress_bar_description)
         self.active_epoch_path: str = active_epoch_path
         if initial_epoch > 0:
@@ -0,0 +1,47 @@
+from math import ceil
+from numpy import ndarray, arange
+from numpy.random import RandomState
+from keras.utils import Sequence
+
+
+
+
+# Sequence that streams batches out of the windowed datasets. Only the rows within
+# a batch are copied. If enabled, the rows are shuffled on every epoch. The permutation
+# of each epoch is derived from the seed and the epoch number, so a training that is 
+# resumed from a checkpoint shuffles the rows the same way the original would have.
+class WindowSequence(Sequence):
+    # Init
+    def __init__(self, x: ndarray, y: ndarray, batch_size: int, shuffle: bool, seed: int, initial_epoch: int = 0):
+        super().__init__()
+        self.x: ndarray = x
+        self.y: ndarray = y
+        self.batch_size: int = batch_size
+        self.shuffle: bool = shuffle
+        self.seed: int = seed
+        self.epoch: int = initial_epoch
+        self.indexes: ndarray = self._get_indexes()
+
+
+    # Number of batches
+    def __len__(self) -> int:
+        return ceil(self.x.shape[0] / self.batch_size)
+
+
+    # Batch Getter
+    def __getitem__(self, index: int):
+        batch_indexes: ndarray = self.indexes[index * self.batch_size:(index + 1) * self.batch_size]
+        return self.x[batch_indexes], self.y[batch_indexes]
+
+
+    # On Epoch End Event
+    def on_epoch_end(self):
+        self.epoch += 1
+        self.indexes = self._get_indexes()
+
+
+    # Indexes of the current epoch
+    def _get_indexes(self) -> ndarray:
+        if self.shuffle:
+            return RandomState([self.seed, self.epoch]).permutation(self.x.shape[0])
+        return arange(self.x.shape[0])
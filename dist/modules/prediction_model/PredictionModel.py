@@ -1,14 +1,18 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Union
+from multiprocessing import cpu_count
 from tqdm import tqdm
 from modules._types import IPredictionModelMinifiedConfig, IDiscovery, IBacktestPerformance, IPredictionModelCertificate,\
-    IRegressionConfig, IMinSumFunction
+    IRegressionConfig, IMinSumFunction, IPredictionModelConfigBatch
 from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
 from modules.epoch.Epoch import Epoch
-from modules.regression.Regression import Regression
 from modules.prediction_model.PredictionModelConfig import PredictionModelConfig
+from modules.prediction_model.PredictionModelConfigSpace import PredictionModelConfigSpace
 from modules.prediction_model.PredictionModelAssets import PredictionModelAssets
+from modules.prediction_model.PredictionModelFeatures import PredictionModelFeatures
 from modules.prediction_model.PredictionModelDiscovery import PredictionModelDiscovery
 from modules.prediction_model.PredictionModelBacktest import PredictionModelBacktest
+from modules.prediction_model.PredictionModelBatchEvaluator import PredictionModelBatchEvaluator
 from modules.prediction_model.ProfitableConfigsJournal import ProfitableConfigsJournal
 
 
@@ -49,7 +53,10 @@ class PredictionModel:
         self.assets: PredictionModelAssets = PredictionModelAssets()
 
         # Initialize the Backtest Instance
-        self.backtest: PredictionModelBacktest = PredictionModelBacktest(self.assets.features_num, self.assets.lookback_indexer)
+        self.backtest: PredictionModelBacktest = PredictionModelBacktest(
+            self.assets.features_num, 
+            PredictionModelBacktest.build_candlesticks(self.assets.lookback_indexer)
+        )
 
 
 
@@ -65,68 +72,53 @@ class PredictionModel:
 
 
 
-    def find_profitable_configs(self, batch_file_name: str) -> None:
+    def find_profitable_configs(self, batch_file_name: str, workers: Union[int, None] = None) -> None:
         """Given a batch config file name, it will find and save all the 
         profitable model configurations.
 
         Args:
             batch_file_name: str
                 The name of the configuration file that will be explored.
+            workers: Union[int, None]
+                The number of processes that will evaluate the configurations. If
+                none is provided, it will use all the available cores.
         """
+        # Only record the stages of the current batch
+        Profiler.reset()
+
         # Init the profitable configs journal
         journal: ProfitableConfigsJournal = ProfitableConfigsJournal(batch_file_name)
 
-        # Retrieve the configs and subset them if the journal has a starting point
-        configs: List[IPredictionModelMinifiedConfig] = PredictionModelConfig.get_batch(batch_file_name)
-        if journal.current_index != 0:
-            configs = configs[journal.current_index + 1:]
-
-        # A model is considered to be profitable if it meets the minimum accuracy,
-        # ends up with a positive balance and has a balance drawdown that meets the requirements.
-        min_accuracy: float = 55
-        #max_balance_drawdown: float = -50
-
-        # Init the progress bar
+        # Retrieve the space and the batch. Then calculate the starting point if the journal has one
+        space: PredictionModelConfigSpace = PredictionModelConfig.get_space()
+        batch: IPredictionModelConfigBatch = PredictionModelConfig.get_batch(batch_file_name)
+        start_index: int = journal.get_start_index(batch["start"])
+
+        # Init the batch evaluator
+        evaluator: PredictionModelBatchEvaluator = PredictionModelBatchEvaluator(
+            feature_ids=self.assets.feature_ids,
+            features=self.assets.features_matrix,
+            labels=self.assets.labels_arrays,
+            candlesticks=self.backtest.candlesticks
+        )
+        workers = workers if isinstance(workers, int) and workers > 0 else cpu_count()
+
+        # Evaluate the configs, saving the profitable ones in the journal as they are found
         print(f"\nBatch: {batch_file_name}")
-        print(f"Looking for profitable prediction models...")
-        progress_bar = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=len(configs))
-
-        # Iterate over each config
-        for i, config in enumerate(configs):
-            # Build the features
-            features, features_sum = self._build_features(config["ri"])
-
-            # Discovery the model
-            disc: IDiscovery = PredictionModelDiscovery().discover(features_sum, self.assets.labels[str(config["pcr"])])
-
-            # Calculate the min sums
-            min_increase_sum, min_decrease_sum = self._calculate_min_sums(config["msf"], config["msaf"], disc)
-
-            # Backtest the model
-            performance: IBacktestPerformance = self.backtest.calculate_performance(
-                price_change_requirement=config["pcr"],
-                min_increase_sum=min_increase_sum,
-                min_decrease_sum=min_decrease_sum,
-                features=features,
-                features_sum=features_sum
+        print(f"Looking for profitable prediction models ({workers} workers)...")
+        with Profiler.stage("find_profitable_configs", "configs") as stage:
+            stage["items"] = max(batch["end"] - start_index, 0)
+            configs_per_second: float = evaluator.evaluate(
+                space=space,
+                start_index=start_index,
+                end_index=batch["end"],
+                workers=workers,
+                on_profitable=journal.save_profitable_config
             )
-
-            # Check if the accuracy and the profit requirements have been met
-            if performance["accuracy"] >= min_accuracy and performance["profit"] > 0:
-                # Calculate the largest balance drawdown and ensure it meets the requirements
-                #balance_drawdown: float = PredictionModelBacktest.calculate_largest_balance_drawdown(
-                #    performance["initial_balance"],
-                #    performance["positions"]
-                #)
-                #if balance_drawdown >= max_balance_drawdown:
-                #    journal.save_profitable_config(i, config)
-                journal.save_profitable_config(i, config)
-
-            # Update the progress
-            progress_bar.update()
+        print(f"Throughput: {round(configs_per_second, 2)} configs/s")
 
         # Save the profitable models
-        PredictionModelConfig.save_profitable_configs(batch_file_name, journal.configs)
+        PredictionModelConfig.save_profitable_configs(batch_file_name, journal.indexes)
 
         # Delete the journal
         journal.clear_journal()
@@ -160,6 +152,9 @@ class PredictionModel:
             RuntimeError:
                 If there are no profitable model configurations.
         """
+        # Only record the stages of the current build
+        Profiler.reset()
+
         # Init the profitable configs
         profitable_configs: List[IPredictionModelMinifiedConfig] = PredictionModelConfig.get_profitable_configs()
 
@@ -168,63 +163,68 @@ class PredictionModel:
 
         # Init constant values
         creation: int = Utils.get_time()
-        regression_configs: Dict[str, IRegressionConfig] = { 
-            reg_id: Regression(reg_id).get_config() for reg_id in self.assets.feature_ids
-        }
+        regression_configs: Dict[str, IRegressionConfig] = PredictionModelFeatures.get_regression_configs(
+            self.assets.feature_ids
+        )
 
         # Init the progress bar
         print(f"\nBuilding profitable prediction models...")
         progress_bar = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=len(profitable_configs))
 
-        # Iterate over each config
-        for config in profitable_configs:
-            # Build the features
-            features, features_sum = self._build_features(config["ri"])
-
-            # Discovery the model
-            disc: IDiscovery = PredictionModelDiscovery().discover(features_sum, self.assets.labels[str(config["pcr"])])
-
-            # Calculate the min sums
-            min_increase_sum, min_decrease_sum = self._calculate_min_sums(config["msf"], config["msaf"], disc)
-
-            # Backtest the model
-            performance: IBacktestPerformance = self.backtest.calculate_performance(
-                price_change_requirement=config["pcr"],
-                min_increase_sum=min_increase_sum,
-                min_decrease_sum=min_decrease_sum,
-                features=features,
-                features_sum=features_sum
-            )
-
-            # Calculate the largest balance drawdown and insert it into the backtest performance
-            balance_drawdown: float = PredictionModelBacktest.calculate_largest_balance_drawdown(
-                performance["initial_balance"],
-                performance["positions"]
-            )
-            performance["largest_balance_drawdown"] = balance_drawdown
-
-            # Append the certificate to the list
-            id: str = self._generate_model_id()
-            certs.append({
-                "id": id,
-                "creation": creation,
-                "test_ds_start": Epoch.TEST_DS_START,
-                "test_ds_end": Epoch.TEST_DS_END,
-                "model": {
+        # Iterate over each config, measuring the backtests
+        with Profiler.stage("build_prediction_models", "backtests") as stage:
+            stage["items"] = len(profitable_configs)
+            for config in profitable_configs:
+                # Build the features
+                features, features_sum = self._build_features(config["ri"])
+
+                # Discovery the model
+                disc: IDiscovery = PredictionModelDiscovery().discover(
+                    features_sum, 
+                    self.assets.labels_arrays[str(config["pcr"])].tolist()
+                )
+
+                # Calculate the min sums
+                min_increase_sum, min_decrease_sum = self._calculate_min_sums(config["msf"], config["msaf"], disc)
+
+                # Backtest the model
+                performance: IBacktestPerformance = self.backtest.calculate_performance(
+                    price_change_requirement=config["pcr"],
+                    min_increase_sum=min_increase_sum,
+                    min_decrease_sum=min_decrease_sum,
+                    features=features,
+                    features_sum=features_sum
+                )
+
+                # Calculate the largest balance drawdown and insert it into the backtest performance
+                balance_drawdown: float = PredictionModelBacktest.calculate_largest_balance_drawdown(
+                    performance["initial_balance"],
+                    performance["positions"]
+                )
+                performance["largest_balance_drawdown"] = balance_drawdown
+
+                # Append the certificate to the list
+                id: str = self._generate_model_id()
+                certs.append({
                     "id": id,
-                    "price_change_requirement": config["pcr"],
-                    "min_sum_function": config["msf"],
-                    "min_sum_adjustment_factor": config["msaf"],
-                    "min_increase_sum": min_increase_sum,
-                    "min_decrease_sum": min_decrease_sum,
-                    "regressions": [regression_configs[reg_id] for reg_id in config["ri"]]
-                },
-                "discovery": disc,
-                "backtest": performance
-            })
-
-            # Update the progress
-            progress_bar.update()
+                    "creation": creation,
+                    "test_ds_start": Epoch.TEST_DS_START,
+                    "test_ds_end": Epoch.TEST_DS_END,
+                    "model": {
+                        "id": id,
+                        "price_change_requirement": config["pcr"],
+                        "min_sum_function": config["msf"],
+                        "min_sum_adjustment_factor": config["msaf"],
+                        "min_increase_sum": min_increase_sum,
+                        "min_decrease_sum": min_decrease_sum,
+                        "regressions": [regression_configs[reg_id] for reg_id in config["ri"]]
+                    },
+                    "discovery": disc,
+                    "backtest": performance
+                })
+
+                # Update the progress
+                progress_bar.update()
 
         # Make sure profitable certificates were built
         if len(certs) == 0:
@@ -233,8 +233,15 @@ class PredictionModel:
         # Sort the models by profit from high to low
         certs = sorted(certs, key=lambda x: x["backtest"]["profit"], reverse=True)
 
-        # Finally, apply a slice based on the provided limit and save the build
-        Utils.write(Epoch.PATH.prediction_models_build(), certs[:limit])
+        # Apply a slice based on the provided limit
+        certs = certs[:limit]
+
+        # Attach the timings of the build to the certificates (if the profiler is enabled)
+        for cert in certs:
+            Profiler.attach(cert)
+
+        # Finally, save the build
+        Utils.write(Epoch.PATH.prediction_models_build(), certs)
 
 
 
@@ -277,21 +284,13 @@ class PredictionModel:
             Tuple[List[List[float]], List[float]]
             (features, features_sum)
         """
-        # Init values
-        features: List[List[float]] = []
-        features_sum: List[float] = []
-
-        # Iterate over each item
-        for index in range(self.assets.features_num):
-            # Append the list of features for the index
-            feature_list: List[float] = [self.assets.features[id][index] for id in regression_ids]
-            features.append(feature_list)
-
-            # Append the sum of the features
-            features_sum.append(sum(feature_list))
+        # Init the features structured by index
+        features: List[List[float]] = self.assets.features_matrix[
+            [self.assets.feature_index[id] for id in regression_ids]
+        ].T.tolist()
 
-        # Finally, return the packed feature lists
-        return features, features_sum
+        # Finally, return the packed feature lists as well as their sums
+        return features, [sum(feature_list) for feature_list in features]
 
 
 
@@ -1,12 +1,12 @@
 from typing import List, Tuple, Dict, Union
-from numpy import ndarray, array
-from pandas import DataFrame
-from tqdm import tqdm
-from modules._types import ILookbackIndexer, ITestDatasetFeatures, ITestDatasetLabel, ITestDatasetLabels
+from numpy import ndarray, array, float32, float64, int8, int32, zeros, around, load, maximum, minimum,\
+    searchsorted, where, concatenate, flatnonzero
+from modules._types import ILookbackIndexer, ITestDatasetFeatures, ITestDatasetLabels, IPredictionModelAssetsMeta
 from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
 from modules.candlestick.Candlestick import Candlestick
 from modules.epoch.Epoch import Epoch
-from modules.regression.Regression import Regression
+from modules.prediction_model.PredictionModelFeatures import PredictionModelFeatures
 
 
 
@@ -15,23 +15,37 @@ class PredictionModelAssets:
     """PredictionModelAssets Class
 
     This class handles the generation and management of all the assets needed by
-    the PredictionModel.
+    the PredictionModel. The assets are stored as numpy arrays that are memory mapped
+    when loaded, allowing the processes in the same machine to share the pages. They 
+    can also be exported as JSON files in order to be analyzed externally.
 
     Class Properties:
         ...
 
     Instance Properties:
-        features: ITestDatasetFeatures
-            A dict containing the list of features within the test dataset. They are grouped
-            by regression ID and follow the adjusted prediction indexing.
-        labels: ITestDatasetLabels
-            A dict containing the list of labels (outcomes) within the test dataset. They are
-            grouped by price change requirement in string format.
-            It is also important to mention that they follow the adjusted prediction indexing
-            and there may be less labels than features in some cases.
-        lookback_indexer: ILookbackIndexer
-            The lookback indexer contains a dict with 1m candlestick open times as keys and 
-            prediction candlestick indexes as values. 
+        feature_ids: List[str]
+            The list of regression IDs in the same order as they are stored in the features.
+        feature_index: Dict[str, int]
+            The row of each regression ID within the features.
+        features_num: int
+            The total number of features per regression.
+        features: ndarray
+            The memory mapped float32 features matrix (regressions x features) that follows
+            the order of feature_ids and the adjusted prediction indexing.
+        features_matrix: ndarray
+            The features matrix restored to float64. Since the features are rounded to 6 
+            decimals, rounding the float32 values again restores the exact originals. Used 
+            to evaluate configurations in a vectorized manner.
+        labels: ndarray
+            The memory mapped int8 labels matrix (price change requirements x labels). Keep 
+            in mind that there may be less labels than features in some cases and the
+            rows are padded with 0s.
+        labels_arrays: Dict[str, ndarray]
+            The labels by price change requirement in string format. Each array is a view of
+            the row within the labels matrix.
+        lookback_indexer: ndarray
+            The memory mapped int32 lookback indexer. It contains the prediction candlestick 
+            index of each 1m candlestick.
     """
 
 
@@ -39,17 +53,34 @@ class PredictionModelAssets:
     def __init__(self):
         """Initializes the PredictionModelAssets Instance. When invoked,
         it will load all the assets.
+
+        Raises:
+            RuntimeError:
+                If the assets' metadata file does not exist.
+                If the lookback indexer is not aligned to the 1m candlesticks.
         """
+        # Init the metadata
+        meta: IPredictionModelAssetsMeta = PredictionModelAssets._read_meta()
+
         # Init the features
-        self.features: ITestDatasetFeatures = Utils.read(Epoch.PATH.prediction_models_features())
-        self.feature_ids: List[str] = list(self.features.keys())
-        self.features_num: int = len(self.features[self.feature_ids[0]])
+        self.feature_ids: List[str] = meta["feature_ids"]
+        self.feature_index: Dict[str, int] = { id: i for i, id in enumerate(self.feature_ids) }
+        self.features_num: int = meta["features_num"]
+        self.features: ndarray = load(Epoch.PATH.prediction_models_features_matrix(), mmap_mode="r")
+        self.features_matrix: ndarray = around(self.features.astype(float64), 6)
 
         # Init the test ds labels
-        self.labels: ITestDatasetLabels = Utils.read(Epoch.PATH.prediction_models_labels())
+        self.labels: ndarray = load(Epoch.PATH.prediction_models_labels_matrix(), mmap_mode="r")
+        self.labels_arrays: Dict[str, ndarray] = { 
+            pcr: self.labels[i, :meta["labels_num"][i]] for i, pcr in enumerate(meta["price_change_requirements"]) 
+        }
 
-        # Init the lookback indexer
-        self.lookback_indexer: ILookbackIndexer = Utils.read(Epoch.PATH.prediction_models_lookback_indexer())
+        # Init the lookback indexer and make sure it is aligned to the 1m candlesticks
+        self.lookback_indexer: ndarray = load(Epoch.PATH.prediction_models_lookback_indexer_array(), mmap_mode="r")
+        ot: ndarray = Candlestick.DF["ot"].to_numpy()
+        if ot.shape[0] != meta["lookback_indexer_num"] or \
+            int(ot[0]) != meta["lookback_indexer_start"] or int(ot[-1]) != meta["lookback_indexer_end"]:
+            raise RuntimeError(f"The lookback indexer is not aligned to the 1m candlesticks.")
 
 
 
@@ -69,7 +100,11 @@ class PredictionModelAssets:
 
 
     @staticmethod
-    def build(regression_ids: List[str], price_change_requirements: List[float]) -> None:
+    def build(
+        regression_ids: List[str], 
+        price_change_requirements: List[float], 
+        workers: Union[int, None] = None
+    ) -> None:
         """Builds and stores the features, labels and the lookback indexer.
 
         Args:
@@ -78,21 +113,40 @@ class PredictionModelAssets:
             price_change_requirements: List[float]
                 The list of price change requirements that will be used to generate
                 prediction model variations.
+            workers: Union[int, None]
+                The number of processes that will predict the features. If none is
+                provided, it will be based on the available hardware.
         """
         # Make sure there at least 16 regressions in the list
         if len(regression_ids) < 16:
             raise ValueError(f"A minimum of 16 regressions must be provided in order to build the prediction model's assets. Received: {len(regression_ids)}")
 
         # Generate the features
-        PredictionModelAssets._generate_features(regression_ids)
+        with Profiler.stage("features", "features") as features_stage:
+            features: ITestDatasetFeatures = PredictionModelAssets._generate_features(regression_ids, workers)
+            features_stage["items"] = sum(len(f) for f in features.values())
 
         # Generate the labels
-        PredictionModelAssets._generate_labels(price_change_requirements)
+        with Profiler.stage("labels", "labels") as labels_stage:
+            labels: ITestDatasetLabels = PredictionModelAssets._generate_labels(price_change_requirements)
+            labels_stage["items"] = sum(len(l) for l in labels.values())
 
         # Generate the lookback indexer
-        PredictionModelAssets._generate_lookback_indexer()
+        with Profiler.stage("lookback_indexer", "candles") as lookback_indexer_stage:
+            lookback_indexer: ndarray = PredictionModelAssets._generate_lookback_indexer()
+            lookback_indexer_stage["items"] = lookback_indexer.shape[0]
 
+        # Save the assets
+        with Profiler.stage("save_assets") as save_stage:
+            PredictionModelAssets._save_assets(features, labels, Candlestick.DF["ot"].to_numpy(), lookback_indexer)
 
+        # Print the time taken by each stage
+        print("\n\nAssets Build Timing:")
+        print(f"Features: {round(features_stage['duration'], 2)}s")
+        print(f"Labels: {round(labels_stage['duration'], 2)}s")
+        print(f"Lookback Indexer: {round(lookback_indexer_stage['duration'], 2)}s")
+        print(f"Save: {round(save_stage['duration'], 2)}s")
+        print(f"Peak Memory: {Utils.get_peak_memory()} MB")
 
 
 
@@ -103,66 +157,197 @@ class PredictionModelAssets:
 
 
 
-    ##############
-    ## Features ##
-    ##############
 
 
+    ###################
+    ## Assets Export ##
+    ###################
 
 
-    @staticmethod
-    def _generate_features(regression_ids: List[str]) -> None:
-        """Builds and saves the test dataset features obtained from
-        the build's regressions. The features are saved so they can analyzed
-        externally.
 
-        Args:
-            regression_ids: List[str]
-                The list of regressions that will be used to generate prediction models.
-            price_change_requirements: List[float]
 
-        Returns:
-            ITestDatasetFeatures
+    @staticmethod
+    def export_json() -> None:
+        """Exports the features, labels and lookback indexer as JSON files so they can
+        be analyzed externally. The files follow the same structure as the ones generated
+        by the epochs that were initialized prior to the binary format.
         """
-        print("Generating Features...\n")
-        # Init the input ds
-        input_ds: ndarray = PredictionModelAssets._build_input_ds()
+        # Load the assets
+        assets: PredictionModelAssets = PredictionModelAssets()
 
-        # Build the features dict
-        features: ITestDatasetFeatures = {
-            reg_id: Regression(reg_id).predict_feature(input_ds) for reg_id in regression_ids
+        # Export the features
+        print("Exporting Features...")
+        features: ITestDatasetFeatures = { 
+            reg_id: assets.features_matrix[i].tolist() for i, reg_id in enumerate(assets.feature_ids) 
         }
-        
-        # Finally, save the features
         Utils.write(Epoch.PATH.prediction_models_features(), features)
 
+        # Export the labels
+        print("Exporting Labels...")
+        labels: ITestDatasetLabels = { pcr: l.tolist() for pcr, l in assets.labels_arrays.items() }
+        Utils.write(Epoch.PATH.prediction_models_labels(), labels)
+
+        # Export the lookback indexer
+        print("Exporting Lookback Indexer...")
+        indexer: ILookbackIndexer = { 
+            str(ot): i for ot, i in zip(Candlestick.DF["ot"].tolist(), assets.lookback_indexer.tolist())
+        }
+        Utils.write(Epoch.PATH.prediction_models_lookback_indexer(), indexer)
+
+
+
+
+
+
+    @staticmethod
+    def convert_json() -> None:
+        """Converts the JSON assets of an epoch that was built prior to the binary 
+        format. The JSON files are kept in place.
+
+        Raises:
+            RuntimeError:
+                If any of the JSON assets does not exist.
+                If the lookback indexer is not aligned to the 1m candlesticks.
+        """
+        # Load the JSON assets
+        print("Reading the JSON Assets...")
+        features: ITestDatasetFeatures = Utils.read(Epoch.PATH.prediction_models_features())
+        labels: ITestDatasetLabels = Utils.read(Epoch.PATH.prediction_models_labels())
+        indexer: ILookbackIndexer = Utils.read(Epoch.PATH.prediction_models_lookback_indexer())
+
+        # Save them in the binary format
+        print("Saving the Binary Assets...")
+        PredictionModelAssets._save_assets(
+            features, 
+            labels, 
+            array([int(ot) for ot in indexer.keys()]), 
+            array(list(indexer.values()), dtype=int32)
+        )
+
+        # Finally, make sure the converted assets are aligned to the 1m candlesticks
+        PredictionModelAssets()
+
+
 
 
 
 
 
+
+
+
+    #################
+    ## Assets Disk ##
+    #################
+
+
+
+
     @staticmethod
-    def _build_input_ds() -> ndarray:
-        """Builds the input dataset that will be used in order to predict all
-        the features for each regression.
+    def _save_assets(
+        features: ITestDatasetFeatures, 
+        labels: ITestDatasetLabels, 
+        ot: ndarray, 
+        lookback_indexer: ndarray
+    ) -> None:
+        """Packs and saves the assets in the binary format. The metadata file is
+        written last so the assets are only loaded once all the arrays are in place.
+
+        Args:
+            features: ITestDatasetFeatures
+                The features by regression ID.
+            labels: ITestDatasetLabels
+                The labels by price change requirement in string format.
+            ot: ndarray
+                The open times of the 1m candlesticks the lookback indexer is aligned to.
+            lookback_indexer: ndarray
+                The prediction candlestick index of each 1m candlestick.
+        """
+        # Pack the features
+        feature_ids: List[str] = list(features.keys())
+        features_matrix: ndarray = array([features[id] for id in feature_ids], dtype=float32)
+
+        # Pack the labels, padding the rows with 0s
+        pcrs: List[str] = list(labels.keys())
+        labels_num: List[int] = [len(labels[pcr]) for pcr in pcrs]
+        labels_matrix: ndarray = zeros((len(pcrs), max(labels_num)), dtype=int8)
+        for i, pcr in enumerate(pcrs):
+            labels_matrix[i, :labels_num[i]] = labels[pcr]
+
+        # Save the arrays
+        Utils.write_atomic(Epoch.PATH.prediction_models_features_matrix(), features_matrix)
+        Utils.write_atomic(Epoch.PATH.prediction_models_labels_matrix(), labels_matrix)
+        Utils.write_atomic(
+            Epoch.PATH.prediction_models_lookback_indexer_array(), 
+            lookback_indexer.astype(int32)
+        )
+
+        # Finally, save the metadata
+        meta: IPredictionModelAssetsMeta = {
+            "feature_ids": feature_ids,
+            "features_num": features_matrix.shape[1],
+            "price_change_requirements": pcrs,
+            "labels_num": labels_num,
+            "lookback_indexer_start": int(ot[0]),
+            "lookback_indexer_end": int(ot[-1]),
+            "lookback_indexer_num": int(ot.shape[0])
+        }
+        Utils.write(Epoch.PATH.prediction_models_assets_meta(), meta)
+
+
+
+
+
+
+    @staticmethod
+    def _read_meta() -> IPredictionModelAssetsMeta:
+        """Reads the metadata of the binary assets.
 
         Returns:
-            ndarray
+            IPredictionModelAssetsMeta
+
+        Raises:
+            RuntimeError:
+                If the metadata file does not exist.
         """
-        # Init the df, grabbing only the close prices
-        df: DataFrame = Candlestick.NORMALIZED_PREDICTION_DF[["c"]].copy()
+        if not Utils.file_exists(Epoch.PATH.prediction_models_assets_meta()):
+            raise RuntimeError("The prediction model assets could not be found. If the epoch was initialized "\
+                "prior to the binary format, run convert_prediction_model_assets.py.")
+        return Utils.read(Epoch.PATH.prediction_models_assets_meta())
+
+
+
+
+
+
+
+
+
+
+
 
-        # Init features list
-        features_raw: List[List[float]] = []
+    ##############
+    ## Features ##
+    ##############
+
+
+
+
+    @staticmethod
+    def _generate_features(regression_ids: List[str], workers: Union[int, None]) -> ITestDatasetFeatures:
+        """Builds the test dataset features obtained from the build's regressions.
 
-        # Iterate over the normalized ds and build the features & labels
-        for i in range(Epoch.REGRESSION_LOOKBACK, df.shape[0]):
-            # Make sure there are enough items remaining
-            if i < (df.shape[0]-Epoch.REGRESSION_PREDICTIONS):
-                features_raw.append(df.iloc[i-Epoch.REGRESSION_LOOKBACK:i, 0])
+        Args:
+            regression_ids: List[str]
+                The list of regressions that will be used to generate prediction models.
+            workers: Union[int, None]
+                The number of processes that will predict the features.
 
-        # Finally, return the features as a numpy array
-        return array(features_raw)
+        Returns:
+            ITestDatasetFeatures
+        """
+        print("Generating Features...\n")
+        return PredictionModelFeatures.generate(regression_ids, workers)
 
 
 
@@ -185,24 +370,22 @@ class PredictionModelAssets:
 
 
     @staticmethod
-    def _generate_labels(price_change_requirements: List[float]) -> None:
-        """Builds and saves the labels file for all price_change_requirements. In case it has 
-        already been saved, it loads it into memory.
+    def _generate_labels(price_change_requirements: List[float]) -> ITestDatasetLabels:
+        """Builds the labels for all price_change_requirements.
 
         Args:
             price_change_requirements: List[float]
                 The list of price change requirements that will be used to generate the labels.
+
+        Returns:
+            ITestDatasetLabels
         """
         print("Generating Labels...")
-        # Initialize the labels dict
-        labels: ITestDatasetLabels = {}
-
-        # Iterate over each pcr, generating the labels
-        for pcr in price_change_requirements:
-            labels[str(pcr)] = PredictionModelAssets._generate_labels_for_pcr(pcr)
-        
-        # Store the file for future uses
-        Utils.write(Epoch.PATH.prediction_models_labels(), labels)
+        # Build the labels for all the price change requirements at once
+        labels: ITestDatasetLabels = PredictionModelAssets._build_labels(price_change_requirements)
+        for pcr, pcr_labels in labels.items():
+            print(f"PCR {pcr}%: {len(pcr_labels)} labels")
+        return labels
 
 
 
@@ -210,38 +393,62 @@ class PredictionModelAssets:
 
 
     @staticmethod
-    def _generate_labels_for_pcr(price_change_requirement: float) -> List[ITestDatasetLabel]:
-        """Generates the test dataset labels (outcomes) based on a provided price
-        change requirement.
+    def _build_labels(price_change_requirements: List[float]) -> ITestDatasetLabels:
+        """Generates the test dataset labels (outcomes) for all the price change requirements.
+        For each prediction candlestick, the label is determined by the first 1m candlestick
+        after its open time that hits the increase (high) or the decrease (low) price. If 
+        both are hit by the same candlestick, the increase takes precedence. The labels
+        stop at the first prediction candlestick whose outcome cannot be determined.
+
+        The first touches of all the prediction candlesticks and requirements are found at 
+        once by searching the sparse tables of the highs and lows.
 
         Args:
-            price_change_requirement: float
-                The price percentage change required in order to determine the
-                label.
+            price_change_requirements: List[float]
+                The list of price change requirements.
 
         Returns:
-            List[ITestDatasetLabel]
+            ITestDatasetLabels
         """
-        # Init the label list
-        labels: List[ITestDatasetLabel] = []
-        print(f"\nGenerating PCR {price_change_requirement}% Labels...")
-        progress_bar = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=Candlestick.PREDICTION_DF.shape[0] - Epoch.REGRESSION_LOOKBACK)
-        
-        # Iterate over each prediction candlestick, after the initial lookback
-        for prediction_candlestick in Candlestick.PREDICTION_DF.iloc[Epoch.REGRESSION_LOOKBACK:].to_records():
-            # Retrieve the label
-            label: Union[ITestDatasetLabel, None] = PredictionModelAssets._get_label(price_change_requirement, prediction_candlestick)
-
-            # Add it if a label was determined
-            if label is not None:
-                labels.append(label)
-
-            # Otherwise, stop looking for labels
-            else:
-                break
-
-            # Update progress
-            progress_bar.update()
+        # Init the 1m candlesticks as well as their sparse tables
+        ot: ndarray = Candlestick.DF["ot"].to_numpy()
+        high_table: List[ndarray] = PredictionModelAssets._build_sparse_table(Candlestick.DF["h"].to_numpy(), maximum)
+        low_table: List[ndarray] = PredictionModelAssets._build_sparse_table(Candlestick.DF["l"].to_numpy(), minimum)
+
+        # Init the prediction candlesticks, after the initial lookback
+        pred_df = Candlestick.PREDICTION_DF.iloc[Epoch.REGRESSION_LOOKBACK:]
+        pred_num: int = pred_df.shape[0]
+
+        # Each prediction candlestick is evaluated starting on the first 1m candlestick after its open time
+        starts: ndarray = searchsorted(ot, pred_df["ot"].to_numpy(), side="right")
+
+        # Calculate the exit prices for each requirement
+        increase_prices: List[float] = []
+        decrease_prices: List[float] = []
+        for pcr in price_change_requirements:
+            for open_price in pred_df["o"].to_numpy():
+                increase_price, decrease_price = PredictionModelAssets._get_exit_prices(pcr, open_price)
+                increase_prices.append(increase_price)
+                decrease_prices.append(decrease_price)
+
+        # Find the first touches for all the requirements
+        all_starts: ndarray = concatenate([starts] * len(price_change_requirements))
+        increase_touches: ndarray = PredictionModelAssets._find_first_touch(high_table, all_starts, array(increase_prices), True)
+        decrease_touches: ndarray = PredictionModelAssets._find_first_touch(low_table, all_starts, array(decrease_prices), False)
+
+        # Build the labels for each requirement
+        labels: ITestDatasetLabels = {}
+        for i, pcr in enumerate(price_change_requirements):
+            # Subset the touches
+            increase: ndarray = increase_touches[i*pred_num:(i+1)*pred_num]
+            decrease: ndarray = decrease_touches[i*pred_num:(i+1)*pred_num]
+
+            # The labels end on the first undetermined outcome
+            undetermined: ndarray = flatnonzero(minimum(increase, decrease) >= ot.shape[0])
+            labels_num: int = int(undetermined[0]) if undetermined.shape[0] > 0 else pred_num
+
+            # Finally, populate the labels
+            labels[str(pcr)] = [1 if inc <= dec else -1 for inc, dec in zip(increase[:labels_num].tolist(), decrease[:labels_num].tolist())]
 
         # Finally, return the labels
         return labels
@@ -252,31 +459,67 @@ class PredictionModelAssets:
 
 
     @staticmethod
-    def _get_label(price_change_requirement: float, pred_candlestick: Dict[str, float]) -> ITestDatasetLabel:
-        """Based on a provided prediction candlestick, it will determine what the outcome 
-        will be in the future, based on the pcr.
+    def _build_sparse_table(values: ndarray, func) -> List[ndarray]:
+        """Builds a sparse table in which the level k contains the result of applying the
+        function (maximum|minimum) to windows of 2^k values starting at each position.
 
         Args:
-            price_change_requirement: float
-                The percentage change required for an outcome to be determined.
-            pred_candlestick: Dict[str, float]
-                The current prediction candlestick.
+            values: ndarray
+                The values the table will be built for.
+            func: Callable
+                The numpy function used to combine windows (maximum|minimum).
 
         Returns:
-            ITestDatasetLabel
+            List[ndarray]
         """
-        # Calculate the exit prices
-        increase_price, decrease_price = PredictionModelAssets._get_exit_prices(price_change_requirement, pred_candlestick["o"])
+        table: List[ndarray] = [values]
+        width: int = 1
+        while width * 2 <= values.shape[0]:
+            table.append(func(table[-1][:-width], table[-1][width:]))
+            width *= 2
+        return table
+
+
+
+
 
-        # Iterate over 1m candlesticks until the label is determined
-        for candlestick in Candlestick.DF[Candlestick.DF["ot"] > pred_candlestick["ot"]].to_records():
-            if candlestick["h"] >= increase_price:
-                return 1
-            elif candlestick["l"] <= decrease_price:
-                return -1
-        
-        # If no label is determined, return None
-        return None
+
+    @staticmethod
+    def _find_first_touch(table: List[ndarray], starts: ndarray, prices: ndarray, is_high: bool) -> ndarray:
+        """Finds the first position from each start in which the values hit the price. A high 
+        hits the price when it is greater than or equals to it and a low when it is less than
+        or equals to it. If a price is never hit, the position will be equals to the number
+        of values.
+
+        The windows that don't hit the price are skipped from the largest to the smallest 
+        one, for all the starts at the same time.
+
+        Args:
+            table: List[ndarray]
+                The sparse table of the highs or the lows.
+            starts: ndarray
+                The positions in which the search starts.
+            prices: ndarray
+                The price to be hit for each start.
+            is_high: bool
+                True if the table contains the highs.
+
+        Returns:
+            ndarray
+        """
+        # Init values
+        values_num: int = table[0].shape[0]
+        positions: ndarray = starts.copy()
+
+        # Skip the windows that don't hit the price
+        for level in range(len(table) - 1, -1, -1):
+            width: int = 1 << level
+            window: ndarray = table[level][minimum(positions, table[level].shape[0] - 1)]
+            missed: ndarray = window < prices if is_high else window > prices
+            positions = where((positions + width <= values_num) & missed, positions + width, positions)
+
+        # Finally, return the positions
+        return positions
 
 
 
@@ -324,35 +567,27 @@ class PredictionModelAssets:
 
 
     @staticmethod
-    def _generate_lookback_indexer() -> None:
-        """Builds and saves the lookback indexer file.
+    def _generate_lookback_indexer() -> ndarray:
+        """Builds the lookback indexer. Each 1m candlestick is related to the last 
+        prediction candlestick that opened at or before it.
+
+        Returns:
+            ndarray
         """
-        # Init the indexer
-        indexer: ILookbackIndexer = {}
         print("\n\nGenerating Lookback Indexer")
-        progress_bar: tqdm = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=Candlestick.DF.shape[0])
+        # Init the open times
+        ot: ndarray = Candlestick.DF["ot"].to_numpy()
+        pred_ot: ndarray = Candlestick.PREDICTION_DF["ot"].to_numpy()
 
-        # Iterate over each candlestick and populate the indexer
-        for candlestick_1m in Candlestick.DF.to_records():
-            indexer[str(candlestick_1m["ot"])] = PredictionModelAssets._get_prediction_candlestick_index(candlestick_1m["ot"])
-            progress_bar.update()
-
-        # Store the indexer for future use
-        Utils.write(Epoch.PATH.prediction_models_lookback_indexer(), indexer)
+        # Find the position of the prediction candlestick of each 1m candlestick
+        positions: ndarray = searchsorted(pred_ot, ot, side="right") - 1
 
+        # Make sure every 1m candlestick opened after the first prediction candlestick
+        if (positions < 0).any():
+            raise ValueError(f"The 1m candlestick {int(ot[flatnonzero(positions < 0)[0]])} opened before the first prediction candlestick {int(pred_ot[0])}.")
 
+        # Retrieve the index of each prediction candlestick
+        pred_indexes: ndarray = Candlestick.PREDICTION_DF.index.values[positions]
 
-
-    @staticmethod
-    def _get_prediction_candlestick_index(current_time: int) -> int:
-        """Based on the time of a 1 minute candlestick, it returns the index
-        it belongs to in the prediction df.
-
-        Args:
-            current_time: int
-                The open time of the current 1m candlestick.
-
-        Returns:
-            int
-        """
-        return int(Candlestick.PREDICTION_DF[Candlestick.PREDICTION_DF["ot"] <= current_time].iloc[-1:].index.values[0] - Epoch.REGRESSION_LOOKBACK)
\ No newline at end of file
+        # Finally, adjust the indexes to the test dataset
+        return (pred_indexes - Epoch.REGRESSION_LOOKBACK).astype(int32)
\ No newline at end of file
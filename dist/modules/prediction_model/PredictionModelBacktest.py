@@ -1,6 +1,7 @@
-from typing import List, Union, Tuple
+from typing import List, Union, Tuple, Dict
+from numpy import ndarray, array, empty, ascontiguousarray, searchsorted, flatnonzero, float64, dtype as np_dtype
 from modules._types import IPredictionResult, IPrediction, IBacktestPositionType, IBacktestPosition, IBacktestPerformance,\
-    ILookbackIndexer, ICandlestick, IPredictionStateIntensity
+    ICandlestick, IPredictionStateIntensity
 from modules.utils.Utils import Utils
 from modules.candlestick.Candlestick import Candlestick
 from modules.epoch.Epoch import Epoch
@@ -14,11 +15,28 @@ class PredictionModelBacktest:
 
     This class builds handles the backtesting of Prediction Models.
 
+    Class Properties:
+        CANDLESTICK_DTYPE: np_dtype
+            The data type of the indexed 1m candlestick records.
+        CLOSE_SEARCH_BLOCK: int
+            The initial size of the block scanned when searching for a position's exit.
+
     Instance Properties:
         features_num: int
             The total number of features per regression.
-        lookback_indexer: ILookbackIndexer
-            The indexer used to relate 1m candlesticks with test dataset indexes.
+        candlesticks: ndarray
+            The 1m candlestick records (ot, ct, o, h, l) alongside the test dataset index
+            (i) each one of them belongs to. Check build_candlesticks for more info.
+        event_driven: bool
+            If enabled, the backtest jumps from one signal to the next and finds the candlestick
+            that closes each position with a vectorized search. Otherwise, it iterates over 
+            every 1m candlestick. Both modes produce the exact same positions.
+        ot: ndarray
+        ct: ndarray
+        h: ndarray
+        l: ndarray
+        i: ndarray
+            The candlestick columns used by the event driven mode.
         initial_balance: float
             The balance the model has prior to trading.
         equity_size: float
@@ -60,6 +78,17 @@ class PredictionModelBacktest:
             The minimum increase and decrease sums required to generate
             non-neutral predictions.
     """
+    # Candlestick Records Data Type
+    # The 1m candlesticks are iterated as records. Each record also contains the test dataset 
+    # index it belongs to (lookback indexer).
+    CANDLESTICK_DTYPE: np_dtype = np_dtype([
+        ("ot", "int64"), ("ct", "int64"), ("o", "float64"), ("h", "float64"), ("l", "float64"), ("i", "int64")
+    ])
+
+    # Position Close Search Block
+    # The initial number of candlesticks that are scanned at once when looking for the candlestick
+    # that closes a position. The block doubles in size every time no exit is found in it.
+    CLOSE_SEARCH_BLOCK: int = 512
 
 
 
@@ -72,20 +101,30 @@ class PredictionModelBacktest:
 
 
 
-    def __init__(self, features_num: int, lookback_indexer: ILookbackIndexer):
+    def __init__(self, features_num: int, candlesticks: ndarray, event_driven: bool = True):
         """Initializes the PredictionModelBacktest Instance.
 
         Args:
             features_num: int
                 The total number of features per regression.
-            lookback_indexer: ILookbackIndexer
-                The 1m candlestick indexer.
+            candlesticks: ndarray
+                The indexed 1m candlestick records built by build_candlesticks.
+            event_driven: bool
+                The backtest mode. Defaults to event driven.
         """
         # Initialize the number of features
         self.features_num: int = features_num
 
-        # Initialize the lookback indexer
-        self.lookback_indexer: ILookbackIndexer = lookback_indexer
+        # Initialize the indexed candlesticks
+        self.candlesticks: ndarray = candlesticks
+
+        # Initialize the mode as well as the columns used by the event driven mode
+        self.event_driven: bool = event_driven
+        self.ot: ndarray = ascontiguousarray(candlesticks["ot"])
+        self.ct: ndarray = ascontiguousarray(candlesticks["ct"])
+        self.h: ndarray = ascontiguousarray(candlesticks["h"])
+        self.l: ndarray = ascontiguousarray(candlesticks["l"])
+        self.i: ndarray = ascontiguousarray(candlesticks["i"])
 
         # Calculate the initial balance
         self.initial_balance: float = round(Epoch.POSITION_SIZE * 1.5, 2)
@@ -108,6 +147,37 @@ class PredictionModelBacktest:
 
 
 
+    @staticmethod
+    def build_candlesticks(lookback_indexer: ndarray) -> ndarray:
+        """Builds the 1m candlestick records that will be iterated by the backtest. Since 
+        the records are built once and include the test dataset index, the lookback indexer
+        doesn't need to be queried on every candlestick.
+
+        Args:
+            lookback_indexer: ndarray
+                The prediction candlestick index of each 1m candlestick.
+
+        Returns:
+            ndarray
+        """
+        candlesticks: ndarray = empty(Candlestick.DF.shape[0], dtype=PredictionModelBacktest.CANDLESTICK_DTYPE)
+        for column in ["ot", "ct", "o", "h", "l"]:
+            candlesticks[column] = Candlestick.DF[column].to_numpy()
+        candlesticks["i"] = lookback_indexer
+        return candlesticks
+
+
+
+
+
+
+
+
+
+
+
+
+
     ##########################
     ## Backtest Performance ##
     ##########################
@@ -176,14 +246,37 @@ class PredictionModelBacktest:
         self.min_increase_sum: float = min_increase_sum
         self.min_decrease_sum: float = min_decrease_sum
 
+        # Run the backtest based on the mode
+        if self.event_driven:
+            self._run_event_driven(features, features_sum)
+        else:
+            self._run_per_minute(features, features_sum)
+
+        # Finally, return the performance
+        return self._build_performance()
+
+
+
+
+
+
+    def _run_per_minute(self, features: List[List[float]], features_sum: List[float]) -> None:
+        """Runs the backtest by iterating over every 1m candlestick.
+
+        Args:
+            features: List[List[float]]
+                The raw list of features.
+            features_sum: List[float]
+                The list of features sums.
+        """
         # Idle Until
         # The model will remain in an idle state until a candlestick's ot is greater than this value.
         idle_until: int = 0
 
         # Iterate for as long there are features and enough balance to cover the position size
-        for candlestick in Candlestick.DF.to_records():
+        for candlestick in self.candlesticks:
             # Init the current index
-            current_index: int = self.lookback_indexer[str(candlestick["ot"])]
+            current_index: int = candlestick["i"]
 
             # Make sure there are features and sufficient balance to cover the position size
             if current_index < self.features_num and self.current_balance >= Epoch.POSITION_SIZE:
@@ -215,8 +308,137 @@ class PredictionModelBacktest:
             else:
                 break
 
-        # Finally, return the performance
-        return self._build_performance()
+
+
+
+
+
+    def _run_event_driven(self, features: List[List[float]], features_sum: List[float]) -> None:
+        """Runs the backtest by jumping from one signal to the next. When a position is 
+        opened, the candlestick that closes it is found with a vectorized search and the 
+        idle minutes are skipped right after. The positions are identical to the ones
+        generated by the per minute mode.
+
+        Args:
+            features: List[List[float]]
+                The raw list of features.
+            features_sum: List[float]
+                The list of features sums.
+        """
+        # The backtest stops on the first candlestick that has no features
+        end: int = int(searchsorted(self.i, self.features_num, side="left"))
+
+        # Init the signal candidates
+        candidates: ndarray = self._get_signal_candidates(features_sum)
+        results: Dict[int, IPredictionResult] = {}
+
+        # Iterate for as long there are candlesticks and enough balance to cover the position size
+        minute: int = 0
+        idle_until: int = 0
+        while minute < end and self.current_balance >= Epoch.POSITION_SIZE:
+            # Skip the idle candlesticks
+            minute = max(minute, int(searchsorted(self.ot, idle_until, side="left")))
+            if minute >= end:
+                break
+
+            # Find the next non-neutral prediction from the current index onwards
+            index: Union[int, None] = None
+            for candidate in candidates[searchsorted(candidates, self.i[minute], side="left"):]:
+                candidate = int(candidate)
+                if candidate not in results:
+                    results[candidate] = self._get_prediction_result(features_sum[candidate-5:candidate+1])
+                if results[candidate] != 0:
+                    index = candidate
+                    break
+
+            # If there are no more signals, stop the process
+            if index is None:
+                break
+
+            # Open the position on the first candlestick of the index
+            minute = max(minute, int(searchsorted(self.i, index, side="left")))
+            self._open_position(self.candlesticks[minute], {
+                "r": results[index],
+                "t": int(self.ot[minute]),
+                "f": features[index]
+            })
+
+            # Find the candlestick that closes the position. If the position cannot be
+            # closed before the features run out, stop the process
+            close_minute: Union[int, None] = self._find_position_close(minute + 1, end)
+            if close_minute is None:
+                break
+
+            # Close the position and enable the idle state
+            self._check_position(self.candlesticks[close_minute])
+            idle_until = Utils.add_minutes(self.ct[close_minute], Epoch.IDLE_MINUTES_ON_POSITION_CLOSE)
+            minute = close_minute + 1
+
+
+
+
+
+
+    def _get_signal_candidates(self, features_sum: List[float]) -> ndarray:
+        """Retrieves the indexes in which a non-neutral prediction could be generated. A 
+        non-neutral prediction requires at least 5 sums in the past and the sums to be 
+        either increasing or decreasing for the last 3 indexes.
+
+        Args:
+            features_sum: List[float]
+                The list of features sums.
+
+        Returns:
+            ndarray
+        """
+        # Init the sums and the steps (sums[k+1] > sums[k] | sums[k+1] < sums[k])
+        sums: ndarray = array(features_sum[:self.features_num], dtype=float64)
+        up: ndarray = sums[1:] > sums[:-1]
+        down: ndarray = sums[1:] < sums[:-1]
+
+        # Build the candidates mask, starting at index 6
+        increasing: ndarray = up[5:] & up[4:-1] & up[3:-2]
+        decreasing: ndarray = down[5:] & down[4:-1] & down[3:-2]
+
+        # Finally, return the candidate indexes
+        return flatnonzero(increasing | decreasing) + 6
+
+
+
+
+
+
+    def _find_position_close(self, start: int, end: int) -> Union[int, None]:
+        """Finds the first candlestick that hits the take profit or the stop loss of
+        the active position. The candlesticks are scanned in blocks that double in size.
+
+        Args:
+            start: int
+                The first candlestick that can close the position.
+            end: int
+                The candlestick in which the process stops.
+
+        Returns:
+            Union[int, None]
+        """
+        # Init the prices that close the position when hit by the high or the low
+        if self.active["t"] == 1:
+            high_exit, low_exit = self.active["tpp"], self.active["slp"]
+        else:
+            high_exit, low_exit = self.active["slp"], self.active["tpp"]
+
+        # Scan the candlesticks until an exit is found
+        block: int = PredictionModelBacktest.CLOSE_SEARCH_BLOCK
+        while start < end:
+            stop: int = min(start + block, end)
+            hits: ndarray = flatnonzero((self.h[start:stop] >= high_exit) | (self.l[start:stop] <= low_exit))
+            if hits.shape[0] > 0:
+                return start + int(hits[0])
+            start = stop
+            block *= 2
+
+        # The position was not closed
+        return None
 
 
 
@@ -608,21 +830,15 @@ class PredictionModelBacktest:
         # Ensure at least 1 position was executed
         txs: int = len(balance_hist)
         if txs > 1:
-            # Initialize the drawdowns list
-            drawdowns: List[float] = []
-
-            # Iterate over each element
-            for i in range(txs):
-                # Ensure there are enough items
-                if i < (txs - 1):
-                    # Calculate the smallest value after the current index
-                    smallest: float = min(balance_hist[i+1:])
-
-                    # Calculate the size and add it to the list
-                    drawdowns.append(Utils.get_percentage_change(balance_hist[i], smallest))
+            # Iterate backwards, keeping track of the smallest balance after the current index
+            smallest: float = balance_hist[-1]
+            largest_drawdown: float = Utils.get_percentage_change(balance_hist[-2], smallest)
+            for i in range(txs - 3, -1, -1):
+                smallest = min(smallest, balance_hist[i+1])
+                largest_drawdown = min(largest_drawdown, Utils.get_percentage_change(balance_hist[i], smallest))
 
             # Finally, return the largest drawdown
-            return min(drawdowns)
+            return largest_drawdown
 
         # Otherwise, there is no drawdown
         else:
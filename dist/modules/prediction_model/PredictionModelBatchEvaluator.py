@@ -0,0 +1,462 @@
+from typing import List, Dict, Tuple, Union, Callable
+from time import time
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from numpy import ndarray, array, empty, mean, median, int64
+from tqdm import tqdm
+from modules._types import IPredictionModelMinifiedConfig, IBacktestPerformance, ISharedArray, IBatchEvaluatorSharedArrays
+from modules.epoch.Epoch import Epoch
+from modules.prediction_model.PredictionModelBacktest import PredictionModelBacktest
+from modules.prediction_model.PredictionModelConfigSpace import PredictionModelConfigSpace
+
+
+
+
+class PredictionModelBatchEvaluator:
+    """PredictionModelBatchEvaluator Class
+
+    This class evaluates ranges of prediction model configurations in chunks. Each chunk is
+    decoded from the configuration space right before being evaluated. The features
+    sums of an entire chunk are calculated at once from the features matrix and the discovery's
+    min sums are derived from boolean masks. When more than 1 worker is used, the chunks are
+    distributed across a pool of processes that read the features, labels and candlesticks
+    from shared memory. Since TensorFlow is imported by the parent process and it is not
+    fork-safe, the workers are spawned and initialize the Epoch on their own.
+
+    Class Properties:
+        CHUNK_SIZE: int
+            The number of configurations that are evaluated in a single task.
+        MIN_ACCURACY: float
+            The minimum backtest accuracy a configuration needs in order to be considered
+            profitable.
+        WORKER: Union[PredictionModelBatchEvaluator, None]
+        WORKER_SPACE: Union[PredictionModelConfigSpace, None]
+        WORKER_SHARED_MEMORY: List[SharedMemory]
+            The evaluator instance, the configuration space and the shared memory blocks
+            attached within a worker process.
+
+    Instance Properties:
+        feature_ids: List[str]
+            The list of regression IDs following the order of the features matrix.
+        feature_index: Dict[str, int]
+            The row of each regression within the features matrix.
+        features: ndarray
+            The features matrix (regressions x features).
+        features_num: int
+            The total number of features per regression.
+        labels: Dict[str, ndarray]
+            The labels arrays by price change requirement in string format.
+        candlesticks: ndarray
+            The indexed 1m candlestick records used by the backtest.
+        backtest: PredictionModelBacktest
+            The instance of the backtester.
+    """
+    # The number of configurations per task
+    CHUNK_SIZE: int = 250
+
+    # A model is considered to be profitable if it meets the minimum accuracy,
+    # ends up with a positive balance and has a balance drawdown that meets the requirements.
+    MIN_ACCURACY: float = 55
+    #MAX_BALANCE_DRAWDOWN: float = -50
+
+    # Worker State
+    WORKER: Union["PredictionModelBatchEvaluator", None] = None
+    WORKER_SPACE: Union[PredictionModelConfigSpace, None] = None
+    WORKER_SHARED_MEMORY: List[SharedMemory] = []
+
+
+
+
+
+    def __init__(self, feature_ids: List[str], features: ndarray, labels: Dict[str, ndarray], candlesticks: ndarray):
+        """Initializes the PredictionModelBatchEvaluator Instance.
+
+        Args:
+            feature_ids: List[str]
+                The list of regression IDs following the order of the features matrix.
+            features: ndarray
+                The features matrix (regressions x features).
+            labels: Dict[str, ndarray]
+                The labels arrays by price change requirement.
+            candlesticks: ndarray
+                The indexed 1m candlestick records.
+        """
+        # Init the features
+        self.feature_ids: List[str] = feature_ids
+        self.feature_index: Dict[str, int] = { id: i for i, id in enumerate(feature_ids) }
+        self.features: ndarray = features
+        self.features_num: int = features.shape[1]
+
+        # Init the labels
+        self.labels: Dict[str, ndarray] = labels
+
+        # Init the candlesticks and the backtest instance
+        self.candlesticks: ndarray = candlesticks
+        self.backtest: PredictionModelBacktest = PredictionModelBacktest(self.features_num, self.candlesticks)
+
+
+
+
+
+
+
+
+
+
+    ######################
+    ## Batch Evaluation ##
+    ######################
+
+
+
+
+    def evaluate(
+        self,
+        space: PredictionModelConfigSpace,
+        start_index: int,
+        end_index: int,
+        workers: int,
+        on_profitable: Callable[[int], None]
+    ) -> float:
+        """Evaluates a range of configurations and notifies the index of the profitable
+        ones in the same order they are placed in the space.
+
+        Args:
+            space: PredictionModelConfigSpace
+                The configuration space the configurations are decoded from.
+            start_index: int
+                The index of the first configuration within the space.
+            end_index: int
+                The index after the last configuration within the space.
+            workers: int
+                The number of processes that will evaluate the configurations.
+            on_profitable: Callable[[int], None]
+                The function invoked whenever a profitable configuration is found.
+
+        Returns:
+            float
+            The number of configurations evaluated per second.
+        """
+        # Build the chunks (start index, end index)
+        chunks: List[Tuple[int, int]] = [
+            (i, min(i + PredictionModelBatchEvaluator.CHUNK_SIZE, end_index))
+                for i in range(start_index, end_index, PredictionModelBatchEvaluator.CHUNK_SIZE)
+        ]
+        configs_num: int = max(end_index - start_index, 0)
+
+        # Init the progress bar
+        progress_bar = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=configs_num, unit="configs")
+        start_time: float = time()
+
+        # Distribute the chunks across the pool of workers
+        if workers > 1:
+            # Place the arrays in shared memory
+            shared_memory, shared_arrays = self._share_arrays()
+
+            # Evaluate the chunks. Keep in mind that imap yields the results in order
+            try:
+                with get_context("spawn").Pool(
+                    workers,
+                    initializer=PredictionModelBatchEvaluator._init_worker,
+                    initargs=(self.feature_ids, shared_arrays, space)
+                ) as pool:
+                    for chunk, profitable in zip(chunks, pool.imap(PredictionModelBatchEvaluator._evaluate_chunk_in_worker, chunks)):
+                        for index in profitable:
+                            on_profitable(index)
+                        progress_bar.update(chunk[1] - chunk[0])
+
+            # Release the shared memory
+            finally:
+                for shm in shared_memory:
+                    shm.close()
+                    shm.unlink()
+
+        # Otherwise, evaluate the chunks in the current process
+        else:
+            for chunk_start, chunk_end in chunks:
+                for index in self.evaluate_chunk(chunk_start, space.decode_range(chunk_start, chunk_end)):
+                    on_profitable(index)
+                progress_bar.update(chunk_end - chunk_start)
+        progress_bar.close()
+
+        # Finally, return the throughput
+        elapsed: float = time() - start_time
+        return configs_num / elapsed if elapsed > 0 else 0
+
+
+
+
+
+
+    def evaluate_chunk(self, start_index: int, configs: List[IPredictionModelMinifiedConfig]) -> List[int]:
+        """Evaluates a chunk of configurations and returns the indexes of the profitable ones.
+
+        Args:
+            start_index: int
+                The index of the first configuration of the chunk within the space.
+            configs: List[IPredictionModelMinifiedConfig]
+                The configurations in the chunk.
+
+        Returns:
+            List[int]
+        """
+        # Init the list of profitable indexes
+        profitable: List[int] = []
+
+        # Build the features sums for the entire chunk
+        features_sums: ndarray = self._build_features_sums(configs)
+
+        # Iterate over each config
+        for i, config in enumerate(configs):
+            # Calculate the min sums
+            min_increase_sum, min_decrease_sum = self._calculate_min_sums(config, features_sums[i])
+
+            # Backtest the model. The features are only attached to the positions
+            performance: IBacktestPerformance = self.backtest.calculate_performance(
+                price_change_requirement=config["pcr"],
+                min_increase_sum=min_increase_sum,
+                min_decrease_sum=min_decrease_sum,
+                features=self.features[[self.feature_index[id] for id in config["ri"]]].T,
+                features_sum=features_sums[i].tolist()
+            )
+
+            # Check if the accuracy and the profit requirements have been met
+            if performance["accuracy"] >= PredictionModelBatchEvaluator.MIN_ACCURACY and performance["profit"] > 0:
+                profitable.append(start_index + i)
+
+        # Finally, return the profitable indexes
+        return profitable
+
+
+
+
+
+
+
+    def _build_features_sums(self, configs: List[IPredictionModelMinifiedConfig]) -> ndarray:
+        """Builds the features sums matrix (configs x features) for a list of configurations.
+        The features are accumulated one regression at a time in the order they are
+        placed in the config so the sums are identical to the ones built with Python's sum.
+
+        Args:
+            configs: List[IPredictionModelMinifiedConfig]
+                The list of configurations.
+
+        Returns:
+            ndarray
+        """
+        # Init the sums matrix
+        sums: ndarray = empty((len(configs), self.features_num))
+
+        # Configs with different numbers of regressions are summed separately
+        regressions_num: List[int] = [len(config["ri"]) for config in configs]
+        for rpm in set(regressions_num):
+            # Build the regression indexes (configs x regressions)
+            rows: List[int] = [i for i, num in enumerate(regressions_num) if num == rpm]
+            indexes: ndarray = array([[self.feature_index[id] for id in configs[i]["ri"]] for i in rows], dtype=int64)
+
+            # Accumulate the features
+            rpm_sums: ndarray = self.features[indexes[:, 0]].copy()
+            for j in range(1, rpm):
+                rpm_sums += self.features[indexes[:, j]]
+            sums[rows] = rpm_sums
+
+        # Finally, return the sums
+        return sums
+
+
+
+
+
+
+    def _calculate_min_sums(self, config: IPredictionModelMinifiedConfig, features_sum: ndarray) -> Tuple[float, float]:
+        """Calculates the minimum increase and decrease sums for a configuration. The successful
+        predictions are extracted with boolean masks and their means|medians are calculated
+        exactly as PredictionModelDiscovery would.
+
+        Args:
+            config: IPredictionModelMinifiedConfig
+                The configuration of the model.
+            features_sum: ndarray
+                The features sums of the model.
+
+        Returns:
+            Tuple[float, float]
+            (min_increase_sum, min_decrease_sum)
+        """
+        # Subset the sums and the labels to the discovery's size
+        labels: ndarray = self.labels[str(config["pcr"])]
+        size: int = min(labels.shape[0], features_sum.shape[0])
+        sums: ndarray = features_sum[:size]
+        labels = labels[:size]
+
+        # Extract the successful increase and decrease predictions
+        increase_successful: ndarray = sums[(sums > 0) & (labels == 1)]
+        decrease_successful: ndarray = sums[(sums < 0) & (labels == -1)]
+
+        # Init the base values
+        func: Callable = mean if config["msf"] == "mean" else median
+        min_increase_sum: float = round(func(increase_successful if increase_successful.shape[0] > 0 else [0]), 6)
+        min_decrease_sum: float = round(func(decrease_successful if decrease_successful.shape[0] > 0 else [0]), 6)
+
+        # Calculate and return the adjusted values
+        return round(min_increase_sum*config["msaf"], 6), round(min_decrease_sum*config["msaf"], 6)
+
+
+
+
+
+
+
+
+
+
+
+    ###################
+    ## Shared Memory ##
+    ###################
+
+
+
+
+    def _share_arrays(self) -> Tuple[List[SharedMemory], IBatchEvaluatorSharedArrays]:
+        """Places the features, labels and candlesticks in shared memory.
+
+        Returns:
+            Tuple[List[SharedMemory], IBatchEvaluatorSharedArrays]
+            (shared_memory_blocks, shared_arrays)
+        """
+        # Init values
+        shared_memory: List[SharedMemory] = []
+
+        # Share the features
+        shm, features = PredictionModelBatchEvaluator._share_array(self.features)
+        shared_memory.append(shm)
+
+        # Share the labels
+        labels: Dict[str, ISharedArray] = {}
+        for pcr, pcr_labels in self.labels.items():
+            shm, labels[pcr] = PredictionModelBatchEvaluator._share_array(pcr_labels)
+            shared_memory.append(shm)
+
+        # Share the candlesticks
+        shm, candlesticks = PredictionModelBatchEvaluator._share_array(self.candlesticks)
+        shared_memory.append(shm)
+
+        # Finally, return the packed values
+        return shared_memory, { "features": features, "labels": labels, "candlesticks": candlesticks }
+
+
+
+
+
+    @staticmethod
+    def _share_array(arr: ndarray) -> Tuple[SharedMemory, ISharedArray]:
+        """Copies an array into a new shared memory block.
+
+        Args:
+            arr: ndarray
+                The array to be shared.
+
+        Returns:
+            Tuple[SharedMemory, ISharedArray]
+        """
+        shm: SharedMemory = SharedMemory(create=True, size=max(arr.nbytes, 1))
+        ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+        return shm, { "name": shm.name, "shape": arr.shape, "dtype": arr.dtype }
+
+
+
+
+
+    @staticmethod
+    def _attach_array(shared_array: ISharedArray) -> Tuple[SharedMemory, ndarray]:
+        """Attaches to an array that lives in shared memory. The array is read-only.
+
+        Args:
+            shared_array: ISharedArray
+                The descriptor of the shared array.
+
+        Returns:
+            Tuple[SharedMemory, ndarray]
+        """
+        shm: SharedMemory = SharedMemory(name=shared_array["name"])
+        arr: ndarray = ndarray(shared_array["shape"], dtype=shared_array["dtype"], buffer=shm.buf)
+        arr.flags.writeable = False
+        return shm, arr
+
+
+
+
+
+
+
+
+
+
+
+    #############
+    ## Workers ##
+    #############
+
+
+
+
+    @staticmethod
+    def _init_worker(
+        feature_ids: List[str],
+        shared_arrays: IBatchEvaluatorSharedArrays,
+        space: PredictionModelConfigSpace
+    ) -> None:
+        """Initializes the evaluator of a worker process based on the shared arrays. The
+        Epoch is initialized first as the backtest relies on its configuration.
+
+        Args:
+            feature_ids: List[str]
+                The list of regression IDs following the order of the features matrix.
+            shared_arrays: IBatchEvaluatorSharedArrays
+                The descriptors of the shared arrays.
+            space: PredictionModelConfigSpace
+                The configuration space the chunks are decoded from.
+        """
+        # Initialize the Epoch
+        if not Epoch.INITIALIZED:
+            Epoch.init()
+
+        # Attach the features
+        shm, features = PredictionModelBatchEvaluator._attach_array(shared_arrays["features"])
+        PredictionModelBatchEvaluator.WORKER_SHARED_MEMORY = [shm]
+
+        # Attach the labels
+        labels: Dict[str, ndarray] = {}
+        for pcr, shared_labels in shared_arrays["labels"].items():
+            shm, labels[pcr] = PredictionModelBatchEvaluator._attach_array(shared_labels)
+            PredictionModelBatchEvaluator.WORKER_SHARED_MEMORY.append(shm)
+
+        # Attach the candlesticks
+        shm, candlesticks = PredictionModelBatchEvaluator._attach_array(shared_arrays["candlesticks"])
+        PredictionModelBatchEvaluator.WORKER_SHARED_MEMORY.append(shm)
+
+        # Finally, initialize the worker's evaluator and configuration space
+        PredictionModelBatchEvaluator.WORKER = PredictionModelBatchEvaluator(feature_ids, features, labels, candlesticks)
+        PredictionModelBatchEvaluator.WORKER_SPACE = space
+
+
+
+
+
+    @staticmethod
+    def _evaluate_chunk_in_worker(chunk: Tuple[int, int]) -> List[int]:
+        """Decodes and evaluates a chunk of configurations within a worker process.
+
+        Args:
+            chunk: Tuple[int, int]
+                The start and end indexes of the chunk.
+
+        Returns:
+            List[int]
+        """
+        return PredictionModelBatchEvaluator.WORKER.evaluate_chunk(
+            chunk[0],
+            PredictionModelBatchEvaluator.WORKER_SPACE.decode_range(chunk[0], chunk[1])
+        )
@@ -1,10 +1,11 @@
-from typing import List, Tuple
-from itertools import combinations
+from typing import List, Union
 from math import ceil
-from random import shuffle
-from modules._types import IMinSumFunction, IRegressionsPerModel, IPredictionModelMinifiedConfig
+from modules._types import IMinSumFunction, IRegressionsPerModel, IPredictionModelMinifiedConfig, \
+    IPredictionModelConfigSpace, IPredictionModelConfigBatch
 from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
 from modules.epoch.Epoch import Epoch
+from modules.prediction_model.PredictionModelConfigSpace import PredictionModelConfigSpace
 
 
 
@@ -17,7 +18,7 @@ class PredictionModelConfig:
 
     Class Properties:
         BATCH_SIZE: int
-            The number of minified configs that can be placed in a single batch.
+            The number of configuration indexes that can be placed in a single batch.
         PRICE_CHANGE_REQUIREMENTS: List[float]
         MIN_SUM_FUNCTIONS: List[IMinSumFunction]
         MIN_SUM_ADJUSTMENT_FACTORS: List[float]
@@ -50,76 +51,59 @@ class PredictionModelConfig:
 
 
     @staticmethod
-    def create(regression_ids: List[str]) -> None:
-        """Creates and saves all the possible combinations in config
-        batches.
+    def create(regression_ids: List[str], batch_size: Union[int, None] = None) -> None:
+        """Creates and saves the configuration space as well as the batches. The
+        configurations are not materialized. Instead, each batch is a range of indexes
+        within the space and the configurations are decoded when evaluated.
 
         Args:
             regression_ids: List[str]
                 The list of selected regression ids.
+            batch_size: Union[int, None]
+                The number of configurations per batch. Defaults to BATCH_SIZE.
         """
-        # Generate the list of model configs with all the possible combinations
+        # Init the batch size
+        batch_size = batch_size if isinstance(batch_size, int) and batch_size > 0 else PredictionModelConfig.BATCH_SIZE
+
+        # Describe the configuration space. The configurations are shuffled by the seeded permutation
+        # in order to make sure that all (or most) batches contain profitable configurations and 
+        # therefore, keep track of the progress.
         print("\n\nGenerating model configurations...")
-        models: List[IPredictionModelMinifiedConfig] = []
-
-        # Generate the combinations by regressions per model
-        combs_by_rpm: List[List[Tuple[str]]] = [
-            list(combinations(regression_ids, rpm)) for rpm in PredictionModelConfig.REGRESSIONS_PER_MODEL
-        ]
-
-        # Flatten the combinations
-        combs: List[List[str]] = [item for sublist in combs_by_rpm for item in sublist]
-
-        # Iterate over each price change requirement
-        for pcr in PredictionModelConfig.PRICE_CHANGE_REQUIREMENTS:
-            # Iterate over each sum function
-            for min_sum_func in PredictionModelConfig.MIN_SUM_FUNCTIONS:
-                # Iterate over each min sum adjustment factor
-                for adj_factor in PredictionModelConfig.MIN_SUM_ADJUSTMENT_FACTORS:
-                    # Iterate over each combination
-                    for comb in combs:
-                        # Append the model to the list
-                        models.append({ 
-                            "pcr": pcr, 
-                            "msf": min_sum_func, 
-                            "msaf": adj_factor, 
-                            "ri": list(comb)
-                        })
-
-        # Shuffle the configurations in order to make sure that all (or most) batches contain profitable
-        # configurations and therefore, keep track of the progress. 
-        shuffle(models)
+        space: IPredictionModelConfigSpace = PredictionModelConfigSpace.describe(
+            regression_ids=regression_ids,
+            price_change_requirements=PredictionModelConfig.PRICE_CHANGE_REQUIREMENTS,
+            min_sum_functions=PredictionModelConfig.MIN_SUM_FUNCTIONS,
+            min_sum_adjustment_factors=PredictionModelConfig.MIN_SUM_ADJUSTMENT_FACTORS,
+            regressions_per_model=PredictionModelConfig.REGRESSIONS_PER_MODEL,
+            seed=Epoch.SEED
+        )
+        config_space: PredictionModelConfigSpace = PredictionModelConfigSpace(space)
+        Utils.write(Epoch.PATH.prediction_models_config_space(), space)
 
         # Calculate the number of batches that will be stored
-        batches: int = ceil(len(models) / PredictionModelConfig.BATCH_SIZE)
-        
-        # Save the configurations in batches
-        slice_start: int = 0
-        for batch_number in range(1, batches+1):
-            # Init the name of the file
-            file_name = f"{Epoch.ID}_{batch_number}_{batches}.json"
-
-            # Calculate the end of the slice
-            slice_end: int = slice_start + PredictionModelConfig.BATCH_SIZE
+        batches: int = ceil(config_space.size / batch_size)
 
-            # Save the batch including only the sliced configs
-            Utils.write(Epoch.PATH.prediction_models_configs(file_name), models[slice_start:slice_end])
-
-            # Set the end of the slice as the new start
-            slice_start = slice_end
+        # Save the batches as ranges of indexes
+        for batch_number in range(1, batches+1):
+            batch: IPredictionModelConfigBatch = {
+                "start": (batch_number - 1) * batch_size,
+                "end": min(batch_number * batch_size, config_space.size)
+            }
+            Utils.write(Epoch.PATH.prediction_models_configs(f"{Epoch.ID}_{batch_number}_{batches}.json"), batch)
 
         # Build and save the receipt
         receipt: str = f"{Epoch.ID}: Prediction Models\n\n"
         receipt += f"Creation: {Utils.from_milliseconds_to_date_string(Utils.get_time())}\n"
-        receipt += f"Batch Size: {PredictionModelConfig.BATCH_SIZE}\n\n"
+        receipt += f"Batch Size: {batch_size}\n\n"
         receipt += f"\nRegression Combinations:\n"
-        for i, comb in enumerate(combs_by_rpm):
-            receipt += f"R{PredictionModelConfig.REGRESSIONS_PER_MODEL[i]}: {len(comb)}\n"
-        receipt += f"Total Combinations: {len(combs)}\n\n"
-        receipt += f"Total Models: {len(models)}\n\n"
+        for rpm, combinations_num in zip(config_space.regressions_per_model, config_space.combinations_num):
+            receipt += f"R{rpm}: {combinations_num}\n"
+        receipt += f"Total Combinations: {config_space.combinations_total}\n\n"
+        receipt += f"Total Models: {config_space.size}\n\n"
         receipt += f"Configuration Batches ({batches}):\n"
         for batch_number in range(1, batches + 1, 1):
             receipt += f"{Epoch.ID}_{batch_number}: \n"
+        receipt += Profiler.build_receipt()
         Utils.write(Epoch.PATH.prediction_models_configs_receipt(), receipt)
 
         
@@ -130,7 +114,23 @@ class PredictionModelConfig:
 
 
     @staticmethod
-    def get_batch(batch_file_name: str) -> List[IPredictionModelMinifiedConfig]:
+    def get_space() -> PredictionModelConfigSpace:
+        """Retrieves the configuration space the batches are decoded from.
+
+        Returns:
+            PredictionModelConfigSpace
+        """
+        return PredictionModelConfigSpace(Utils.read(Epoch.PATH.prediction_models_config_space()))
+
+
+
+
+
+
+
+
+    @staticmethod
+    def get_batch(batch_file_name: str) -> IPredictionModelConfigBatch:
         """Retrieves a configuration batch.
 
         Args:
@@ -138,9 +138,23 @@ class PredictionModelConfig:
                 The name of the batch to be retrieved. It must include the ext.
 
         Returns:
-            List[IPredictionModelMinifiedConfig]
+            IPredictionModelConfigBatch
+
+        Raises:
+            RuntimeError:
+                If the batch holds configurations instead of a range within the space
         """
-        return Utils.read(Epoch.PATH.prediction_models_configs(batch_file_name))
+        # Read the batch
+        batch: IPredictionModelConfigBatch = Utils.read(Epoch.PATH.prediction_models_configs(batch_file_name))
+
+        # Make sure the file was not generated prior to the configuration space
+        if not isinstance(batch, dict) or not isinstance(batch.get("start"), int) or not isinstance(batch.get("end"), int):
+            raise RuntimeError(f"The configs batch {batch_file_name} holds configurations instead of a range within "\
+                "the configuration space. It was generated by a previous version, so the prediction model configs "\
+                "must be created again.")
+
+        # Finally, return it
+        return batch
 
 
 
@@ -150,16 +164,16 @@ class PredictionModelConfig:
 
 
     @staticmethod
-    def save_profitable_configs(batch_file_name: str, configs: List[IPredictionModelMinifiedConfig]) -> None:
-        """Retrieves a configuration batch.
+    def save_profitable_configs(batch_file_name: str, indexes: List[int]) -> None:
+        """Saves the indexes of the profitable configurations found in a batch.
 
         Args:
             batch_file_name: str
                 The name of the batch where the profitable configs were found.
-            configs: List[IPredictionModelMinifiedConfig]
-                The list of all the profitable configurations.
+            indexes: List[int]
+                The indexes of all the profitable configurations within the space.
         """
-        return Utils.write(Epoch.PATH.prediction_models_profitable_configs(batch_file_name), configs)
+        return Utils.write(Epoch.PATH.prediction_models_profitable_configs(batch_file_name), indexes)
 
 
 
@@ -178,25 +192,28 @@ class PredictionModelConfig:
         Raises:
             RuntimeError:
                 If no profitable configs are found
+                If a file holds configurations instead of indexes
         """
-        # Init the list
-        profitable_configs: List[IPredictionModelMinifiedConfig] = []
+        # Init the list of indexes
+        profitable_indexes: List[int] = []
 
         # Retrieve all the profitable config files
         _, config_files = Utils.get_directory_content(Epoch.PATH.prediction_models_profitable_configs(), only_file_ext=".json")
         
         # Load the files and append them to the list
         for file in config_files:
-            # Retrieve the configs
-            configs: List[IPredictionModelMinifiedConfig] = Utils.read(Epoch.PATH.prediction_models_profitable_configs(file))
-
-            # Concatenate them to the list if there is at least 1
-            if len(configs) > 0:
-                profitable_configs = profitable_configs + configs
+            indexes: List[int] = Utils.read(Epoch.PATH.prediction_models_profitable_configs(file))
+
+            # Make sure the file was not generated prior to the configuration space
+            if any(not isinstance(index, int) for index in indexes):
+                raise RuntimeError(f"The profitable configs file {file} holds configurations instead of indexes within "\
+                    "the configuration space. It was generated by a previous version, so the prediction model configs "\
+                    "must be created and evaluated again.")
+            profitable_indexes += indexes
         
         # Make sure at least 1 config was found
-        if len(profitable_configs) == 0:
+        if len(profitable_indexes) == 0:
             raise RuntimeError("No profitable prediction model configurations were found.")
 
-        # Finally, return the list of configs
-        return profitable_configs
+        # Finally, decode the configs
+        return PredictionModelConfig.get_space().decode(profitable_indexes)
@@ -0,0 +1,426 @@
+from typing import List, Union
+from math import comb
+from numpy import ndarray, array, arange, empty, zeros, ones, uint64, int64
+from numpy.random import RandomState
+from modules._types import IPredictionModelConfigSpace, IPredictionModelMinifiedConfig, IMinSumFunction, \
+    IRegressionsPerModel
+
+
+
+
+class PredictionModelConfigSpace:
+    """PredictionModelConfigSpace Class
+
+    This class decodes prediction model configurations out of a configuration space
+    descriptor. The canonical order of the configurations is the same as nesting the
+    hyperparameters (pcr > msf > msaf) and iterating over the combinations of
+    regressions in lexicographic order. The position of a configuration within the
+    space is mapped to its canonical index by a seeded Feistel permutation, meaning
+    that the configurations are shuffled without ever being materialized.
+
+    Class Properties:
+        FEISTEL_ROUNDS: int
+            The number of rounds applied by the permutation.
+        MAX_SIZE: int
+            The maximum number of configurations a space can hold.
+
+    Instance Properties:
+        regression_ids: List[str]
+        price_change_requirements: List[float]
+        min_sum_functions: List[IMinSumFunction]
+        min_sum_adjustment_factors: List[float]
+        regressions_per_model: List[IRegressionsPerModel]
+            The regressions and the hyperparameters that describe the space.
+        seed: int
+            The seed used to generate the keys of the permutation.
+        combinations_num: List[int]
+            The number of combinations by regressions per model.
+        combinations_total: int
+            The total number of combinations of regressions.
+        size: int
+            The total number of configurations in the space.
+        binomials: ndarray
+            The binomial coefficients (n x k) used to unrank the combinations.
+        half_bits: int
+        half_mask: int
+            The size of each half of the Feistel network's domain.
+        keys: ndarray
+            The keys of the Feistel rounds.
+    """
+    # The number of rounds of the permutation
+    FEISTEL_ROUNDS: int = 4
+
+    # The indexes must fit in int64 values
+    MAX_SIZE: int = 2**62
+
+
+
+
+    def __init__(self, space: IPredictionModelConfigSpace):
+        """Initializes the PredictionModelConfigSpace Instance.
+
+        Args:
+            space: IPredictionModelConfigSpace
+                The descriptor of the configuration space.
+
+        Raises:
+            ValueError:
+                If the space has no configurations or it is too large.
+                If the size of the descriptor does not match the hyperparameters.
+        """
+        # Init the regressions and the hyperparameters
+        self.regression_ids: List[str] = space["regression_ids"]
+        self.price_change_requirements: List[float] = space["price_change_requirements"]
+        self.min_sum_functions: List[IMinSumFunction] = space["min_sum_functions"]
+        self.min_sum_adjustment_factors: List[float] = space["min_sum_adjustment_factors"]
+        self.regressions_per_model: List[IRegressionsPerModel] = space["regressions_per_model"]
+        self.seed: int = space["seed"]
+
+        # Calculate the number of combinations and the size of the space
+        self.combinations_num: List[int] = [comb(len(self.regression_ids), rpm) for rpm in self.regressions_per_model]
+        self.combinations_total: int = sum(self.combinations_num)
+        self.size: int = len(self.price_change_requirements) * len(self.min_sum_functions) * \
+            len(self.min_sum_adjustment_factors) * self.combinations_total
+        if self.size == 0 or self.size > PredictionModelConfigSpace.MAX_SIZE:
+            raise ValueError(f"The configuration space must have between 1 and {PredictionModelConfigSpace.MAX_SIZE} configurations. Received: {self.size}")
+        if space["size"] != self.size:
+            raise ValueError(f"The size of the configuration space does not match its hyperparameters: {space['size']} != {self.size}")
+
+        # Init the binomial coefficients
+        self.binomials: ndarray = array([
+            [comb(n, k) for k in range(max(self.regressions_per_model) + 1)] for n in range(len(self.regression_ids) + 1)
+        ], dtype=int64)
+
+        # Init the Feistel network. The domain is the smallest even power of 2 that can hold the space
+        bits: int = max((self.size - 1).bit_length(), 2)
+        self.half_bits: int = (bits + 1) // 2
+        self.half_mask: int = (1 << self.half_bits) - 1
+        self.keys: ndarray = RandomState(self.seed).randint(
+            0, 2**62, size=PredictionModelConfigSpace.FEISTEL_ROUNDS, dtype=uint64
+        )
+
+
+
+
+    @staticmethod
+    def describe(
+        regression_ids: List[str],
+        price_change_requirements: List[float],
+        min_sum_functions: List[IMinSumFunction],
+        min_sum_adjustment_factors: List[float],
+        regressions_per_model: List[IRegressionsPerModel],
+        seed: int
+    ) -> IPredictionModelConfigSpace:
+        """Builds the descriptor of a configuration space.
+
+        Args:
+            regression_ids: List[str]
+            price_change_requirements: List[float]
+            min_sum_functions: List[IMinSumFunction]
+            min_sum_adjustment_factors: List[float]
+            regressions_per_model: List[IRegressionsPerModel]
+                The regressions and the hyperparameters that describe the space.
+            seed: int
+                The seed used to generate the permutation.
+
+        Returns:
+            IPredictionModelConfigSpace
+        """
+        return {
+            "regression_ids": regression_ids,
+            "price_change_requirements": price_change_requirements,
+            "min_sum_functions": min_sum_functions,
+            "min_sum_adjustment_factors": min_sum_adjustment_factors,
+            "regressions_per_model": regressions_per_model,
+            "seed": seed,
+            "size": len(price_change_requirements) * len(min_sum_functions) * len(min_sum_adjustment_factors) * \
+                sum(comb(len(regression_ids), rpm) for rpm in regressions_per_model)
+        }
+
+
+
+
+
+
+
+
+
+
+    ##############
+    ## Decoding ##
+    ##############
+
+
+
+
+    def decode_range(self, start: int, end: int) -> List[IPredictionModelMinifiedConfig]:
+        """Decodes the configurations within a range of indexes.
+
+        Args:
+            start: int
+                The index of the first configuration.
+            end: int
+                The index after the last configuration.
+
+        Returns:
+            List[IPredictionModelMinifiedConfig]
+        """
+        return self.decode(arange(start, end, dtype=int64))
+
+
+
+
+
+
+    def decode(self, indexes: Union[List[int], ndarray]) -> List[IPredictionModelMinifiedConfig]:
+        """Decodes the configurations placed in a list of indexes.
+
+        Args:
+            indexes: Union[List[int], ndarray]
+                The indexes of the configurations within the space.
+
+        Returns:
+            List[IPredictionModelMinifiedConfig]
+
+        Raises:
+            ValueError:
+                If any of the indexes is out of the space.
+        """
+        # Validate the indexes
+        indexes = array(indexes, dtype=int64)
+        if indexes.shape[0] == 0:
+            return []
+        if indexes.min() < 0 or indexes.max() >= self.size:
+            raise ValueError(f"The configuration indexes must be within 0 and {self.size - 1}.")
+
+        # Map the indexes to their canonical position
+        canonical: ndarray = self._permute(indexes.astype(uint64)).astype(int64)
+
+        # Split the canonical positions into the hyperparameters and the combination
+        comb_ranks: ndarray = canonical % self.combinations_total
+        rest: ndarray = canonical // self.combinations_total
+        msaf_indexes: ndarray = rest % len(self.min_sum_adjustment_factors)
+        rest //= len(self.min_sum_adjustment_factors)
+        msf_indexes: ndarray = rest % len(self.min_sum_functions)
+        pcr_indexes: ndarray = rest // len(self.min_sum_functions)
+
+        # Unrank the combinations by regressions per model
+        regressions: List[List[str]] = [[] for _ in range(indexes.shape[0])]
+        offset: int = 0
+        for rpm, combinations_num in zip(self.regressions_per_model, self.combinations_num):
+            rows: ndarray = ((comb_ranks >= offset) & (comb_ranks < offset + combinations_num)).nonzero()[0]
+            if rows.shape[0] > 0:
+                combs: ndarray = self._unrank_combinations(comb_ranks[rows] - offset, rpm)
+                for row, comb_indexes in zip(rows.tolist(), combs.tolist()):
+                    regressions[row] = [self.regression_ids[i] for i in comb_indexes]
+            offset += combinations_num
+
+        # Finally, build the configurations
+        return [
+            {
+                "pcr": self.price_change_requirements[pcr_i],
+                "msf": self.min_sum_functions[msf_i],
+                "msaf": self.min_sum_adjustment_factors[msaf_i],
+                "ri": ri
+            } for pcr_i, msf_i, msaf_i, ri in zip(pcr_indexes.tolist(), msf_indexes.tolist(), msaf_indexes.tolist(), regressions)
+        ]
+
+
+
+
+
+
+    def encode(self, config: IPredictionModelMinifiedConfig) -> int:
+        """Calculates the index of a configuration within the space.
+
+        Args:
+            config: IPredictionModelMinifiedConfig
+                The configuration to be encoded.
+
+        Returns:
+            int
+
+        Raises:
+            ValueError:
+                If the configuration does not belong to the space.
+        """
+        # Init the position of each hyperparameter and regression
+        try:
+            pcr_i: int = self.price_change_requirements.index(config["pcr"])
+            msf_i: int = self.min_sum_functions.index(config["msf"])
+            msaf_i: int = self.min_sum_adjustment_factors.index(config["msaf"])
+            rpm_i: int = self.regressions_per_model.index(len(config["ri"]))
+            comb_indexes: List[int] = [self.regression_ids.index(id) for id in config["ri"]]
+        except ValueError:
+            raise ValueError(f"The configuration does not belong to the space: {config}")
+        if comb_indexes != sorted(set(comb_indexes)):
+            raise ValueError(f"The regressions must be unique and follow the order of the space: {config['ri']}")
+
+        # Calculate the canonical position
+        canonical: int = ((pcr_i * len(self.min_sum_functions) + msf_i) * len(self.min_sum_adjustment_factors) + msaf_i) * \
+            self.combinations_total + sum(self.combinations_num[:rpm_i]) + self._rank_combination(comb_indexes)
+
+        # Finally, map it to its index within the space
+        return int(self._permute(array([canonical], dtype=uint64), inverse=True)[0])
+
+
+
+
+
+
+
+
+
+
+    ##################
+    ## Combinations ##
+    ##################
+
+
+
+
+    def _unrank_combinations(self, ranks: ndarray, k: int) -> ndarray:
+        """Builds the regression indexes of the combinations placed in a list of
+        lexicographic ranks.
+
+        Args:
+            ranks: ndarray
+                The ranks of the combinations.
+            k: int
+                The number of regressions per combination.
+
+        Returns:
+            ndarray
+            The regression indexes (combinations x k).
+        """
+        # Init values
+        n: int = len(self.regression_ids)
+        ranks = ranks.copy()
+        combs: ndarray = empty((ranks.shape[0], k), dtype=int64)
+        candidates: ndarray = zeros(ranks.shape[0], dtype=int64)
+
+        # Pick the regressions one position at a time. A candidate is picked if the rank falls
+        # within the combinations that start with it. Otherwise, they are skipped.
+        for j in range(k):
+            pending: ndarray = ones(ranks.shape[0], dtype=bool)
+            while pending.any():
+                count: ndarray = self.binomials[n - candidates[pending] - 1, k - j - 1]
+                rows: ndarray = pending.nonzero()[0]
+                picked: ndarray = ranks[rows] < count
+                combs[rows[picked], j] = candidates[rows[picked]]
+                ranks[rows[~picked]] -= count[~picked]
+                candidates[rows] += 1
+                pending[rows[picked]] = False
+
+        # Finally, return the combinations
+        return combs
+
+
+
+
+
+
+    def _rank_combination(self, comb_indexes: List[int]) -> int:
+        """Calculates the lexicographic rank of a combination.
+
+        Args:
+            comb_indexes: List[int]
+                The sorted regression indexes of the combination.
+
+        Returns:
+            int
+        """
+        n: int = len(self.regression_ids)
+        k: int = len(comb_indexes)
+        rank: int = 0
+        previous: int = -1
+        for j, index in enumerate(comb_indexes):
+            rank += sum(comb(n - candidate - 1, k - j - 1) for candidate in range(previous + 1, index))
+            previous = index
+        return rank
+
+
+
+
+
+
+
+
+
+
+    #################
+    ## Permutation ##
+    #################
+
+
+
+
+    def _permute(self, values: ndarray, inverse: bool = False) -> ndarray:
+        """Applies the permutation (or its inverse) to a list of values. Since the
+        Feistel network's domain can be larger than the space, the values that land
+        outside of it are permuted again until they are back in (cycle walking).
+
+        Args:
+            values: ndarray
+                The uint64 values within the space.
+            inverse: bool
+                If enabled, the inverse permutation is applied.
+
+        Returns:
+            ndarray
+        """
+        values = self._feistel(values, inverse)
+        outside: ndarray = values >= self.size
+        while outside.any():
+            values[outside] = self._feistel(values[outside], inverse)
+            outside = values >= self.size
+        return values
+
+
+
+
+
+
+    def _feistel(self, values: ndarray, inverse: bool) -> ndarray:
+        """Applies the Feistel network (or its inverse) to a list of values.
+
+        Args:
+            values: ndarray
+                The uint64 values within the network's domain.
+            inverse: bool
+                If enabled, the rounds are reversed.
+
+        Returns:
+            ndarray
+        """
+        left: ndarray = values >> uint64(self.half_bits)
+        right: ndarray = values & uint64(self.half_mask)
+        for key in (self.keys[::-1] if inverse else self.keys):
+            if inverse:
+                left, right = right ^ self._round(left, key), left
+            else:
+                left, right = right, left ^ self._round(right, key)
+        return (left << uint64(self.half_bits)) | right
+
+
+
+
+
+
+    def _round(self, values: ndarray, key: uint64) -> ndarray:
+        """Mixes a half of the values with the key of a round.
+
+        Args:
+            values: ndarray
+                The half of the values.
+            key: uint64
+                The key of the round.
+
+        Returns:
+            ndarray
+        """
+        mixed: ndarray = (values ^ key) * uint64(0x9E3779B97F4A7C15)
+        mixed ^= mixed >> uint64(29)
+        mixed *= uint64(0xBF58476D1CE4E5B9)
+        mixed ^= mixed >> uint64(32)
+        return mixed & uint64(self.half_mask)
@@ -0,0 +1,329 @@
+from typing import List, Dict, Tuple, Union
+from os import stat
+from multiprocessing import get_context, cpu_count
+from numpy import ndarray, array, load, float64
+from tqdm import tqdm
+from modules._types import ITestDatasetFeatures, IRegressionConfig, IRegressionFeaturesCacheMeta
+from modules.utils.Utils import Utils
+from modules.epoch.Epoch import Epoch
+from modules.candlestick.Candlestick import Candlestick
+from modules.regression.Regression import Regression
+from modules.regression.RegressionDataset import RegressionDataset
+
+
+
+
+class PredictionModelFeatures:
+    """PredictionModelFeatures Class
+
+    This singleton generates the test dataset features of the regressions. The features
+    of each regression are cached as soon as they are predicted, keyed by the hash of the
+    model file and the range of the input dataset. This way, an interrupted or extended
+    run only predicts the missing regressions. When more than 1 worker is used, the
+    regressions are predicted across a pool of processes with a limited number of
+    TensorFlow threads each.
+
+    Class Properties:
+        WORKER_INPUT_DS: Union[ndarray, None]
+            The input dataset attached within a worker process.
+        MODEL_HASHES: Dict[str, Tuple[int, int, str]]
+            The hashes of the model files by path, along with the size and the modification
+            time of the file when it was hashed: (size, mtime, hash).
+    """
+    # Worker State
+    WORKER_INPUT_DS: Union[ndarray, None] = None
+
+    # Model Hashes
+    MODEL_HASHES: Dict[str, Tuple[int, int, str]] = {}
+
+
+
+
+
+
+    ##############
+    ## Features ##
+    ##############
+
+
+
+
+    @staticmethod
+    def generate(regression_ids: List[str], workers: Union[int, None] = None) -> ITestDatasetFeatures:
+        """Generates the features of a list of regressions, predicting only the ones
+        that haven't been cached.
+
+        Args:
+            regression_ids: List[str]
+                The list of regressions that will be used to generate prediction models.
+            workers: Union[int, None]
+                The number of processes that will predict the features. If none is provided,
+                it will be derived from the hardware (Utils.get_tensorflow_workers).
+
+        Returns:
+            ITestDatasetFeatures
+        """
+        # Init the range of the input dataset and make sure its source is cached
+        input_start, input_end = PredictionModelFeatures._get_input_range()
+        RegressionDataset.get_source()
+
+        # Init the regressions whose features need to be predicted
+        missing_ids: List[str] = [
+            id for id in regression_ids if not PredictionModelFeatures._is_cached(id, input_start, input_end)
+        ]
+        print(f"Cached: {len(regression_ids) - len(missing_ids)}, Missing: {len(missing_ids)}")
+
+        # Predict the missing features
+        if len(missing_ids) > 0:
+            # Init the workers and the number of threads per worker
+            if not isinstance(workers, int) or workers < 1:
+                workers = Utils.get_tensorflow_workers()
+            workers = min(workers, len(missing_ids))
+            threads: int = max(cpu_count() // workers, 1)
+            print(f"Predicting features ({workers} workers, {threads} threads per worker)...")
+
+            # Init the progress bar
+            progress_bar = tqdm(bar_format='{l_bar}{bar:20}{r_bar}{bar:-20b}', total=len(missing_ids))
+
+            # Distribute the regressions across the pool of workers. Since TensorFlow is not
+            # fork-safe, the workers are spawned.
+            if workers > 1:
+                with get_context("spawn").Pool(
+                    workers,
+                    initializer=PredictionModelFeatures._init_worker,
+                    initargs=(RegressionDataset.get_source_path(), threads)
+                ) as pool:
+                    for _ in pool.imap_unordered(
+                        PredictionModelFeatures._predict_in_worker,
+                        [(id, input_start, input_end) for id in missing_ids]
+                    ):
+                        progress_bar.update()
+
+            # Otherwise, predict them in the current process
+            else:
+                input_ds, _ = RegressionDataset.make_features_and_labels()
+                for id in missing_ids:
+                    PredictionModelFeatures._predict(id, input_ds, input_start, input_end)
+                    progress_bar.update()
+            progress_bar.close()
+
+        # Finally, load the features from the cache
+        return {
+            id: load(Epoch.PATH.prediction_models_features_cache(id)).tolist() for id in regression_ids
+        }
+
+
+
+
+
+
+    @staticmethod
+    def get_regression_configs(regression_ids: List[str]) -> Dict[str, IRegressionConfig]:
+        """Retrieves the configurations of a list of regressions. The configurations are
+        read from the cache's metadata. If a regression has not been cached or its model
+        changed, it will be loaded instead.
+
+        Args:
+            regression_ids: List[str]
+                The list of regressions.
+
+        Returns:
+            Dict[str, IRegressionConfig]
+        """
+        # Init the configs
+        configs: Dict[str, IRegressionConfig] = {}
+
+        # Iterate over each regression
+        for id in regression_ids:
+            meta: Union[IRegressionFeaturesCacheMeta, None] = Utils.read(
+                Epoch.PATH.prediction_models_features_cache_meta(id),
+                allow_empty=True
+            )
+            if meta is not None and meta["model_hash"] == PredictionModelFeatures._get_model_hash(id):
+                configs[id] = meta["config"]
+            else:
+                configs[id] = Regression(id).get_config()
+
+        # Finally, return the configs
+        return configs
+
+
+
+
+
+
+
+
+
+    ###########
+    ## Cache ##
+    ###########
+
+
+
+
+    @staticmethod
+    def _predict(regression_id: str, input_ds: ndarray, input_start: int, input_end: int) -> None:
+        """Predicts and caches the features of a regression. The metadata is written
+        last so the features are only considered cached once they are in place.
+
+        Args:
+            regression_id: str
+                The identifier of the regression.
+            input_ds: ndarray
+                The input dataset that will be used to generate the predictions.
+            input_start: int
+            input_end: int
+                The range of the input dataset.
+        """
+        # Hash the model file prior to loading it
+        model_hash: str = PredictionModelFeatures._get_model_hash(regression_id)
+
+        # Predict the features
+        regression: Regression = Regression(regression_id)
+        features: ndarray = array(regression.predict_feature(input_ds), dtype=float64)
+
+        # Save the features
+        Utils.write_atomic(Epoch.PATH.prediction_models_features_cache(regression_id), features)
+
+        # Finally, save the metadata
+        meta: IRegressionFeaturesCacheMeta = {
+            "model_hash": model_hash,
+            "input_start": input_start,
+            "input_end": input_end,
+            "config": regression.get_config()
+        }
+        Utils.write_atomic(Epoch.PATH.prediction_models_features_cache_meta(regression_id), meta)
+
+
+
+
+
+
+    @staticmethod
+    def _is_cached(regression_id: str, input_start: int, input_end: int) -> bool:
+        """Checks if the features of a regression have been cached for the same model
+        file and input dataset.
+
+        Args:
+            regression_id: str
+                The identifier of the regression.
+            input_start: int
+            input_end: int
+                The range of the input dataset.
+
+        Returns:
+            bool
+        """
+        meta: Union[IRegressionFeaturesCacheMeta, None] = Utils.read(
+            Epoch.PATH.prediction_models_features_cache_meta(regression_id),
+            allow_empty=True
+        )
+        return meta is not None and \
+            meta["input_start"] == input_start and \
+            meta["input_end"] == input_end and \
+            Utils.file_exists(Epoch.PATH.prediction_models_features_cache(regression_id)) and \
+            meta["model_hash"] == PredictionModelFeatures._get_model_hash(regression_id)
+
+
+
+
+
+
+    @staticmethod
+    def _get_model_hash(regression_id: str) -> str:
+        """Retrieves the hash of a regression's model file. The file is only hashed once
+        and the hash is reused for as long as its size and modification time remain the 
+        same.
+
+        Args:
+            regression_id: str
+                The identifier of the regression.
+
+        Returns:
+            str
+        """
+        # Init the path and the stats of the model file
+        path: str = Epoch.PATH.regression_model(regression_id)
+        file_stat = stat(path)
+
+        # Hash the file if it hasn't been hashed or it changed
+        model_hash: Union[Tuple[int, int, str], None] = PredictionModelFeatures.MODEL_HASHES.get(path)
+        if model_hash is None or model_hash[0] != file_stat.st_size or model_hash[1] != file_stat.st_mtime_ns:
+            model_hash = (file_stat.st_size, file_stat.st_mtime_ns, Utils.get_file_hash(path))
+            PredictionModelFeatures.MODEL_HASHES[path] = model_hash
+
+        # Finally, return the hash
+        return model_hash[2]
+
+
+
+
+
+
+    @staticmethod
+    def _get_input_range() -> Tuple[int, int]:
+        """Retrieves the range of the input dataset based on the normalized prediction
+        candlesticks.
+
+        Returns:
+            Tuple[int, int]
+            (input_start, input_end)
+        """
+        return int(Candlestick.NORMALIZED_PREDICTION_DF["ot"].iloc[0]), \
+            int(Candlestick.NORMALIZED_PREDICTION_DF["ct"].iloc[-1])
+
+
+
+
+
+
+
+
+
+    #############
+    ## Workers ##
+    #############
+
+
+
+
+    @staticmethod
+    def _init_worker(source_path: str, threads: int) -> None:
+        """Initializes a worker process. TensorFlow's threads must be limited before
+        the runtime is initialized. Then, the Epoch is initialized and the input dataset
+        is built over the cached source.
+
+        Args:
+            source_path: str
+                The path of the cached source of the input dataset.
+            threads: int
+                The number of threads TensorFlow can use within the worker.
+        """
+        # Limit the TensorFlow threads
+        Utils.limit_tensorflow_threads(threads)
+
+        # Initialize the Epoch
+        Epoch.init()
+
+        # Finally, build the input dataset over the memory mapped source
+        PredictionModelFeatures.WORKER_INPUT_DS, _ = RegressionDataset.make_windows(load(source_path, mmap_mode="r"))
+
+
+
+
+
+
+    @staticmethod
+    def _predict_in_worker(job: Tuple[str, int, int]) -> str:
+        """Predicts and caches the features of a regression within a worker process.
+
+        Args:
+            job: Tuple[str, int, int]
+                The regression id and the range of the input dataset.
+
+        Returns:
+            str
+        """
+        PredictionModelFeatures._predict(job[0], PredictionModelFeatures.WORKER_INPUT_DS, job[1], job[2])
+        return job[0]
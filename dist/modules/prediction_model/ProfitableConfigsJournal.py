@@ -1,6 +1,7 @@
 from typing import List, Union
-from modules._types import IProfitableConfigurationsJournal, IPredictionModelMinifiedConfig
+from modules._types import IProfitableConfigurationsJournal
 from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
 from modules.epoch.Epoch import Epoch
 
 
@@ -25,8 +26,8 @@ class ProfitableConfigsJournal:
             The path of the journal file.
         current_index: int
             The index in which the last profitable configuration was found.
-        configs: List[IPredictionModelMinifiedConfig]
-            The list of profitable configurations found for the given batch.
+        indexes: List[int]
+            The indexes of the profitable configurations found for the given batch.
     """
 
 
@@ -50,20 +51,20 @@ class ProfitableConfigsJournal:
         journal: Union[IProfitableConfigurationsJournal, None] = Utils.read(self.path, True)
 
         # Check if the journal is set and it has the same batch name
-        if isinstance(journal, dict) and journal.get("batch_file_name") == self.batch_file_name:
+        if isinstance(journal, dict) and journal.get("batch_file_name") == self.batch_file_name and "indexes" in journal:
             # Init the index
             self.current_index: int = journal["current_index"]
 
-            # Init the configs
-            self.configs: List[IPredictionModelMinifiedConfig] = journal["configs"]
+            # Init the indexes
+            self.indexes: List[int] = journal["indexes"]
 
         # Otherwise, set the default state
         else:
             # Init the index
             self.current_index: int = 0
 
-            # Init the configs
-            self.configs: List[IPredictionModelMinifiedConfig] = []
+            # Init the indexes
+            self.indexes: List[int] = []
 
 
 
@@ -74,28 +75,54 @@ class ProfitableConfigsJournal:
 
 
 
-    def save_profitable_config(self, config_index: int, config: IPredictionModelMinifiedConfig) -> None:
-        """When a profitable configuration is found, is added to the local properties
-        and also stored in the file as well as the index in which the config was found.
+    def get_start_index(self, batch_start: int) -> int:
+        """Calculates the index the evaluation of the batch should start from. If
+        profitable configurations have been found, it resumes right after the last one.
+
+        Args:
+            batch_start: int
+                The index of the first configuration of the batch within the space.
+
+        Returns:
+            int
+        """
+        return max(self.current_index + 1, batch_start) if len(self.indexes) > 0 else batch_start
+
+
+
+
+
+
+
+
+
+
+    def save_profitable_config(self, config_index: int) -> None:
+        """When a profitable configuration is found, its index is added to the local
+        properties and also stored in the file.
 
         Args:
             config_index: int
                 The index in which the profitable config was found.
-            config: IPredictionModelMinifiedConfig
-                The configuration that is considered to be profitable.
         """
         # Set the current index
         self.current_index = config_index
 
-        # Add the config to the list
-        self.configs.append(config)
+        # Add the index to the list
+        self.indexes.append(config_index)
 
-        # Finally, update the journal
-        Utils.write(self.path, {
+        # Build the journal
+        journal: IProfitableConfigurationsJournal = {
             "batch_file_name": self.batch_file_name,
             "current_index": self.current_index,
-            "configs": self.configs,
-        })
+            "indexes": self.indexes,
+        }
+
+        # Attach the timings (if the profiler is enabled)
+        Profiler.attach(journal)
+
+        # Finally, update the journal
+        Utils.write(self.path, journal)
 
 
 
@@ -1,13 +1,12 @@
 from typing import List
 from random import seed
-from numpy import ndarray
+from numpy import ndarray, float64, where, around, absolute, maximum, minimum, errstate
 from numpy.random import seed as npseed
 from tensorflow import random as tf_random
 from h5py import File as h5pyFile
 from tensorflow.python.keras.saving.hdf5_format import load_model_from_hdf5
 from keras import Sequential
 from modules._types import IRegressionConfig
-from modules.utils.Utils import Utils
 from modules.epoch.Epoch import Epoch
 from modules.keras_utils.KerasModelSummary import get_summary
 
@@ -156,12 +155,10 @@ class Regression:
             List[float]
         """
         # Firstly, predict the entire dataset
-        preds: List[List[float]] = self.predict(features)
+        preds: ndarray = self.model.predict(features, verbose=0)
 
         # Finally, return the predicted features
-        return [
-            self._normalize_feature(Utils.get_percentage_change(features[i, -1], p[-1])) for i, p in enumerate(preds)
-        ]
+        return Regression.normalize_features(features[:, -1], preds[:, -1].astype(float64)).tolist()
 
 
 
@@ -169,81 +166,45 @@ class Regression:
 
 
 
-    def _normalize_feature(self, predicted_change: float) -> float:
-        """Given a predicted change, it will scale it to a range between
-        -1 and 1 accordingly.
+    @staticmethod
+    def normalize_features(current_prices: ndarray, predicted_prices: ndarray) -> ndarray:
+        """Given the current and the last predicted prices, it will calculate the predicted
+        changes and scale them to a range between -1 and 1 accordingly. 
+        The changes are calculated and rounded the same way Utils.get_percentage_change 
+        does. Then, the changes lower than the min feature value are considered neutral
+        and the changes higher than the max feature value are clipped. Finally, the 
+        changes are scaled and rounded to 6 decimals.
 
         Args:
-            predicted_change: float
-                The percentage change between the current price and the last
-                predicted price.
+            current_prices: ndarray
+                The last price within the input of each prediction.
+            predicted_prices: ndarray
+                The last predicted price of each prediction.
 
         Returns:
-            float
+            ndarray
         """
-        # Retrieve the adjusted change
-        adjusted_change: float = self._calculate_adjusted_change(predicted_change)
-
-        # Scale the increase change
-        if adjusted_change > 0:
-            return self._scale_feature(adjusted_change)
-        
-        # Scale the decrease change, keep in mind that the decrease data is in negative numbers.
-        elif adjusted_change < 0:
-            return -(self._scale_feature(-(adjusted_change)))
-        
-        # Otherwise, return 0 as a sign of neutrality
-        else:
-            return 0
-
-
-
-
-
-
-
-    def _calculate_adjusted_change(self, change: float) -> float:
-        """Adjusts the provided change to the min and max values in the
-        regression discovery.
-
-        Args:
-            change: float
-                The percentage change from the current price to the last 
-                prediction.
-
-        Returns:
-            float
-        """
-        if change >= Regression.MIN_FEATURE_VALUE and change <= Regression.MAX_FEATURE_VALUE:
-            return change
-        elif change > Regression.MAX_FEATURE_VALUE:
-            return Regression.MAX_FEATURE_VALUE
-        elif change >= -(Regression.MAX_FEATURE_VALUE) and change <= -(Regression.MIN_FEATURE_VALUE):
-            return change
-        elif change < -(Regression.MAX_FEATURE_VALUE):
-            return -(Regression.MAX_FEATURE_VALUE)
-        else:
-            return 0
-
-
-
-
+        # Calculate the predicted changes. If the current price is 0, the change cannot be calculated
+        with errstate(divide="ignore", invalid="ignore"):
+            increase: ndarray = ((predicted_prices - current_prices) / current_prices) * 100
+            decrease: ndarray = -(((current_prices - predicted_prices) / current_prices) * 100)
+        change: ndarray = where(
+            predicted_prices > current_prices, 
+            increase, 
+            where(current_prices > predicted_prices, decrease, 0.0)
+        )
+        change = around(maximum(where(current_prices == 0, 0.0, change), -100), 2)
 
-    def _scale_feature(self, value: float) -> float:
-        """Scales a prediction change based on the regression's min and max
-        feature values
+        # Adjust the changes to the min and max values
+        adjusted_change: ndarray = minimum(absolute(change), Regression.MAX_FEATURE_VALUE)
+        adjusted_change = where(adjusted_change >= Regression.MIN_FEATURE_VALUE, adjusted_change, 0.0)
 
-        Args:
-            value: float
-                The predicted price change that needs to be scaled.
-
-        Returns: 
-            float
-        """
-        return round(
-            (value - Regression.MIN_FEATURE_VALUE) / (Regression.MAX_FEATURE_VALUE - Regression.MIN_FEATURE_VALUE), 
+        # Finally, scale the changes, keeping the direction. Neutral changes are set to 0
+        scaled_change: ndarray = around(
+            (adjusted_change - Regression.MIN_FEATURE_VALUE) / (Regression.MAX_FEATURE_VALUE - Regression.MIN_FEATURE_VALUE), 
             6
         )
+        return where(adjusted_change > 0, where(change > 0, scaled_change, -scaled_change), 0.0)
 
 
 
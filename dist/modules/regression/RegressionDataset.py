@@ -0,0 +1,163 @@
+from typing import Tuple
+from math import floor
+from numpy import ndarray, load, ascontiguousarray, float64
+from numpy.lib.stride_tricks import sliding_window_view
+from pandas import DataFrame
+from modules.utils.Utils import Utils
+from modules.epoch.Epoch import Epoch
+from modules.candlestick.Candlestick import Candlestick
+from modules.keras_utils.WindowSequence import WindowSequence
+
+
+
+
+class RegressionDataset:
+    """RegressionDataset Class
+
+    This singleton builds the datasets used to train regressions as well as to generate
+    the prediction model features. The features and labels are read-only strided views
+    over the normalized close prices, meaning that the lookback data is never duplicated
+    in memory.
+
+    Class Properties:
+        ...
+    """
+
+
+
+
+
+
+    ##############
+    ## Datasets ##
+    ##############
+
+
+
+
+    @staticmethod
+    def make_features_and_labels() -> Tuple[ndarray, ndarray]:
+        """Builds the features and labels based on the normalized prediction candlesticks.
+        The features in the row i are the REGRESSION_LOOKBACK close prices prior to the
+        candlestick i + REGRESSION_LOOKBACK. The labels are the REGRESSION_PREDICTIONS close
+        prices starting at that candlestick.
+
+        Returns:
+            Tuple[ndarray, ndarray]
+            (features, labels)
+        """
+        return RegressionDataset.make_windows(RegressionDataset.get_source())
+
+
+
+
+
+
+    @staticmethod
+    def make_windows(source: ndarray) -> Tuple[ndarray, ndarray]:
+        """Builds the features and labels windows over a given source of normalized
+        close prices.
+
+        Args:
+            source: ndarray
+                The normalized close prices.
+
+        Returns:
+            Tuple[ndarray, ndarray]
+            (features, labels)
+        """
+        # Init the number of rows that have enough data
+        rows_num: int = max(source.shape[0] - Epoch.REGRESSION_LOOKBACK - Epoch.REGRESSION_PREDICTIONS, 0)
+
+        # Finally, return the windows
+        return sliding_window_view(source, Epoch.REGRESSION_LOOKBACK)[:rows_num], \
+            sliding_window_view(source[Epoch.REGRESSION_LOOKBACK:], Epoch.REGRESSION_PREDICTIONS)[:rows_num]
+
+
+
+
+
+
+    @staticmethod
+    def make_sequences(
+        features: ndarray,
+        labels: ndarray,
+        validation_split: float,
+        batch_size: int,
+        initial_epoch: int = 0
+    ) -> Tuple[WindowSequence, WindowSequence]:
+        """Builds the sequences that stream the train and validation batches to Keras. Same
+        as Keras' validation_split, the validation rows are taken from the end of the dataset
+        prior to shuffling and only the train rows are shuffled on every epoch.
+
+        Args:
+            features: ndarray
+                The features of the train dataset.
+            labels: ndarray
+                The labels of the train dataset.
+            validation_split: float
+                The fraction of the dataset that will be used for validation.
+            batch_size: int
+                The number of rows per batch.
+            initial_epoch: int
+                The epoch the training starts (or resumes) on.
+
+        Returns:
+            Tuple[WindowSequence, WindowSequence]
+            (train, validation)
+        """
+        split: int = int(floor(features.shape[0] * (1 - validation_split)))
+        return WindowSequence(features[:split], labels[:split], batch_size, True, Epoch.SEED, initial_epoch), \
+            WindowSequence(features[split:], labels[split:], batch_size, False, Epoch.SEED, initial_epoch)
+
+
+
+
+
+
+
+
+
+    ############
+    ## Source ##
+    ############
+
+
+
+
+    @staticmethod
+    def get_source() -> ndarray:
+        """Retrieves the normalized close prices the datasets are built from. The source
+        is cached on disk per range and memory mapped, so the processes running in the
+        same machine share it.
+
+        Returns:
+            ndarray
+        """
+        # Init the path of the source based on the range of the candlesticks
+        df: DataFrame = Candlestick.NORMALIZED_PREDICTION_DF
+        path: str = RegressionDataset.get_source_path()
+
+        # Save the source if it hasn't been cached
+        if not Utils.file_exists(path) or load(path, mmap_mode="r").shape[0] != df.shape[0]:
+            Utils.write_atomic(path, ascontiguousarray(df["c"].to_numpy(), dtype=float64))
+
+        # Finally, return the memory mapped source
+        return load(path, mmap_mode="r")
+
+
+
+
+
+
+
+    @staticmethod
+    def get_source_path() -> str:
+        """Builds the path of the cached source based on the range of the normalized
+        prediction candlesticks.
+
+        Returns:
+            str
+        """
+        df: DataFrame = Candlestick.NORMALIZED_PREDICTION_DF
+        return Epoch.PATH.regression_dataset_source(int(df["ot"].iloc[0]), int(df["ct"].iloc[-1]))
@@ -1,6 +1,5 @@
 from typing import Union, List
-from numpy import ndarray, array
-from pandas import DataFrame
+from numpy import ndarray
 from random import seed
 from numpy.random import seed as npseed
 from tensorflow import random as tf_random
@@ -13,6 +12,7 @@ from modules._types import IKerasTrainingConfig, IKerasModelConfig, IKerasModelT
     IKerasTrainingConfig, IRegressionTrainingCertificate, IDiscovery, IRegressionTrainingConfig, \
         IRegressionTrainAndTestDatasets, ITestDatasetEvaluation
 from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
 from modules.epoch.Epoch import Epoch
 from modules.candlestick.Candlestick import Candlestick
 from modules.keras_utils.KerasOptimizer import KerasOptimizer, IKerasOptimizerInstance
@@ -22,6 +22,7 @@ from modules.keras_utils.KerasModel import KerasModel
 from modules.keras_utils.TrainingProgressBar import TrainingProgressBar
 from modules.keras_utils.KerasModelSummary import get_summary
 from modules.regression.RegressionDiscovery import RegressionDiscovery
+from modules.regression.RegressionDataset import RegressionDataset
 
 
 
@@ -57,13 +58,16 @@ class RegressionTraining:
         train_y: ndarray
         test_x: ndarray
         test_y: ndarray
-            Features and labels. The training data.
+            Features and labels. The training data. Keep in mind that they are read-only
+            views over the normalized close prices.
         train_size: int
             The number of rows included in the train dataset.
         test_size: int
             The number of rows included in the test dataset.
         discovery: RegressionDiscovery
             The instance of the regression discovery.
+        verbose: bool
+            If disabled, the training steps and the progress bar won't be printed.
     """
     # Training Configuration
     TRAINING_CONFIG: IKerasTrainingConfig = {
@@ -85,7 +89,7 @@ class RegressionTraining:
 
 
 
-    def __init__(self, config: IRegressionTrainingConfig, datasets: IRegressionTrainAndTestDatasets):
+    def __init__(self, config: IRegressionTrainingConfig, datasets: IRegressionTrainAndTestDatasets, verbose: bool = True):
         """Initializes the RegressionTraining Instance.
 
         Args:
@@ -94,6 +98,8 @@ class RegressionTraining:
             datasets: IRegressionTrainAndTestDatasets
                 The packed datasets that will be used to train and evaluate the
                 regression.
+            verbose: bool
+                If disabled, the training steps and the progress bar won't be printed.
 
         Raises:
             ValueError:
@@ -145,6 +151,9 @@ class RegressionTraining:
         # Initialize the Discovery Instance
         self.discovery: RegressionDiscovery = RegressionDiscovery()
 
+        # Initialize the verbosity
+        self.verbose: bool = verbose
+
         # Clear the Keras Session
         clear_session()
         seed(Epoch.SEED)
@@ -186,11 +195,11 @@ class RegressionTraining:
         )
 
         # Retrieve the Keras Model
-        print("    1/8) Initializing Model...")
+        self._log("    1/8) Initializing Model...")
         model: Sequential = KerasModel(config=self.keras_model)
 
         # Compile the model
-        print("    2/8) Compiling Model...")
+        self._log("    2/8) Compiling Model...")
         model.compile(optimizer=self.optimizer, loss=self.loss, metrics=[ self.metric ])
 
         # ModelCheckpoint Callback
@@ -210,58 +219,86 @@ class RegressionTraining:
             Utils.make_directory(checkpoint_root_path)
         model_checkpoint_callback = ModelCheckpoint(filepath=checkpoint_path, save_weights_only=True, save_freq="epoch")
   
-        # Train the model
-        print("    3/8) Training Model")
-        history_object: History = model.fit(
+        # Init the sequences that will stream the train and validation batches
+        train_sequence, validation_sequence = RegressionDataset.make_sequences(
             self.train_x, 
             self.train_y, 
-            validation_split=Epoch.VALIDATION_SPLIT, 
-            initial_epoch=initial_epoch,
-            epochs=RegressionTraining.TRAINING_CONFIG["max_epochs"],
-            callbacks=[ 
-                early_stopping, 
-                model_checkpoint_callback,
-                TrainingProgressBar(active_epoch_path, initial_epoch, RegressionTraining.TRAINING_CONFIG["max_epochs"], "       ") 
-            ],
-            shuffle=True,
-            batch_size=RegressionTraining.TRAINING_CONFIG["batch_size"],
-            verbose=0
+            Epoch.VALIDATION_SPLIT, 
+            RegressionTraining.TRAINING_CONFIG["batch_size"],
+            initial_epoch
         )
+  
+        # Train the model
+        self._log("    3/8) Training Model")
+        with Profiler.stage("regression_fit", "samples") as fit_stage:
+            history_object: History = model.fit(
+                train_sequence, 
+                validation_data=validation_sequence, 
+                initial_epoch=initial_epoch,
+                epochs=RegressionTraining.TRAINING_CONFIG["max_epochs"],
+                callbacks=[ 
+                    early_stopping, 
+                    model_checkpoint_callback,
+                    TrainingProgressBar(
+                        active_epoch_path, 
+                        initial_epoch, 
+                        RegressionTraining.TRAINING_CONFIG["max_epochs"], 
+                        "       ",
+                        disable=not self.verbose
+                    ) 
+                ],
+                shuffle=False,
+                verbose=0
+            )
+
+            # Initialize the Training History
+            history: IKerasModelTrainingHistory = history_object.history
+
+            # Set the number of train samples processed
+            fit_stage["items"] = train_sequence.x.shape[0] * len(history.get("loss", []))
+
+        # Init the number of train samples processed per second
+        throughput: float = fit_stage["throughput"] or 0
+
+        # Evaluate the model on the test dataset
+        with Profiler.stage("regression_evaluation", "samples") as evaluation_stage:
+            evaluation_stage["items"] = len(self.test_x)
+
+            # Predict the test dataset
+            self._log("    4/8) Predicting Test Dataset...")
+            preds: List[List[float]] = model.predict(self.test_x, verbose=0).tolist()
+
+            # Evaluate the test dataset
+            self._log("    5/8) Evaluating Test Dataset...")
+            test_ds_evaluation: ITestDatasetEvaluation = {
+                self.loss.name: float(self.loss(preds, self.test_y)),
+                self.metric.name: float(self.metric(preds, self.test_y))
+            }
 
-        # Initialize the Training History
-        history: IKerasModelTrainingHistory = history_object.history
-
-        # Predict the test dataset
-        print("    4/8) Predicting Test Dataset...")
-        preds: List[List[float]] = model.predict(self.test_x, verbose=0).tolist()
-
-        # Evaluate the test dataset
-        print("    5/8) Evaluating Test Dataset...")
-        test_ds_evaluation: ITestDatasetEvaluation = {
-            self.loss.name: float(self.loss(preds, self.test_y)),
-            self.metric.name: float(self.metric(preds, self.test_y))
-        }
-
-        # Perform the regression discovery
-        print("    6/8) Discovering Regression...")
-        discovery: IDiscovery = self.discovery.discover(
-            features=self.test_x,
-            labels=self.test_y,
-            preds=preds
-        )
+            # Perform the regression discovery
+            self._log("    6/8) Discovering Regression...")
+            discovery: IDiscovery = self.discovery.discover(
+                features=self.test_x,
+                labels=self.test_y,
+                preds=preds
+            )
 
         # Build the training certificate
-        print("    7/8) Building Certificate...")
+        self._log("    7/8) Building Certificate...")
         certificate: IRegressionTrainingCertificate = self._build_certificate(
             model=model,
             start_time=start_time,  
             training_history=history, 
+            training_throughput=throughput,
             test_ds_evaluation=test_ds_evaluation, 
             discovery=discovery
         )
 
+        # Attach the timings (if the profiler is enabled)
+        Profiler.attach(certificate, [fit_stage, evaluation_stage])
+
         # Save the model
-        print("    8/8) Saving Model...")
+        self._log("    8/8) Saving Model...")
         self._save_model(certificate, model)
 
         # Delete the checkpoint directory
@@ -275,11 +312,27 @@ class RegressionTraining:
 
 
 
+    def _log(self, message: str) -> None:
+        """Prints a training step if the instance is verbose.
+
+        Args:
+            message: str
+                The message to be printed.
+        """
+        if self.verbose:
+            print(message)
+
+
+
+
+
+
     def _build_certificate(
         self,
         model: Sequential,
         start_time: int, 
         training_history: IKerasModelTrainingHistory, 
+        training_throughput: float,
         test_ds_evaluation: ITestDatasetEvaluation,
         discovery: IDiscovery
     ) -> IRegressionTrainingCertificate:
@@ -293,6 +346,8 @@ class RegressionTraining:
                 The time in which the training started.
             training_history: IKerasModelTrainingHistory
                 The model's performance history during training.
+            training_throughput: float
+                The number of train samples processed per second.
             test_ds_evaluation: ITestDatasetEvaluation
                 The evaluation performed on the test dataset.
             discovery: IDiscovery
@@ -301,6 +356,10 @@ class RegressionTraining:
         Returns:
             IRegressionTrainingCertificate
         """
+        # Init the time in which the training ended
+        end_time: int = Utils.get_time()
+
+        # Build the certificate
         return {
             # Identification
             "id": self.id,
@@ -322,7 +381,9 @@ class RegressionTraining:
 
             # Training
             "training_start": start_time,
-            "training_end": Utils.get_time(),
+            "training_end": end_time,
+            "training_wall_time": round((end_time - start_time) / 1000, 2),
+            "training_throughput": training_throughput,
             "training_history": training_history,
             "test_ds_evaluation": test_ds_evaluation,
 
@@ -384,34 +445,26 @@ class RegressionTraining:
 
 
     @staticmethod
-    def make_train_and_test_datasets() -> IRegressionTrainAndTestDatasets:
+    def make_train_and_test_datasets(source: Union[ndarray, None] = None) -> IRegressionTrainAndTestDatasets:
         """Builds a tuple containing the features and labels for the train and test datasets.
+        The datasets are views over the normalized close prices and are split the same way 
+        for every regression.
+
+        Args:
+            source: Union[ndarray, None]
+                The normalized close prices the datasets will be built from. If none is 
+                provided, the cached source of the candlesticks will be used.
 
         Returns:
             IRegressionTrainAndTestDatasets
             (train_x, train_y, test_x, test_y)
         """
-        # Init the df, grabbing only the close prices
-        df: DataFrame = Candlestick.NORMALIZED_PREDICTION_DF[["c"]].copy()
-
-        # Init the number of rows and the split that will be applied
-        rows: int = df.shape[0]
-        split: int = int(rows * Epoch.TRAIN_SPLIT)
-
-        # Init raw features and labels
-        features_raw: Union[List[List[float]], ndarray] = []
-        labels_raw: Union[List[List[float]], ndarray] = []
-
-        # Iterate over the normalized ds and build the features & labels
-        for i in range(Epoch.REGRESSION_LOOKBACK, rows):
-            # Make sure there are enough items remaining
-            if i < (rows-Epoch.REGRESSION_PREDICTIONS):
-                features_raw.append(df.iloc[i-Epoch.REGRESSION_LOOKBACK:i, 0])
-                labels_raw.append(df.iloc[i:i+Epoch.REGRESSION_PREDICTIONS, 0])
-
-        # Convert the features and labels into np arrays
-        features = array(features_raw)
-        labels = array(labels_raw)
+        # Init the source as well as the features and labels
+        source = source if isinstance(source, ndarray) else RegressionDataset.get_source()
+        features, labels = RegressionDataset.make_windows(source)
+
+        # Init the split that will be applied based on the number of candlesticks
+        split: int = int(source.shape[0] * Epoch.TRAIN_SPLIT)
 
         # Finally, return the split datasets
         return features[:split], labels[:split], features[split:], labels[split:]
@@ -0,0 +1,283 @@
+from typing import List, Union
+from time import time, sleep
+from os import open as open_fd, close as close_fd, O_CREAT, O_RDWR
+from fcntl import flock, LOCK_EX, LOCK_NB
+from multiprocessing import get_context, cpu_count
+from numpy import load
+from modules._types import IRegressionTrainingConfig, IRegressionTrainingConfigBatch, IRegressionTrainingCertificate, \
+    IRegressionTrainAndTestDatasets
+from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
+from modules.epoch.Epoch import Epoch
+from modules.candlestick.Candlestick import Candlestick
+from modules.regression.RegressionDataset import RegressionDataset
+from modules.regression.RegressionTraining import RegressionTraining
+
+
+
+
+class RegressionTrainingScheduler:
+    """RegressionTrainingScheduler Class
+
+    This singleton trains the regressions within a batch. When more than 1 worker is used,
+    the jobs are trained concurrently by spawned processes that build the datasets over
+    the same memory mapped source. The jobs are claimed through file locks which are
+    released by the OS if a worker crashes, allowing the config to be claimed again and
+    resumed from its checkpoint. The lock files are never removed, so every process that
+    opens the lock of a job refers to the same file.
+
+    Class Properties:
+        POLL_INTERVAL: int
+            The number of seconds a worker waits before looking for jobs again when all
+            the pending ones have been claimed by other workers.
+    """
+    # The number of seconds between job lookups
+    POLL_INTERVAL: int = 10
+
+
+
+
+
+
+    ##################
+    ## Batch Runner ##
+    ##################
+
+
+
+
+    @staticmethod
+    def run(config_batch: IRegressionTrainingConfigBatch, workers: Union[int, None] = None) -> List[IRegressionTrainingCertificate]:
+        """Trains all the regressions within a batch. Keep in mind that the training of a
+        regression will be skipped if its certificate exists.
+
+        Args:
+            config_batch: IRegressionTrainingConfigBatch
+                The batch that will be trained.
+            workers: Union[int, None]
+                The number of processes that will train the regressions. If none is
+                provided, it will be derived from the hardware (Utils.get_tensorflow_workers).
+
+        Returns:
+            List[IRegressionTrainingCertificate]
+            The certificates in the same order as the configs in the batch.
+
+        Raises:
+            RuntimeError:
+                If any of the workers exited with an error.
+            RuntimeError:
+                If any of the regressions could not be trained.
+        """
+        # Init the number of workers
+        configs: List[IRegressionTrainingConfig] = config_batch["configs"]
+        workers = RegressionTrainingScheduler._get_workers(workers, configs)
+        print(f"Batch: {config_batch['name']} ({workers} workers)\n")
+
+        # Train the regressions concurrently
+        if workers > 1:
+            # Make sure the source of the datasets is cached
+            start: float = time()
+            RegressionDataset.get_source()
+            threads: int = max(cpu_count() // workers, 1)
+            print(f"Datasets: {round(time() - start, 2)}s | Threads per worker: {threads}\n")
+
+            # Spawn the workers and wait for them to complete
+            context = get_context("spawn")
+            processes = [
+                context.Process(
+                    target=RegressionTrainingScheduler._run_worker,
+                    args=(configs, RegressionDataset.get_source_path(), threads)
+                ) for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            # Make sure none of the workers crashed. The traceback (if any) is printed by the worker
+            failed: List[str] = [
+                f"Worker {i + 1} (pid {process.pid}, exit code {process.exitcode})"
+                for i, process in enumerate(processes) if process.exitcode != 0
+            ]
+            if len(failed) > 0:
+                pending: List[str] = [c["id"] for c in configs if RegressionTraining.get_certificate(c["id"]) is None]
+                raise RuntimeError(
+                    f"The training of the batch {config_batch['name']} failed: {', '.join(failed)}. "
+                    f"Pending regressions: {', '.join(pending) if len(pending) > 0 else 'None'}."
+                )
+
+        # Otherwise, train them one by one in the current process
+        else:
+            # Build the datasets
+            start: float = time()
+            datasets: IRegressionTrainAndTestDatasets = RegressionTraining.make_train_and_test_datasets()
+            print(f"Datasets: {round(time() - start, 2)}s | Peak Memory: {Utils.get_peak_memory()} MB\n")
+
+            # Train the regressions
+            for index, config in enumerate(configs):
+                if RegressionTraining.get_certificate(config["id"]) is None:
+                    print(f"\n{index + 1}/{len(configs)}) {config['id']}")
+                    RegressionTrainingScheduler._train_job(config, datasets, True)
+                else:
+                    print(f"\n{index + 1}/{len(configs)}) {config['id']}: Skipped")
+
+        # Finally, return the certificates in the original order
+        certificates: List[IRegressionTrainingCertificate] = []
+        for config in configs:
+            cert: Union[IRegressionTrainingCertificate, None] = RegressionTraining.get_certificate(config["id"])
+            if cert is None:
+                raise RuntimeError(f"The regression {config['id']} could not be trained.")
+            certificates.append(cert)
+        return certificates
+
+
+
+
+
+
+    @staticmethod
+    def _get_workers(workers: Union[int, None], configs: List[IRegressionTrainingConfig]) -> int:
+        """Calculates the number of workers that will train the batch. There cannot be
+        more workers than pending configs.
+
+        Args:
+            workers: Union[int, None]
+                The number of workers requested (if any).
+            configs: List[IRegressionTrainingConfig]
+                The configs within the batch.
+
+        Returns:
+            int
+        """
+        # Init the requested workers or derive them from the hardware
+        if not isinstance(workers, int) or workers < 1:
+            workers = Utils.get_tensorflow_workers()
+
+        # Finally, limit them to the number of pending configs
+        pending: int = len([c for c in configs if RegressionTraining.get_certificate(c["id"]) is None])
+        return max(min(workers, pending), 1)
+
+
+
+
+
+
+
+
+
+
+    ##########
+    ## Jobs ##
+    ##########
+
+
+
+
+    @staticmethod
+    def _train_job(config: IRegressionTrainingConfig, datasets: IRegressionTrainAndTestDatasets, verbose: bool) -> bool:
+        """Claims and trains a regression. If the training was interrupted, it will be
+        resumed from the checkpoint. Keep in mind that the lock file is released but never
+        removed. Otherwise, a process that opened it right before it was unlinked could
+        lock a file that no longer has a path while another process locks a new one.
+
+        Args:
+            config: IRegressionTrainingConfig
+                The configuration of the regression.
+            datasets: IRegressionTrainAndTestDatasets
+                The packed datasets that will be used to train and evaluate the regression.
+            verbose: bool
+                If enabled, the training steps and the progress bar will be printed.
+
+        Returns:
+            bool
+            True if the job was claimed.
+        """
+        # Claim the job. If the lock cannot be acquired, another process is training it
+        lock_path: str = Epoch.PATH.regression_training_lock(config["id"])
+        fd: int = open_fd(lock_path, O_CREAT | O_RDWR)
+        try:
+            flock(fd, LOCK_EX | LOCK_NB)
+        except BlockingIOError:
+            close_fd(fd)
+            return False
+
+        # Train the regression unless it was completed while the lock was being acquired
+        try:
+            if RegressionTraining.get_certificate(config["id"]) is None:
+                Profiler.reset()
+                cert: IRegressionTrainingCertificate = RegressionTraining(config, datasets, verbose).train()
+                if not verbose:
+                    print(f"{config['id']}: {cert['training_wall_time']}s ({cert['training_throughput']} samples/s)")
+
+        # Release the lock
+        finally:
+            close_fd(fd)
+
+        # Finally, let the worker know the job was claimed
+        return True
+
+
+
+
+
+
+
+
+
+
+    #############
+    ## Workers ##
+    #############
+
+
+
+
+    @staticmethod
+    def _run_worker(configs: List[IRegressionTrainingConfig], source_path: str, threads: int) -> None:
+        """Runs a worker process. The worker claims the pending jobs until all the
+        certificates exist. If the pending jobs are being trained by other workers, it
+        waits in case any of them crashes.
+
+        Args:
+            configs: List[IRegressionTrainingConfig]
+                The configs within the batch.
+            source_path: str
+                The path of the cached source of the datasets.
+            threads: int
+                The number of threads TensorFlow can use within the worker.
+        """
+        # Limit the TensorFlow threads before the runtime is initialized
+        Utils.limit_tensorflow_threads(threads)
+
+        # Initialize the Epoch and the candlesticks the certificates are built from
+        Epoch.init()
+        Candlestick.NORMALIZED_PREDICTION_DF = Candlestick.load_df(
+            Candlestick.NORMALIZED_PREDICTION_CANDLESTICK_CONFIG,
+            Epoch.START,
+            Epoch.END
+        )
+
+        # Build the datasets over the memory mapped source
+        datasets: IRegressionTrainAndTestDatasets = RegressionTraining.make_train_and_test_datasets(
+            load(source_path, mmap_mode="r")
+        )
+
+        # Train jobs for as long as there are pending configs
+        while True:
+            # Init the pending configs
+            pending: List[IRegressionTrainingConfig] = [
+                c for c in configs if RegressionTraining.get_certificate(c["id"]) is None
+            ]
+            if len(pending) == 0:
+                break
+
+            # Train the first job that can be claimed
+            claimed: bool = False
+            for config in pending:
+                if RegressionTrainingScheduler._train_job(config, datasets, False):
+                    claimed = True
+                    break
+
+            # If all the pending jobs are claimed, wait for them to complete
+            if not claimed:
+                sleep(RegressionTrainingScheduler.POLL_INTERVAL)
@@ -0,0 +1,223 @@
+from typing import List, Dict, Iterator, Union, Any
+from os import environ
+from time import time
+from contextlib import contextmanager
+from modules._types import IProfilerStage
+from modules.utils.Utils import Utils
+
+
+
+
+class Profiler:
+    """Profiler Class
+
+    This singleton measures the stages of the pipeline. The stages are always timed so the
+    modules can log them, however, they are only recorded when the profiler is enabled. The
+    profiler can be enabled on any endpoint by setting the EPOCH_BUILDER_PROFILE environment
+    variable to 1, which is also inherited by the worker processes. Once enabled, the
+    recorded stages are placed in the receipts, journals and regression certificates.
+
+    Class Properties:
+        ENABLED: bool
+            If enabled, the stages are recorded.
+        STAGES: List[IProfilerStage]
+            The stages recorded by the current process since the last reset, including the
+            ones still running.
+    """
+    # Profiler State
+    ENABLED: bool = environ.get("EPOCH_BUILDER_PROFILE") == "1"
+
+    # Recorded Stages
+    STAGES: List[IProfilerStage] = []
+
+
+
+
+    @staticmethod
+    def enable() -> None:
+        """Enables the profiler within the current process as well as the worker
+        processes it starts, which read the state from the environment.
+        """
+        Profiler.ENABLED = True
+        environ["EPOCH_BUILDER_PROFILE"] = "1"
+
+
+
+
+
+
+    @staticmethod
+    def reset() -> List[IProfilerStage]:
+        """Clears the recorded stages. It is invoked at the start of every unit of work 
+        (build, batch evaluation, training job...) so the outputs only include the stages 
+        measured by it and the processes that loop over units don't grow the list forever.
+
+        Returns:
+            List[IProfilerStage]
+            The stages that were cleared.
+        """
+        stages: List[IProfilerStage] = Profiler.get_stages()
+        Profiler.STAGES = []
+        return stages
+
+
+
+
+
+
+
+
+
+
+    ###############
+    ## Recording ##
+    ###############
+
+
+
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str, unit: Union[str, None] = None) -> Iterator[IProfilerStage]:
+        """Measures a stage of the pipeline. If the number of items processed by the
+        stage is known, it should be set on the yielded record so the throughput can be
+        calculated once the stage completes.
+
+        Args:
+            name: str
+                The name of the stage.
+            unit: Union[str, None]
+                The unit of the items processed by the stage (candles, labels, configs...).
+
+        Returns:
+            Iterator[IProfilerStage]
+        """
+        # Init the record
+        record: IProfilerStage = {
+            "name": name,
+            "start": Utils.get_time(),
+            "duration": 0,
+            "items": None,
+            "unit": unit,
+            "throughput": None,
+            "peak_memory": 0,
+            "status": "running"
+        }
+        if Profiler.ENABLED:
+            Profiler.STAGES.append(record)
+
+        # Run the stage
+        start: float = time()
+        try:
+            yield record
+            record["status"] = "completed"
+
+        # Finally, populate the measurements
+        finally:
+            elapsed: float = time() - start
+            if record["status"] == "running":
+                record["status"] = "failed"
+            record["duration"] = round(elapsed, 4)
+            if isinstance(record["items"], int) and elapsed > 0:
+                record["throughput"] = round(record["items"] / elapsed, 2)
+            record["peak_memory"] = Utils.get_peak_memory()
+
+
+
+
+
+
+    @staticmethod
+    def get_stages() -> List[IProfilerStage]:
+        """Retrieves a copy of the recorded stages. The duration of the stages that are
+        still running is the time elapsed so far.
+
+        Returns:
+            List[IProfilerStage]
+        """
+        # Init the current time
+        current_time: int = Utils.get_time()
+
+        # Finally, copy the stages
+        return [
+            dict(stage) if stage["status"] != "running" else {
+                **stage, "duration": round((current_time - stage["start"]) / 1000, 4)
+            } for stage in Profiler.STAGES
+        ]
+
+
+
+
+
+
+
+
+
+
+    #############
+    ## Outputs ##
+    #############
+
+
+
+
+    @staticmethod
+    def attach(record: Dict[str, Any], stages: Union[List[IProfilerStage], None] = None) -> None:
+        """Places the stages in a record (certificate, journal...) if the profiler is
+        enabled.
+
+        Args:
+            record: Dict[str, Any]
+                The record the stages will be attached to.
+            stages: Union[List[IProfilerStage], None]
+                The stages to attach. If none are provided, all the recorded stages
+                will be attached.
+        """
+        if Profiler.ENABLED:
+            record["timings"] = Profiler.get_stages() if stages is None else [dict(s) for s in stages]
+
+
+
+
+
+
+    @staticmethod
+    def build_receipt() -> str:
+        """Builds the timings section of a receipt. If the profiler is disabled, it
+        returns an empty string.
+
+        Returns:
+            str
+        """
+        # Make sure the profiler is enabled
+        if not Profiler.ENABLED:
+            return ""
+
+        # Finally, build the section
+        receipt: str = "\n\nTimings:\n"
+        for stage in Profiler.get_stages():
+            receipt += Profiler.format_stage(stage) + "\n"
+        return receipt
+
+
+
+
+
+
+    @staticmethod
+    def format_stage(stage: IProfilerStage) -> str:
+        """Formats a stage in a single line.
+
+        Args:
+            stage: IProfilerStage
+                The stage to be formatted.
+
+        Returns:
+            str
+        """
+        line: str = f"{stage['name']}: {round(stage['duration'], 2)}s"
+        if stage["throughput"] is not None:
+            line += f" | {stage['throughput']} {stage['unit']}/s"
+        if stage["peak_memory"] > 0:
+            line += f" | Peak Memory: {stage['peak_memory']} MB"
+        return line if stage["status"] == "completed" else f"{line} ({stage['status']})"
@@ -1,11 +1,15 @@
 from typing import List, Union, Any, Tuple
-from os import makedirs, listdir, remove
+from os import makedirs, listdir, remove, getpid
 from os.path import exists, isfile, dirname, splitext
 from shutil import rmtree, move, copy, copytree
 from json import load, dumps
+from hashlib import sha256
 from time import time
+from resource import getrusage, RUSAGE_SELF
+from multiprocessing import cpu_count
 from datetime import datetime
 from uuid import UUID, uuid4
+from numpy import save as save_npy
 from tensorflow import config, __version__ as tf_version
 from modules._types import IFileExtension
 
@@ -18,6 +22,11 @@ class Utils:
     This singleton provides a series of functionalities that simplify development and 
     provide consistency among modules.
 
+    Class Properties:
+        TENSORFLOW_THREADS_PER_WORKER: int
+            The number of cores assigned to each process running TensorFlow when the 
+            number of processes is derived from the core count.
+
     Number Helpers:
         alter_number_by_percentage(value: float, percent: float) -> float
         get_percentage_change(old_value: float, new_value: float) -> float
@@ -46,11 +55,18 @@ class Utils:
         get_directory_content(path: str, only_file_ext: Union[IFileExtension, None] = None) -> Tuple[List[str], List[str]]
         read(path: str, allow_empty: bool = False) -> Any
         write(path: str, data: Any, timestamp_file_name: bool = False, indent: Union[int, None] = None) -> None
+        write_atomic(path: str, data: Any, indent: Union[int, None] = None) -> None
+        get_file_hash(path: str) -> str
 
     Misc Helpers:
         prettify_model_id(id: str) -> str
+        get_peak_memory() -> float
+        get_tensorflow_workers() -> int
+        limit_tensorflow_threads(threads: int, inter_op_threads: int = 1) -> None
         clear_terminal() -> None
     """
+    # The number of cores per TensorFlow process
+    TENSORFLOW_THREADS_PER_WORKER: int = 4
 
 
 
@@ -680,6 +696,82 @@ class Utils:
 
 
 
+    @staticmethod
+    def write_atomic(path: str, data: Any, indent: Union[int, None] = None) -> None:
+        """Writes a file on a given path through a temporary file that is moved into
+        place once it has been fully written. This way, processes reading the file at the
+        same time never find it partially written.
+
+        Args:
+            path: str
+                The path of the file that will be written. Note that if the file
+                exists, it will overwrite it.
+            data: Any
+                The data to be stored in the file. If it is a JSON file, the data must
+                be compatible. If it is a .npy file, the data must be a numpy array.
+            indent: Union[int, None]
+                The indenting to be applied on the JSON File. Defaults to no indenting.
+        """
+        # Make sure the directory exists
+        dir_name: str = dirname(path)
+        if not Utils.directory_exists(dir_name):
+            Utils.make_directory(dir_name)
+
+        # Write the temporary file based on its format
+        tmp_path: str = f"{path}.{getpid()}.tmp"
+        extension: str = splitext(path)[1]
+        if extension == ".npy":
+            with open(tmp_path, "wb") as file_wrapper:
+                save_npy(file_wrapper, data)
+        else:
+            with open(tmp_path, "w") as file_wrapper:
+                if extension == ".json":
+                    file_wrapper.write(dumps(data, indent=indent))
+                else:
+                    file_wrapper.write(data)
+
+        # Finally, move the file into place
+        Utils.move_file_or_dir(tmp_path, path)
+
+
+
+
+
+
+
+
+
+
+    @staticmethod
+    def get_file_hash(path: str) -> str:
+        """Calculates the SHA256 hash of a file's contents. The file is read in chunks
+        so it can be used on large files.
+
+        Args:
+            path: str
+                The path of the file.
+
+        Returns:
+            str
+
+        Raises:
+            RuntimeError:
+                If the file does not exist.
+        """
+        # Make sure the file exists
+        if not Utils.file_exists(path):
+            raise RuntimeError(f"The hash of the file {path} cannot be calculated because it does not exist.")
+
+        # Hash the file in chunks of 8MB
+        file_hash = sha256()
+        with open(path, "rb") as file_instance:
+            for chunk in iter(lambda: file_instance.read(8388608), b""):
+                file_hash.update(chunk)
+
+        # Return the hex digest
+        return file_hash.hexdigest()
+
+
 
 
 
@@ -716,6 +808,68 @@ class Utils:
 
 
 
+    @staticmethod
+    def get_peak_memory() -> float:
+        """Retrieves the peak resident set size of the current process in megabytes.
+
+        Returns:
+            float
+        """
+        return round(getrusage(RUSAGE_SELF).ru_maxrss / 1024, 2)
+
+
+
+
+
+
+
+
+    @staticmethod
+    def get_tensorflow_workers() -> int:
+        """Derives the number of processes that can run TensorFlow concurrently from the
+        hardware. Since each process holds its own runtime and datasets, it will use 1 
+        process when a GPU is available. Otherwise, 1 every TENSORFLOW_THREADS_PER_WORKER 
+        cores.
+
+        Returns:
+            int
+        """
+        if len(config.list_physical_devices("GPU")) > 0:
+            return 1
+        return max(cpu_count() // Utils.TENSORFLOW_THREADS_PER_WORKER, 1)
+
+
+
+
+
+
+
+    @staticmethod
+    def limit_tensorflow_threads(threads: int, inter_op_threads: int = 1) -> None:
+        """Limits the number of threads TensorFlow can use within the current process and
+        enables memory growth on the GPUs (if any) so they can be shared by several processes.
+        Keep in mind that it must be invoked before the TensorFlow runtime is initialized.
+
+        Args:
+            threads: int
+                The number of threads used to parallelize the execution of an operation.
+            inter_op_threads: int
+                The number of threads used to execute independent operations concurrently.
+                The regressions are sequential stacks of layers with very few independent
+                operations, so a single thread keeps the process within its share of the
+                cores as each of the inter op threads can use all the intra op threads.
+        """
+        config.threading.set_intra_op_parallelism_threads(threads)
+        config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+        for gpu in config.list_physical_devices("GPU"):
+            config.experimental.set_memory_growth(gpu, True)
+
+
+
+
+
+
+
     @staticmethod
     def endpoint_header(eb_version: str, endpoint_name: str) -> None:
         """Prints an endpoint's header.
@@ -0,0 +1,62 @@
+from argparse import ArgumentParser
+from modules._types import IBenchmarkResult
+from modules.utils.Utils import Utils
+from modules.utils.Profiler import Profiler
+from modules.configuration.Configuration import Configuration
+from modules.benchmark.Benchmark import Benchmark
+
+
+# RUN BENCHMARK
+# Args:
+#   --epoch_width? "6"
+#   --regressions? "16"
+#   --configs? "2000"
+#   --backtests? "100"
+#   --workers? "1"
+# Keep in mind that the features are predicted and the configs are evaluated by spawned
+# processes which import this file. Therefore, the script can only be executed as the main module.
+if __name__ == "__main__":
+    endpoint_name: str = "RUN BENCHMARK"
+    Utils.endpoint_header(Configuration.VERSION, endpoint_name)
+
+
+
+    # Extract the args
+    parser = ArgumentParser()
+    parser.add_argument("--epoch_width", dest="epoch_width", nargs='?')
+    parser.add_argument("--regressions", dest="regressions", nargs='?')
+    parser.add_argument("--configs", dest="configs", nargs='?')
+    parser.add_argument("--backtests", dest="backtests", nargs='?')
+    parser.add_argument("--workers", dest="workers", nargs='?')
+    args = parser.parse_args()
+    epoch_width: int = int(args.epoch_width) if isinstance(args.epoch_width, str) and args.epoch_width.isdigit() else 6
+    regressions: int = int(args.regressions) if isinstance(args.regressions, str) and args.regressions.isdigit() else 16
+    configs: int = int(args.configs) if isinstance(args.configs, str) and args.configs.isdigit() else 2000
+    backtests: int = int(args.backtests) if isinstance(args.backtests, str) and args.backtests.isdigit() else 100
+    workers: int = int(args.workers) if isinstance(args.workers, str) and args.workers.isdigit() else 1
+
+
+
+    # Run the benchmark on a synthetic epoch
+    result: IBenchmarkResult = Benchmark.run(
+        epoch_width=epoch_width,
+        regressions=regressions,
+        configs=configs,
+        backtests=backtests,
+        workers=workers
+    )
+
+
+
+    # Print the results
+    print("\n\nBenchmark Results:")
+    for stage in result["stages"]:
+        print(Profiler.format_stage(stage))
+    print(f"\nDuration: {result['duration']}s")
+    print(f"Peak Memory: {result['peak_memory']} MB")
+    print(f"Results: {Benchmark.RESULTS_PATH}/{result['creation']}.json")
+
+
+
+    # End of Script
+    Utils.endpoint_footer(endpoint_name)
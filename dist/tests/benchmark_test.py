@@ -0,0 +1,105 @@
+from typing import List
+from unittest import TestCase, main
+from sys import executable
+from os.path import dirname, abspath
+from subprocess import run, CompletedProcess
+from modules._types import IBenchmarkResult
+from modules.utils.Utils import Utils
+
+
+
+
+
+
+## Helpers ##
+
+
+
+# Benchmark Endpoint
+RUN_BENCHMARK_PATH: str = f"{dirname(dirname(abspath(__file__)))}/run_benchmark.py"
+
+# Stages that must be measured by every run
+EXPECTED_STAGES: List[str] = [
+    "synthetic_candlesticks", "features", "labels", "lookback_indexer", "save_assets",
+    "find_profitable_configs", "build_prediction_models", "export_epoch"
+]
+
+
+
+def _run_benchmark(workers: int) -> IBenchmarkResult:
+    """Runs a small benchmark through its endpoint in a separate process, so the
+    spawned workers import the modules the same way they would in production. Once
+    complete, the results file is removed.
+
+    Args:
+        workers: int
+            The number of processes that will predict the features and evaluate the
+            configurations.
+
+    Returns:
+        IBenchmarkResult
+
+    Raises:
+        RuntimeError:
+            If the benchmark fails or takes too long.
+    """
+    process: CompletedProcess = run(
+        [executable, RUN_BENCHMARK_PATH, "--epoch_width", "1", "--regressions", "16", "--configs", "500",
+         "--backtests", "10", "--workers", str(workers)],
+        capture_output=True,
+        text=True,
+        timeout=1800
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"The benchmark failed ({process.returncode}):\n{process.stderr[-3000:]}")
+
+    # Read the results and clean them up
+    results_path: str = process.stdout.split("Results: ")[-1].splitlines()[0].strip()
+    result: IBenchmarkResult = Utils.read(results_path)
+    Utils.remove_file(results_path)
+    return result
+
+
+
+
+
+
+# Test Class
+class BenchmarkTestCase(TestCase):
+    # Before Tests
+    def setUp(self):
+        pass
+
+    # After Tests
+    def tearDown(self):
+        pass
+
+
+
+
+    # Can run the benchmark within a single process
+    def testRunWithASingleWorker(self):
+        result: IBenchmarkResult = _run_benchmark(1)
+        self.assertEqual(result["config"]["workers"], 1)
+        self.assertTrue(set(EXPECTED_STAGES) <= {stage["name"] for stage in result["stages"]})
+        self.assertTrue(all(stage["status"] == "completed" for stage in result["stages"]))
+
+
+
+
+    # Can run the benchmark across spawned workers
+    def testRunWithWorkers(self):
+        result: IBenchmarkResult = _run_benchmark(2)
+        self.assertEqual(result["config"]["workers"], 2)
+        self.assertTrue(set(EXPECTED_STAGES) <= {stage["name"] for stage in result["stages"]})
+        self.assertTrue(all(stage["status"] == "completed" for stage in result["stages"]))
+
+
+
+
+
+
+
+# Test Execution
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,12 @@
+from typing import Union
 from unittest import TestCase, main
-from pandas import Series
+from os import stat, utime
+from tempfile import mkdtemp
+from numpy import arange, around, exp, cumsum
+from numpy.random import RandomState
+from pandas import Series, DataFrame, read_csv
+from modules._types import ICandlestickConfig, ICandlestickCacheMeta
+from modules.utils.Utils import Utils
 from modules.candlestick.Candlestick import Candlestick
 from modules.epoch.Epoch import Epoch
 
@@ -11,15 +18,166 @@ LOOKBACK = Epoch.REGRESSION_LOOKBACK
 
 
 
+## Helpers ##
+
+
+
+def _write_csv(path: str, seed: int, rows: int = 500) -> DataFrame:
+    """Writes a candlesticks CSV file based on a random walk.
+
+    Args:
+        path: str
+            The path of the CSV file.
+        seed: int
+            The seed used to generate the prices.
+        rows: int
+            The number of candlesticks.
+
+    Returns:
+        DataFrame
+    """
+    rs: RandomState = RandomState(seed)
+    c = around(30000 * exp(cumsum(rs.normal(0, 0.002, rows))), 2)
+    ot = 1609459200000 + arange(rows) * 60000
+    df: DataFrame = DataFrame({"ot": ot, "ct": ot + 59999, "o": c, "h": around(c * 1.001, 2), "l": around(c * 0.999, 2), "c": c})
+    df.to_csv(path, index=False)
+    return df
+
+
+
+
+def _get_column_inode(config: ICandlestickConfig, name: str) -> int:
+    """Retrieves the inode of a cached column. Since the cache files are moved into
+    place, a different inode means the column was written again.
+
+    Args:
+        config: ICandlestickConfig
+            The configuration of the candlesticks.
+        name: str
+            The name of the column.
+
+    Returns:
+        int
+    """
+    return stat(Candlestick._cache_path(config, f"{name}.npy")).st_ino
+
+
+
+
+
+
 # Test Class
 class CandlestickTestCase(TestCase):
     # Before Tests
     def setUp(self):
-        pass
+        self.dir: str = mkdtemp()
+        self.config: ICandlestickConfig = {
+            "columns": ("ot", "ct", "o", "h", "l", "c"),
+            "csv_file": f"{self.dir}/candlesticks.csv",
+            "interval_minutes": 1
+        }
 
     # After Tests
     def tearDown(self):
-        pass
+        Utils.remove_directory(self.dir)
+
+
+
+
+    # Can build the cache and load the same DataFrame as read_csv
+    def testCacheMatchesCSV(self):
+        _write_csv(self.config["csv_file"], 1)
+        expected: DataFrame = read_csv(self.config["csv_file"], usecols=self.config["columns"])
+
+        # The first load builds the cache
+        self.assertIsNone(Candlestick._get_valid_cache_meta(self.config))
+        df: DataFrame = Candlestick.load_df(self.config)
+        self.assertTrue(df.equals(expected))
+        meta: Union[ICandlestickCacheMeta, None] = Candlestick._get_valid_cache_meta(self.config)
+        self.assertIsNotNone(meta)
+        self.assertEqual(meta["rows"], expected.shape[0])
+        self.assertTrue(meta["sorted"])
+
+        # The following loads hit the cache
+        inode: int = _get_column_inode(self.config, "c")
+        self.assertTrue(Candlestick.load_df(self.config).equals(expected))
+        self.assertEqual(_get_column_inode(self.config, "c"), inode)
+
+        # The ranges are the same as filtering the CSV
+        start: int = int(expected["ot"].iloc[100])
+        end: int = int(expected["ct"].iloc[299])
+        self.assertTrue(Candlestick.load_df(self.config, start, end).equals(
+            expected[(expected["ot"] >= start) & (expected["ct"] <= end)].reset_index(drop=True)
+        ))
+
+
+
+
+    # Can rebuild the cache when the size of the CSV file changes
+    def testCacheInvalidationBySize(self):
+        _write_csv(self.config["csv_file"], 2)
+        Candlestick.load_df(self.config)
+        expected: DataFrame = _write_csv(self.config["csv_file"], 2, rows=600)
+        self.assertIsNone(Candlestick._get_valid_cache_meta(self.config))
+        self.assertTrue(Candlestick.load_df(self.config).equals(expected))
+
+
+
+
+    # Can keep the cache when only the modification time of the CSV file changes
+    def testCacheInvalidationByModificationTime(self):
+        expected: DataFrame = _write_csv(self.config["csv_file"], 3)
+        Candlestick.load_df(self.config)
+        inode: int = _get_column_inode(self.config, "c")
+
+        # Touch the file
+        file_stat = stat(self.config["csv_file"])
+        utime(self.config["csv_file"], ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+        # The cache is kept and its modification time is updated
+        self.assertTrue(Candlestick.load_df(self.config).equals(expected))
+        self.assertEqual(_get_column_inode(self.config, "c"), inode)
+        meta: ICandlestickCacheMeta = Utils.read(Candlestick._cache_path(self.config, "meta.json"))
+        self.assertEqual(meta["mtime"], file_stat.st_mtime_ns + 10**9)
+
+
+
+
+    # Can rebuild the cache when the contents of the CSV file change but its size does not
+    def testCacheInvalidationByHash(self):
+        _write_csv(self.config["csv_file"], 4)
+        Candlestick.load_df(self.config)
+        inode: int = _get_column_inode(self.config, "c")
+
+        # Swap two digits of the contents
+        contents: str = Utils.read(self.config["csv_file"])
+        first_line_end: int = contents.index("\n") + 1
+        lines: str = contents[first_line_end:]
+        replaced_at: int = next(i for i in range(len(lines)) if lines[i].isdigit() and lines[i] != "7")
+        Utils.write(self.config["csv_file"], contents[:first_line_end] + lines[:replaced_at] + "7" + lines[replaced_at+1:])
+        file_stat = stat(self.config["csv_file"])
+        utime(self.config["csv_file"], ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+
+        # The cache is rebuilt
+        self.assertIsNone(Candlestick._get_valid_cache_meta(self.config))
+        self.assertTrue(Candlestick.load_df(self.config).equals(read_csv(self.config["csv_file"], usecols=self.config["columns"])))
+        self.assertNotEqual(_get_column_inode(self.config, "c"), inode)
+
+
+
+
+    # Can rebuild the cache when a column is missing
+    def testCacheRebuildOnMissingColumn(self):
+        expected: DataFrame = _write_csv(self.config["csv_file"], 5)
+        Candlestick.load_df(self.config)
+        Utils.remove_file(Candlestick._cache_path(self.config, "h.npy"))
+        self.assertIsNone(Candlestick._get_valid_cache_meta(self.config))
+        self.assertTrue(Candlestick.load_df(self.config).equals(expected))
+        self.assertIsNotNone(Candlestick._get_valid_cache_meta(self.config))
+
+        # No temporary files are left behind
+        files, _ = Utils.get_directory_content(Candlestick._cache_path(self.config))
+        self.assertTrue(all(not file.endswith(".tmp") for file in files))
 
 
 
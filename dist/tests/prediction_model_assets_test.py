@@ -0,0 +1,295 @@
+from typing import List, Dict, Union
+from unittest import TestCase, main
+from tempfile import mkdtemp
+from numpy import ndarray
+from pandas import DataFrame
+from modules._types import ITestDatasetLabel, ITestDatasetLabels, ITestDatasetFeatures, ILookbackIndexer
+from modules.utils.Utils import Utils
+from modules.candlestick.Candlestick import Candlestick
+from modules.epoch.Epoch import Epoch
+from modules.epoch.EpochPath import EpochPath
+from modules.prediction_model.PredictionModelAssets import PredictionModelAssets
+from tests.synthetic_data import MINUTES_PER_PREDICTION_CANDLESTICK, make_candlesticks, make_prediction_candlesticks, \
+    make_regression_ids, make_features
+
+
+
+
+
+
+## Helpers ##
+
+
+
+# Synthetic Candlesticks
+PREDICTION_CANDLESTICKS_NUM: int = 240
+MINUTES: int = PREDICTION_CANDLESTICKS_NUM * MINUTES_PER_PREDICTION_CANDLESTICK
+LOOKBACK: int = 16
+PRICE_CHANGE_REQUIREMENTS: List[float] = [0.5, 1, 1.5, 2, 3, 5]
+
+# Roughly 1% of the candlesticks have wicks large enough to hit both exit prices
+LARGE_WICKS_PROBABILITY: float = 0.01
+
+# Synthetic Features
+REGRESSION_IDS: List[str] = make_regression_ids(16)
+FEATURES_NUM: int = PREDICTION_CANDLESTICKS_NUM - LOOKBACK
+
+
+
+def _save_json_assets(features: ITestDatasetFeatures, labels: ITestDatasetLabels, indexer: ILookbackIndexer) -> None:
+    """Saves the assets in the JSON format, the way they used to be saved.
+
+    Args:
+        features: ITestDatasetFeatures
+        labels: ITestDatasetLabels
+        indexer: ILookbackIndexer
+    """
+    Utils.write(Epoch.PATH.prediction_models_features(), features)
+    Utils.write(Epoch.PATH.prediction_models_labels(), labels)
+    Utils.write(Epoch.PATH.prediction_models_lookback_indexer(), indexer)
+
+
+
+
+def _get_label(price_change_requirement: float, pred_candlestick: Dict[str, float]) -> Union[ITestDatasetLabel, None]:
+    """Determines the outcome of a prediction candlestick by iterating over the 1m
+    candlesticks, the way the labels used to be generated.
+
+    Args:
+        price_change_requirement: float
+        pred_candlestick: Dict[str, float]
+
+    Returns:
+        Union[ITestDatasetLabel, None]
+    """
+    increase_price, decrease_price = PredictionModelAssets._get_exit_prices(price_change_requirement, pred_candlestick["o"])
+    for candlestick in Candlestick.DF[Candlestick.DF["ot"] > pred_candlestick["ot"]].to_records():
+        if candlestick["h"] >= increase_price:
+            return 1
+        elif candlestick["l"] <= decrease_price:
+            return -1
+    return None
+
+
+
+
+def _generate_labels(price_change_requirements: List[float]) -> ITestDatasetLabels:
+    """Generates the labels one prediction candlestick at a time, the way they used to be
+    generated.
+
+    Args:
+        price_change_requirements: List[float]
+
+    Returns:
+        ITestDatasetLabels
+    """
+    labels: ITestDatasetLabels = {}
+    for pcr in price_change_requirements:
+        labels[str(pcr)] = []
+        for pred_candlestick in Candlestick.PREDICTION_DF.iloc[Epoch.REGRESSION_LOOKBACK:].to_records():
+            label: Union[ITestDatasetLabel, None] = _get_label(pcr, pred_candlestick)
+            if label is None:
+                break
+            labels[str(pcr)].append(label)
+    return labels
+
+
+
+
+def _generate_lookback_indexer() -> List[int]:
+    """Generates the lookback indexer one 1m candlestick at a time, the way it used to
+    be generated.
+
+    Returns:
+        List[int]
+    """
+    return [
+        int(Candlestick.PREDICTION_DF[Candlestick.PREDICTION_DF["ot"] <= ot].iloc[-1:].index.values[0] - Epoch.REGRESSION_LOOKBACK)
+        for ot in Candlestick.DF["ot"].tolist()
+    ]
+
+
+
+
+
+
+# Test Class
+class PredictionModelAssetsTestCase(TestCase):
+    # Before Tests
+    def setUp(self):
+        # Isolate the epoch's files
+        self.epoch_path: EpochPath = Epoch.PATH
+        Epoch.PATH = EpochPath(mkdtemp())
+
+        # Init the synthetic candlesticks
+        self.df: DataFrame = Candlestick.DF
+        self.prediction_df: DataFrame = Candlestick.PREDICTION_DF
+        self.regression_lookback: int = Epoch.REGRESSION_LOOKBACK
+        Epoch.REGRESSION_LOOKBACK = LOOKBACK
+
+    # After Tests
+    def tearDown(self):
+        Utils.remove_directory(Epoch.PATH.epoch_id)
+        Epoch.PATH = self.epoch_path
+        Candlestick.DF = self.df
+        Candlestick.PREDICTION_DF = self.prediction_df
+        Epoch.REGRESSION_LOOKBACK = self.regression_lookback
+
+
+
+
+    # Can build the same labels as the candlestick by candlestick generation
+    def testLabelsMatchCandlestickByCandlestickGeneration(self):
+        for seed in range(3):
+            Candlestick.DF = make_candlesticks(seed, MINUTES, LARGE_WICKS_PROBABILITY)
+            Candlestick.PREDICTION_DF = make_prediction_candlesticks(Candlestick.DF)
+            expected: ITestDatasetLabels = _generate_labels(PRICE_CHANGE_REQUIREMENTS)
+            labels: ITestDatasetLabels = PredictionModelAssets._build_labels(PRICE_CHANGE_REQUIREMENTS)
+            self.assertListEqual(list(labels.keys()), list(expected.keys()))
+            for pcr in expected.keys():
+                self.assertListEqual(labels[pcr], expected[pcr])
+
+            # The largest requirements cannot be determined for every prediction candlestick
+            self.assertLess(len(labels["5"]), PREDICTION_CANDLESTICKS_NUM - LOOKBACK)
+
+
+
+
+    # Can build the labels when the increase and decrease prices are hit by the same candlestick
+    def testLabelsWhenBothPricesAreHitAtOnce(self):
+        Candlestick.DF = make_candlesticks(3, MINUTES, LARGE_WICKS_PROBABILITY)
+        Candlestick.PREDICTION_DF = make_prediction_candlesticks(Candlestick.DF)
+
+        # Every 1m candlestick hits both exit prices
+        Candlestick.DF["h"] = Candlestick.DF["h"] * 1.1
+        Candlestick.DF["l"] = Candlestick.DF["l"] * 0.9
+        labels: ITestDatasetLabels = PredictionModelAssets._build_labels([1])
+        self.assertListEqual(labels["1"], _generate_labels([1])["1"])
+        self.assertListEqual(labels["1"], [1] * (PREDICTION_CANDLESTICKS_NUM - LOOKBACK))
+
+
+
+
+    # Can build the same lookback indexer as the candlestick by candlestick generation
+    def testLookbackIndexerMatchesCandlestickByCandlestickGeneration(self):
+        Candlestick.DF = make_candlesticks(4, MINUTES, LARGE_WICKS_PROBABILITY)
+        Candlestick.PREDICTION_DF = make_prediction_candlesticks(Candlestick.DF)
+        self.assertListEqual(PredictionModelAssets._generate_lookback_indexer().tolist(), _generate_lookback_indexer())
+
+        # The 1m candlesticks may start in the middle of a prediction candlestick
+        Candlestick.DF = Candlestick.DF.iloc[7:].reset_index(drop=True)
+        self.assertListEqual(PredictionModelAssets._generate_lookback_indexer().tolist(), _generate_lookback_indexer())
+
+
+
+
+    # Cannot build the lookback indexer if a 1m candlestick opened before the first prediction candlestick
+    def testLookbackIndexerWithCandlesticksBeforeThePredictionCandlesticks(self):
+        Candlestick.DF = make_candlesticks(5, MINUTES, LARGE_WICKS_PROBABILITY)
+        Candlestick.PREDICTION_DF = make_prediction_candlesticks(Candlestick.DF).iloc[1:].reset_index(drop=True)
+        with self.assertRaises(ValueError):
+            PredictionModelAssets._generate_lookback_indexer()
+
+
+
+
+    # Can save the assets in the binary format and load them back
+    def testSaveAndLoadAssets(self):
+        Candlestick.DF = make_candlesticks(0, MINUTES, LARGE_WICKS_PROBABILITY)
+        Candlestick.PREDICTION_DF = make_prediction_candlesticks(Candlestick.DF)
+        features: ITestDatasetFeatures = dict(zip(REGRESSION_IDS, make_features(0, len(REGRESSION_IDS), FEATURES_NUM).tolist()))
+        labels: ITestDatasetLabels = PredictionModelAssets._build_labels(PRICE_CHANGE_REQUIREMENTS)
+        lookback_indexer: ndarray = PredictionModelAssets._generate_lookback_indexer()
+        PredictionModelAssets._save_assets(features, labels, Candlestick.DF["ot"].to_numpy(), lookback_indexer)
+        assets: PredictionModelAssets = PredictionModelAssets()
+
+        # The features are restored exactly from float32
+        self.assertListEqual(assets.feature_ids, list(features.keys()))
+        self.assertDictEqual(assets.feature_index, { id: i for i, id in enumerate(features.keys()) })
+        self.assertEqual(assets.features_num, FEATURES_NUM)
+        for i, id in enumerate(assets.feature_ids):
+            self.assertListEqual(assets.features_matrix[i].tolist(), features[id])
+
+        # The labels are padded with 0s up to the longest row and sliced by their number
+        labels_num: List[int] = [len(labels[pcr]) for pcr in labels.keys()]
+        self.assertGreater(max(labels_num), min(labels_num))
+        self.assertTupleEqual(assets.labels.shape, (len(PRICE_CHANGE_REQUIREMENTS), max(labels_num)))
+        self.assertListEqual(list(assets.labels_arrays.keys()), list(labels.keys()))
+        for i, pcr in enumerate(labels.keys()):
+            self.assertListEqual(assets.labels_arrays[pcr].tolist(), labels[pcr])
+            self.assertTrue((assets.labels[i, labels_num[i]:] == 0).all())
+
+        # The lookback indexer is aligned to the 1m candlesticks
+        self.assertListEqual(assets.lookback_indexer.tolist(), lookback_indexer.tolist())
+        Candlestick.DF = Candlestick.DF.iloc[1:].reset_index(drop=True)
+        with self.assertRaises(RuntimeError):
+            PredictionModelAssets()
+
+
+
+
+    # Can export the binary assets as JSON and convert them back
+    def testExportAndConvertJSONAssets(self):
+        Candlestick.DF = make_candlesticks(7, MINUTES, LARGE_WICKS_PROBABILITY)
+        Candlestick.PREDICTION_DF = make_prediction_candlesticks(Candlestick.DF)
+        features: ITestDatasetFeatures = dict(zip(REGRESSION_IDS, make_features(7, len(REGRESSION_IDS), FEATURES_NUM).tolist()))
+        labels: ITestDatasetLabels = PredictionModelAssets._build_labels(PRICE_CHANGE_REQUIREMENTS)
+        lookback_indexer: ndarray = PredictionModelAssets._generate_lookback_indexer()
+        PredictionModelAssets._save_assets(features, labels, Candlestick.DF["ot"].to_numpy(), lookback_indexer)
+
+        # Export the assets and make sure they match the originals
+        PredictionModelAssets.export_json()
+        self.assertDictEqual(Utils.read(Epoch.PATH.prediction_models_features()), features)
+        self.assertDictEqual(Utils.read(Epoch.PATH.prediction_models_labels()), labels)
+        indexer: ILookbackIndexer = Utils.read(Epoch.PATH.prediction_models_lookback_indexer())
+        self.assertListEqual(list(indexer.keys()), [str(ot) for ot in Candlestick.DF["ot"].tolist()])
+        self.assertListEqual(list(indexer.values()), lookback_indexer.tolist())
+
+        # Remove the binary assets and convert the JSON ones
+        Utils.remove_file(Epoch.PATH.prediction_models_assets_meta())
+        Utils.remove_file(Epoch.PATH.prediction_models_features_matrix())
+        with self.assertRaises(RuntimeError):
+            PredictionModelAssets()
+        PredictionModelAssets.convert_json()
+        assets: PredictionModelAssets = PredictionModelAssets()
+        self.assertDictEqual({ id: assets.features_matrix[i].tolist() for i, id in enumerate(assets.feature_ids) }, features)
+        self.assertDictEqual({ pcr: l.tolist() for pcr, l in assets.labels_arrays.items() }, labels)
+        self.assertListEqual(assets.lookback_indexer.tolist(), lookback_indexer.tolist())
+
+
+
+
+    # Cannot convert the JSON assets if they are missing or the lookback indexer is not aligned to the 1m candlesticks
+    def testConvertInvalidJSONAssets(self):
+        Candlestick.DF = make_candlesticks(8, MINUTES, LARGE_WICKS_PROBABILITY)
+        Candlestick.PREDICTION_DF = make_prediction_candlesticks(Candlestick.DF)
+        features: ITestDatasetFeatures = dict(zip(REGRESSION_IDS, make_features(8, len(REGRESSION_IDS), FEATURES_NUM).tolist()))
+        labels: ITestDatasetLabels = PredictionModelAssets._build_labels(PRICE_CHANGE_REQUIREMENTS)
+        indexer: ILookbackIndexer = {
+            str(ot): i for ot, i in zip(Candlestick.DF["ot"].tolist(), _generate_lookback_indexer())
+        }
+
+        # The labels are missing
+        Utils.write(Epoch.PATH.prediction_models_features(), features)
+        with self.assertRaises(RuntimeError):
+            PredictionModelAssets.convert_json()
+
+        # The indexer was built for a different range
+        _save_json_assets(features, labels, dict(list(indexer.items())[:-1]))
+        with self.assertRaises(RuntimeError):
+            PredictionModelAssets.convert_json()
+
+        # Once aligned, the assets can be converted
+        _save_json_assets(features, labels, indexer)
+        PredictionModelAssets.convert_json()
+        self.assertListEqual(PredictionModelAssets().lookback_indexer.tolist(), list(indexer.values()))
+
+
+
+
+
+
+
+# Test Execution
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+from typing import List, Union
+from unittest import TestCase, main
+from numpy import ndarray, full
+from modules._types import IBacktestPerformance, IBacktestPosition
+from modules.utils.Utils import Utils
+from modules.epoch.Epoch import Epoch
+from modules.prediction_model.PredictionModelBacktest import PredictionModelBacktest
+from tests.synthetic_data import MINUTES_PER_PREDICTION_CANDLESTICK, make_backtest_candlesticks, \
+    make_random_backtest_candlesticks, make_features
+
+
+
+
+
+## Helpers ##
+
+
+
+# Synthetic Dataset
+FEATURES_NUM: int = 600
+
+
+
+def _largest_balance_drawdown(initial_balance: float, positions: List[IBacktestPosition]) -> float:
+    """Calculates the largest balance drawdown by comparing each balance against the
+    smallest of the following ones, the way it used to be calculated.
+
+    Args:
+        initial_balance: float
+        positions: List[IBacktestPosition]
+
+    Returns:
+        float
+    """
+    balance_hist: List[float] = [initial_balance] + [pos["b"] for pos in positions]
+    if len(balance_hist) == 1:
+        return 0
+    return min(Utils.get_percentage_change(balance_hist[i], min(balance_hist[i+1:])) for i in range(len(balance_hist) - 1))
+
+
+
+
+
+# Test Class
+class PredictionModelBacktestTestCase(TestCase):
+    # Before Tests
+    def setUp(self):
+        self.idle_minutes: int = Epoch.IDLE_MINUTES_ON_POSITION_CLOSE
+        self.close_search_block: int = PredictionModelBacktest.CLOSE_SEARCH_BLOCK
+
+    # After Tests
+    def tearDown(self):
+        Epoch.IDLE_MINUTES_ON_POSITION_CLOSE = self.idle_minutes
+        PredictionModelBacktest.CLOSE_SEARCH_BLOCK = self.close_search_block
+
+
+
+
+    def _assert_modes_match(
+        self,
+        candlesticks: ndarray,
+        price_change_requirement: float,
+        min_increase_sum: float,
+        min_decrease_sum: float,
+        features: List[List[float]]
+    ) -> Union[IBacktestPosition, None]:
+        """Backtests a model in both modes and asserts that the results are identical.
+
+        Returns:
+            Union[IBacktestPosition, None]
+            The position that was still active when the backtest ended.
+        """
+        # Init the sums
+        features_sum: List[float] = [sum(feature_list) for feature_list in features]
+
+        # Backtest the model on every candlestick
+        per_minute: PredictionModelBacktest = PredictionModelBacktest(len(features), candlesticks, event_driven=False)
+        expected: IBacktestPerformance = per_minute.calculate_performance(
+            price_change_requirement, min_increase_sum, min_decrease_sum, features, features_sum
+        )
+
+        # Backtest the model from one signal to the next
+        event_driven: PredictionModelBacktest = PredictionModelBacktest(len(features), candlesticks, event_driven=True)
+        performance: IBacktestPerformance = event_driven.calculate_performance(
+            price_change_requirement, min_increase_sum, min_decrease_sum, features, features_sum
+        )
+
+        # Compare the positions, the balances and the active position
+        self.assertListEqual(performance["positions"], expected["positions"])
+        self.assertDictEqual(performance, expected)
+        self.assertEqual(event_driven.current_balance, per_minute.current_balance)
+        self.assertEqual(event_driven.active, per_minute.active)
+
+        # Compare the drawdown
+        self.assertEqual(
+            PredictionModelBacktest.calculate_largest_balance_drawdown(performance["initial_balance"], performance["positions"]),
+            _largest_balance_drawdown(expected["initial_balance"], expected["positions"])
+        )
+        return event_driven.active
+
+
+
+
+    # Can backtest random models in both modes without idle minutes
+    def testRandomModelsWithoutIdleMinutes(self):
+        Epoch.IDLE_MINUTES_ON_POSITION_CLOSE = 0
+        candlesticks: ndarray = make_random_backtest_candlesticks(1, FEATURES_NUM)
+        for seed in range(5):
+            features: List[List[float]] = make_features(seed, 4, FEATURES_NUM).T.tolist()
+            self._assert_modes_match(candlesticks, 1, 0, 0, features)
+            self._assert_modes_match(candlesticks, 2, 0.5, -0.5, features)
+
+
+
+
+    # Can backtest random models in both modes with idle minutes
+    def testRandomModelsWithIdleMinutes(self):
+        candlesticks: ndarray = make_random_backtest_candlesticks(2, FEATURES_NUM)
+        for idle_minutes in [1, 37, 180]:
+            Epoch.IDLE_MINUTES_ON_POSITION_CLOSE = idle_minutes
+            for seed in range(3):
+                features: List[List[float]] = make_features(seed, 4, FEATURES_NUM).T.tolist()
+                self._assert_modes_match(candlesticks, 1, 0, 0, features)
+                self._assert_modes_match(candlesticks, 2, 0.5, -0.5, features)
+
+
+
+
+    # Can backtest random models in both modes when the close search spans several blocks
+    def testRandomModelsWithSmallCloseSearchBlocks(self):
+        PredictionModelBacktest.CLOSE_SEARCH_BLOCK = 2
+        candlesticks: ndarray = make_random_backtest_candlesticks(3, FEATURES_NUM)
+        for idle_minutes in [0, 180]:
+            Epoch.IDLE_MINUTES_ON_POSITION_CLOSE = idle_minutes
+            for seed in range(3):
+                self._assert_modes_match(candlesticks, 3, 0, 0, make_features(seed, 4, FEATURES_NUM).T.tolist())
+
+
+
+
+    # Can backtest a model whose position is still open when the data runs out
+    def testPositionOpenAtTheEnd(self):
+        Epoch.IDLE_MINUTES_ON_POSITION_CLOSE = 0
+        candlesticks: ndarray = make_random_backtest_candlesticks(4, FEATURES_NUM)
+        active: Union[IBacktestPosition, None] = self._assert_modes_match(candlesticks, 90, 0, 0, make_features(5, 4, FEATURES_NUM).T.tolist())
+        self.assertIsNotNone(active)
+
+
+
+
+    # Can backtest a model whose position is closed beyond the first blocks of the close search
+    def testCloseSearchBeyondTheFirstBlocks(self):
+        Epoch.IDLE_MINUTES_ON_POSITION_CLOSE = 0
+        block: int = PredictionModelBacktest.CLOSE_SEARCH_BLOCK
+
+        # Init flat prices that hit the take profit of a long right after the first 2 blocks
+        minutes: int = FEATURES_NUM * MINUTES_PER_PREDICTION_CANDLESTICK
+        c: ndarray = full(minutes, 30000.0)
+        h: ndarray = full(minutes, 30001.0)
+        l: ndarray = full(minutes, 29999.0)
+        close_minute: int = 6 * MINUTES_PER_PREDICTION_CANDLESTICK + block + block * 2 + 5
+        h[close_minute] = 31000.0
+
+        # The sums increase strongly on the first indexes, then remain neutral
+        features: List[List[float]] = [[0.1 * (i + 1)] if i < 7 else [0] for i in range(FEATURES_NUM)]
+
+        # The position is opened on the index 6 and closed on the expected minute
+        candlesticks: ndarray = make_backtest_candlesticks(c, h, l)
+        self._assert_modes_match(candlesticks, 3, 0, 0, features)
+        performance: IBacktestPerformance = PredictionModelBacktest(FEATURES_NUM, candlesticks).calculate_performance(
+            3, 0, 0, features, [sum(f) for f in features]
+        )
+        self.assertEqual(len(performance["positions"]), 1)
+        self.assertEqual(performance["positions"][0]["ot"], int(candlesticks[6 * MINUTES_PER_PREDICTION_CANDLESTICK]["ot"]))
+        self.assertEqual(performance["positions"][0]["ct"], int(candlesticks[close_minute]["ct"]))
+
+
+
+
+
+
+
+
+# Test Execution
+if __name__ == '__main__':
+    main()
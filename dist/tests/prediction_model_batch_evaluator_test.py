@@ -0,0 +1,222 @@
+from typing import List, Dict, Tuple
+from unittest import TestCase, main
+from tempfile import mkdtemp
+from numpy import ndarray
+from modules._types import IPredictionModelMinifiedConfig, IDiscovery, IBacktestPerformance
+from modules.utils.Utils import Utils
+from modules.epoch.Epoch import Epoch
+from modules.epoch.EpochPath import EpochPath
+from modules.prediction_model.PredictionModelConfigSpace import PredictionModelConfigSpace
+from modules.prediction_model.PredictionModelDiscovery import PredictionModelDiscovery
+from modules.prediction_model.PredictionModelBacktest import PredictionModelBacktest
+from modules.prediction_model.PredictionModelBatchEvaluator import PredictionModelBatchEvaluator
+from modules.prediction_model.ProfitableConfigsJournal import ProfitableConfigsJournal
+from tests.synthetic_data import make_regression_ids, make_features, make_labels, make_random_backtest_candlesticks
+
+
+
+
+
+## Helpers ##
+
+
+
+# Synthetic Dataset
+REGRESSION_IDS: List[str] = make_regression_ids(6)
+FEATURES_NUM: int = 400
+
+
+
+def _evaluate_per_config(
+    features: ndarray,
+    labels: Dict[str, ndarray],
+    candlesticks: ndarray,
+    configs: List[IPredictionModelMinifiedConfig]
+) -> List[Tuple[float, float]]:
+    """Evaluates each configuration one by one the way the prediction models used to be
+    evaluated: discovery of the features sums, min sums and per minute backtest.
+
+    Args:
+        features: ndarray
+        labels: Dict[str, ndarray]
+        candlesticks: ndarray
+            The synthetic dataset.
+        configs: List[IPredictionModelMinifiedConfig]
+            The configurations to be evaluated.
+
+    Returns:
+        List[Tuple[float, float]]
+        (accuracy, profit) of each configuration.
+    """
+    backtest: PredictionModelBacktest = PredictionModelBacktest(FEATURES_NUM, candlesticks, event_driven=False)
+    results: List[Tuple[float, float]] = []
+    for config in configs:
+        # Build the features and their sums
+        model_features: List[List[float]] = features[[REGRESSION_IDS.index(id) for id in config["ri"]]].T.tolist()
+        features_sum: List[float] = [sum(feature_list) for feature_list in model_features]
+
+        # Discover the model and calculate the min sums
+        disc: IDiscovery = PredictionModelDiscovery().discover(features_sum, labels[str(config["pcr"])].tolist())
+        min_increase_sum: float = disc["increase_successful_mean"] if config["msf"] == "mean" else disc["increase_successful_median"]
+        min_decrease_sum: float = disc["decrease_successful_mean"] if config["msf"] == "mean" else disc["decrease_successful_median"]
+
+        # Backtest the model
+        performance: IBacktestPerformance = backtest.calculate_performance(
+            price_change_requirement=config["pcr"],
+            min_increase_sum=round(min_increase_sum*config["msaf"], 6),
+            min_decrease_sum=round(min_decrease_sum*config["msaf"], 6),
+            features=model_features,
+            features_sum=features_sum
+        )
+        results.append((performance["accuracy"], performance["profit"]))
+    return results
+
+
+
+
+def _is_profitable(result: Tuple[float, float]) -> bool:
+    """Checks if a configuration's result meets the evaluator's requirements.
+
+    Args:
+        result: Tuple[float, float]
+            The (accuracy, profit) of the configuration.
+
+    Returns:
+        bool
+    """
+    return result[0] >= PredictionModelBatchEvaluator.MIN_ACCURACY and result[1] > 0
+
+
+
+
+
+# Test Class
+class PredictionModelBatchEvaluatorTestCase(TestCase):
+    # Before All Tests
+    # The synthetic dataset and the per config evaluation are built only once
+    @classmethod
+    def setUpClass(cls):
+        # Init the configuration space
+        cls.space = PredictionModelConfigSpace(PredictionModelConfigSpace.describe(
+            regression_ids=REGRESSION_IDS,
+            price_change_requirements=[1, 2],
+            min_sum_functions=["mean", "median"],
+            min_sum_adjustment_factors=[1, 1.5],
+            regressions_per_model=[2, 3],
+            seed=Epoch.SEED
+        ))
+
+        # Init the synthetic dataset and the evaluator
+        cls.features = make_features(1, len(REGRESSION_IDS), FEATURES_NUM)
+        cls.labels = make_labels(2, cls.space.price_change_requirements, FEATURES_NUM - 4)
+        cls.candlesticks = make_random_backtest_candlesticks(3, FEATURES_NUM)
+        cls.evaluator = PredictionModelBatchEvaluator(
+            REGRESSION_IDS, cls.features, cls.labels, cls.candlesticks
+        )
+
+        # Evaluate the entire space one config at a time
+        cls.results = _evaluate_per_config(
+            cls.features, cls.labels, cls.candlesticks, cls.space.decode_range(0, cls.space.size)
+        )
+        cls.profitable = [i for i, result in enumerate(cls.results) if _is_profitable(result)]
+
+    # Before Tests
+    def setUp(self):
+        # Isolate the epoch's files
+        self.epoch_path: EpochPath = Epoch.PATH
+        Epoch.PATH = EpochPath(mkdtemp())
+        self.min_accuracy: float = PredictionModelBatchEvaluator.MIN_ACCURACY
+
+    # After Tests
+    def tearDown(self):
+        Utils.remove_directory(Epoch.PATH.epoch_id)
+        Epoch.PATH = self.epoch_path
+        PredictionModelBatchEvaluator.MIN_ACCURACY = self.min_accuracy
+
+
+
+
+    # The synthetic dataset produces profitable and unprofitable configurations
+    def testSyntheticDatasetIntegrity(self):
+        self.assertGreater(len(self.profitable), 0)
+        self.assertLess(len(self.profitable), self.space.size)
+
+        # Some configurations are only discarded because of their accuracy
+        self.assertTrue(any(r[1] > 0 and r[0] < PredictionModelBatchEvaluator.MIN_ACCURACY for r in self.results))
+
+
+
+
+    # Can evaluate the space in chunks and find the same configurations as the per config evaluation
+    def testEvaluateMatchesPerConfigEvaluation(self):
+        profitable: List[int] = []
+        self.evaluator.evaluate(self.space, 0, self.space.size, 1, profitable.append)
+        self.assertListEqual(profitable, self.profitable)
+
+
+
+
+    # Can evaluate the space across workers and find the same configurations in the same order
+    def testEvaluateWithWorkers(self):
+        profitable: List[int] = []
+        self.evaluator.evaluate(self.space, 0, self.space.size, 2, profitable.append)
+        self.assertListEqual(profitable, self.profitable)
+
+
+
+
+    # Can evaluate a range of the space
+    def testEvaluateRange(self):
+        profitable: List[int] = []
+        self.evaluator.evaluate(self.space, 37, 201, 1, profitable.append)
+        self.assertListEqual(profitable, [i for i in self.profitable if i >= 37 and i < 201])
+
+
+
+
+    # Can apply the minimum accuracy filter
+    def testMinAccuracyFilter(self):
+        PredictionModelBatchEvaluator.MIN_ACCURACY = 0
+        profitable: List[int] = []
+        self.evaluator.evaluate(self.space, 0, self.space.size, 1, profitable.append)
+        self.assertListEqual(profitable, [i for i, result in enumerate(self.results) if result[1] > 0])
+        self.assertGreater(len(profitable), len(self.profitable))
+
+
+
+
+    # Can resume an evaluation from the journal without skipping or repeating configurations
+    def testJournalResume(self):
+        # A new journal starts from the beginning of the batch
+        journal: ProfitableConfigsJournal = ProfitableConfigsJournal("_SYNTHETIC_1_1.json")
+        self.assertEqual(journal.get_start_index(0), 0)
+
+        # Interrupt the evaluation right after the first profitable config is found
+        journal.save_profitable_config(self.profitable[0])
+        journal = ProfitableConfigsJournal("_SYNTHETIC_1_1.json")
+        self.assertListEqual(journal.indexes, self.profitable[:1])
+        self.assertEqual(journal.get_start_index(0), self.profitable[0] + 1)
+
+        # Resume the evaluation
+        self.evaluator.evaluate(self.space, journal.get_start_index(0), self.space.size, 1, journal.save_profitable_config)
+        self.assertListEqual(journal.indexes, self.profitable)
+
+        # A journal that was interrupted on index 0 resumes from index 1
+        journal.clear_journal()
+        journal = ProfitableConfigsJournal("_SYNTHETIC_1_1.json")
+        journal.save_profitable_config(0)
+        self.assertEqual(ProfitableConfigsJournal("_SYNTHETIC_1_1.json").get_start_index(0), 1)
+
+        # A journal of a different batch is ignored
+        self.assertEqual(ProfitableConfigsJournal("_SYNTHETIC_1_2.json").get_start_index(0), 0)
+
+
+
+
+
+
+
+
+# Test Execution
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+from typing import List, Set, Tuple
+from unittest import TestCase, main
+from tempfile import mkdtemp
+from itertools import combinations
+from numpy import ndarray, arange, uint64
+from modules._types import IPredictionModelMinifiedConfig, IPredictionModelConfigBatch
+from modules.utils.Utils import Utils
+from modules.epoch.Epoch import Epoch
+from modules.epoch.EpochPath import EpochPath
+from modules.prediction_model.PredictionModelConfigSpace import PredictionModelConfigSpace
+from modules.prediction_model.PredictionModelConfig import PredictionModelConfig
+from modules.prediction_model.ProfitableConfigsJournal import ProfitableConfigsJournal
+from tests.synthetic_data import make_regression_ids
+
+
+
+
+
+
+## Helpers ##
+
+
+
+# Synthetic Regressions
+REGRESSION_IDS: List[str] = make_regression_ids(7)
+
+
+
+def _make_space(regressions_per_model: List[int], seed: int = Epoch.SEED) -> PredictionModelConfigSpace:
+    """Builds a small configuration space.
+
+    Args:
+        regressions_per_model: List[int]
+            The number of regressions per model.
+        seed: int
+            The seed of the permutation.
+
+    Returns:
+        PredictionModelConfigSpace
+    """
+    return PredictionModelConfigSpace(PredictionModelConfigSpace.describe(
+        regression_ids=REGRESSION_IDS,
+        price_change_requirements=[1, 2, 3],
+        min_sum_functions=["mean", "median"],
+        min_sum_adjustment_factors=[1, 1.5],
+        regressions_per_model=regressions_per_model,
+        seed=seed
+    ))
+
+
+
+
+def _materialize(space: PredictionModelConfigSpace) -> Set[Tuple]:
+    """Builds all the configurations of a space by nesting the hyperparameters, the way
+    they used to be generated.
+
+    Args:
+        space: PredictionModelConfigSpace
+            The configuration space.
+
+    Returns:
+        Set[Tuple]
+    """
+    return {
+        (pcr, msf, msaf, ri)
+        for pcr in space.price_change_requirements
+        for msf in space.min_sum_functions
+        for msaf in space.min_sum_adjustment_factors
+        for rpm in space.regressions_per_model
+        for ri in combinations(space.regression_ids, rpm)
+    }
+
+
+
+
+def _to_tuple(config: IPredictionModelMinifiedConfig) -> Tuple:
+    """Converts a configuration into a hashable tuple.
+
+    Args:
+        config: IPredictionModelMinifiedConfig
+
+    Returns:
+        Tuple
+    """
+    return (config["pcr"], config["msf"], config["msaf"], tuple(config["ri"]))
+
+
+
+
+
+
+# Test Class
+class PredictionModelConfigSpaceTestCase(TestCase):
+    # Before Tests
+    def setUp(self):
+        # Isolate the epoch's files
+        self.epoch_path: EpochPath = Epoch.PATH
+        Epoch.PATH = EpochPath(mkdtemp())
+        self.regressions_per_model: List[int] = PredictionModelConfig.REGRESSIONS_PER_MODEL
+
+    # After Tests
+    def tearDown(self):
+        Utils.remove_directory(Epoch.PATH.epoch_id)
+        Epoch.PATH = self.epoch_path
+        PredictionModelConfig.REGRESSIONS_PER_MODEL = self.regressions_per_model
+
+
+
+
+    # Can permute the positions of the space with a bijection, even when the values need to be cycle walked
+    def testPermutationIsABijection(self):
+        walked_spaces: int = 0
+        for regressions_per_model in [[1], [2], [3], [2, 3], [1, 2, 3, 4, 5, 6, 7]]:
+            for seed in [Epoch.SEED, 1, 2]:
+                space: PredictionModelConfigSpace = _make_space(regressions_per_model, seed)
+                positions: ndarray = arange(space.size, dtype=uint64)
+                permuted: ndarray = space._permute(positions.copy())
+                self.assertListEqual(sorted(permuted.tolist()), positions.tolist())
+                self.assertListEqual(space._permute(permuted.copy(), inverse=True).tolist(), positions.tolist())
+
+                # Count the spaces that are smaller than the network's domain, meaning that values are walked
+                walked_spaces += int((1 << (space.half_bits * 2)) > space.size)
+        self.assertGreater(walked_spaces, 0)
+
+        # The configurations are shuffled
+        space = _make_space([2, 3])
+        self.assertNotEqual(space._permute(arange(space.size, dtype=uint64)).tolist(), list(range(space.size)))
+
+
+
+
+    # Can decode every configuration of the space once and encode it back into its index
+    def testDecodeAndEncode(self):
+        for regressions_per_model in [[1], [3], [2, 3], [1, 2, 3, 4, 5, 6, 7]]:
+            space: PredictionModelConfigSpace = _make_space(regressions_per_model)
+            configs: List[IPredictionModelMinifiedConfig] = space.decode_range(0, space.size)
+            self.assertEqual(len(configs), space.size)
+            self.assertSetEqual({_to_tuple(config) for config in configs}, _materialize(space))
+            for i, config in enumerate(configs):
+                self.assertEqual(space.encode(config), i)
+
+            # The indexes can be decoded in any order
+            indexes: List[int] = list(range(space.size - 1, -1, -3))
+            self.assertListEqual(space.decode(indexes), [configs[i] for i in indexes])
+
+        # The indexes must be within the space
+        with self.assertRaises(ValueError):
+            space.decode([space.size])
+        with self.assertRaises(ValueError):
+            space.decode([-1])
+
+
+
+
+    # Can split the space into batches with no gaps or overlaps and reject the batches generated by a previous version
+    def testBatchesCoverTheSpace(self):
+        PredictionModelConfig.REGRESSIONS_PER_MODEL = [2, 3]
+        for batch_size in [1, 7, 100, 10000]:
+            PredictionModelConfig.create(REGRESSION_IDS, batch_size)
+            space: PredictionModelConfigSpace = PredictionModelConfig.get_space()
+
+            # Retrieve the batches in order
+            _, batch_files = Utils.get_directory_content(Epoch.PATH.prediction_models_configs(), only_file_ext=".json")
+            batch_files = sorted(batch_files, key=lambda file_name: int(file_name.split("_")[-2]))
+            batches: List[IPredictionModelConfigBatch] = [PredictionModelConfig.get_batch(file) for file in batch_files]
+
+            # Make sure they are contiguous
+            self.assertEqual(batches[0]["start"], 0)
+            self.assertEqual(batches[-1]["end"], space.size)
+            for previous, batch in zip(batches[:-1], batches[1:]):
+                self.assertEqual(batch["start"], previous["end"])
+            self.assertTrue(all(0 < batch["end"] - batch["start"] <= batch_size for batch in batches))
+            Utils.remove_directory(Epoch.PATH.prediction_models_configs())
+
+
+        # Batches that hold configurations cannot be retrieved
+        Utils.write(Epoch.PATH.prediction_models_configs("_SYNTHETIC_1_1.json"), space.decode([0, 1]))
+        with self.assertRaises(RuntimeError):
+            PredictionModelConfig.get_batch("_SYNTHETIC_1_1.json")
+
+
+
+
+    # Can resume the evaluation of a batch from the journal without skipping configurations
+    def testJournalResume(self):
+        batch: IPredictionModelConfigBatch = { "start": 40, "end": 80 }
+        profitable: List[int] = [40, 41, 47, 60, 61, 79]
+
+        # Interrupt the evaluation on every index of the batch
+        for interrupted_at in range(batch["start"], batch["end"]):
+            # Evaluate the batch until the interruption
+            journal: ProfitableConfigsJournal = ProfitableConfigsJournal("_SYNTHETIC_2_3.json")
+            evaluated: List[int] = list(range(journal.get_start_index(batch["start"]), interrupted_at + 1))
+            for index in evaluated:
+                if index in profitable:
+                    journal.save_profitable_config(index)
+
+            # Resume the evaluation
+            journal = ProfitableConfigsJournal("_SYNTHETIC_2_3.json")
+            resumed: List[int] = list(range(journal.get_start_index(batch["start"]), batch["end"]))
+            for index in resumed:
+                if index in profitable:
+                    journal.save_profitable_config(index)
+
+            # Every configuration was evaluated and every profitable one was found once
+            self.assertSetEqual(set(evaluated) | set(resumed), set(range(batch["start"], batch["end"])))
+            self.assertListEqual(journal.indexes, profitable)
+            journal.clear_journal()
+
+
+
+
+    # Can retrieve the profitable configurations and reject the files generated by a previous version
+    def testProfitableConfigs(self):
+        PredictionModelConfig.REGRESSIONS_PER_MODEL = [2, 3]
+        PredictionModelConfig.create(REGRESSION_IDS)
+        space: PredictionModelConfigSpace = PredictionModelConfig.get_space()
+
+        # Save the indexes of 2 batches
+        PredictionModelConfig.save_profitable_configs("_SYNTHETIC_1_2.json", [3, 8])
+        PredictionModelConfig.save_profitable_configs("_SYNTHETIC_2_2.json", [150])
+        configs: List[IPredictionModelMinifiedConfig] = PredictionModelConfig.get_profitable_configs()
+        self.assertListEqual(sorted(configs, key=space.encode), space.decode([3, 8, 150]))
+
+        # Files that hold configurations cannot be decoded
+        PredictionModelConfig.save_profitable_configs("_SYNTHETIC_2_2.json", space.decode([150]))
+        with self.assertRaises(RuntimeError):
+            PredictionModelConfig.get_profitable_configs()
+
+
+
+
+
+
+
+# Test Execution
+if __name__ == '__main__':
+    main()
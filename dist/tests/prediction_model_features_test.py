@@ -0,0 +1,256 @@
+from typing import List, Dict
+from unittest import TestCase, main
+from sys import modules
+from tempfile import mkdtemp
+from numpy import ndarray, arange, around, exp, cumsum, sin, concatenate, float64
+from numpy.random import RandomState
+from pandas import DataFrame
+from modules._types import IRegressionConfig, ITestDatasetFeatures
+from modules.utils.Utils import Utils
+from modules.epoch.Epoch import Epoch
+from modules.epoch.EpochPath import EpochPath
+from modules.candlestick.Candlestick import Candlestick
+from modules.regression.Regression import Regression
+from modules.prediction_model.PredictionModelFeatures import PredictionModelFeatures
+from tests.synthetic_data import make_regression_ids
+
+
+
+
+
+
+## Helpers ##
+
+
+
+# Synthetic Regressions
+REGRESSION_IDS: List[str] = make_regression_ids(3)
+
+# The regressions that have been predicted
+PREDICTED_IDS: List[str] = []
+
+
+
+class _SyntheticModel:
+    """Replaces the Keras model of a regression. The predicted prices are a deterministic
+    oscillation around the last price of the input.
+    """
+    def predict(self, features: ndarray, verbose: int = 0) -> ndarray:
+        changes: ndarray = 1 + sin(arange(features.shape[0]))[:, None] / 50
+        return concatenate([features[:, -1:] * changes] * Epoch.REGRESSION_PREDICTIONS, axis=1)
+
+
+
+
+class _SyntheticRegression(Regression):
+    """Regression that predicts through the synthetic model instead of loading a trained
+    one. It records the regressions that were predicted.
+    """
+    def __init__(self, id: str):
+        self.id: str = id
+        self.model: _SyntheticModel = _SyntheticModel()
+        PREDICTED_IDS.append(id)
+
+    def get_config(self) -> IRegressionConfig:
+        return { "id": self.id }
+
+
+
+
+def _make_normalized_prediction_candlesticks(rows: int) -> DataFrame:
+    """Builds the normalized prediction candlesticks based on a random walk.
+
+    Args:
+        rows: int
+            The number of candlesticks.
+
+    Returns:
+        DataFrame
+    """
+    ot: ndarray = 1609459200000 + arange(rows) * 900000
+    return DataFrame({
+        "ot": ot,
+        "ct": ot + 899999,
+        "c": around(exp(cumsum(RandomState(1).normal(0, 0.01, rows))), 6)
+    })
+
+
+
+
+def _normalize_feature(current_price: float, predicted_price: float) -> float:
+    """Calculates a feature one prediction at a time, the way they used to be calculated.
+
+    Args:
+        current_price: float
+        predicted_price: float
+
+    Returns:
+        float
+    """
+    # Calculate the change
+    change: float = Utils.get_percentage_change(current_price, predicted_price)
+
+    # Adjust it to the min and max values
+    if change >= Regression.MIN_FEATURE_VALUE and change <= Regression.MAX_FEATURE_VALUE:
+        adjusted_change: float = change
+    elif change > Regression.MAX_FEATURE_VALUE:
+        adjusted_change = Regression.MAX_FEATURE_VALUE
+    elif change >= -(Regression.MAX_FEATURE_VALUE) and change <= -(Regression.MIN_FEATURE_VALUE):
+        adjusted_change = change
+    elif change < -(Regression.MAX_FEATURE_VALUE):
+        adjusted_change = -(Regression.MAX_FEATURE_VALUE)
+    else:
+        adjusted_change = 0
+
+    # Scale it
+    scale = lambda value: round((value - Regression.MIN_FEATURE_VALUE) / (Regression.MAX_FEATURE_VALUE - Regression.MIN_FEATURE_VALUE), 6)
+    if adjusted_change > 0:
+        return scale(adjusted_change)
+    elif adjusted_change < 0:
+        return -(scale(-(adjusted_change)))
+    else:
+        return 0
+
+
+
+
+
+
+# Test Class
+class PredictionModelFeaturesTestCase(TestCase):
+    # Before Tests
+    def setUp(self):
+        # Isolate the epoch's files
+        self.epoch_path: EpochPath = Epoch.PATH
+        Epoch.PATH = EpochPath(mkdtemp())
+
+        # Init the synthetic candlesticks and regressions
+        self.normalized_prediction_df: DataFrame = Candlestick.NORMALIZED_PREDICTION_DF
+        Candlestick.NORMALIZED_PREDICTION_DF = _make_normalized_prediction_candlesticks(Epoch.REGRESSION_LOOKBACK + 400)
+        self.regression = modules[PredictionModelFeatures.__module__].Regression
+        modules[PredictionModelFeatures.__module__].Regression = _SyntheticRegression
+        for id in REGRESSION_IDS:
+            Utils.write(Epoch.PATH.regression_model(id), f"{id}_MODEL")
+        PREDICTED_IDS.clear()
+
+    # After Tests
+    def tearDown(self):
+        Utils.remove_directory(Epoch.PATH.epoch_id)
+        Epoch.PATH = self.epoch_path
+        Candlestick.NORMALIZED_PREDICTION_DF = self.normalized_prediction_df
+        modules[PredictionModelFeatures.__module__].Regression = self.regression
+
+
+
+
+    # Can predict the features and skip the ones that have been cached
+    def testCachedFeaturesAreSkipped(self):
+        features: ITestDatasetFeatures = PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+        self.assertListEqual(PREDICTED_IDS, REGRESSION_IDS)
+        self.assertListEqual(list(features.keys()), REGRESSION_IDS)
+        self.assertEqual(len(features[REGRESSION_IDS[0]]), 400 - Epoch.REGRESSION_PREDICTIONS)
+
+        # The second run loads every regression from the cache
+        PREDICTED_IDS.clear()
+        self.assertDictEqual(PredictionModelFeatures.generate(REGRESSION_IDS, workers=1), features)
+        self.assertListEqual(PREDICTED_IDS, [])
+
+        # Only the regressions that were not requested before are predicted
+        self.assertDictEqual(PredictionModelFeatures.generate(REGRESSION_IDS[:2], workers=1), { id: features[id] for id in REGRESSION_IDS[:2] })
+        self.assertListEqual(PREDICTED_IDS, [])
+
+
+
+
+    # Can invalidate the cache when the model of a regression changes
+    def testCacheInvalidationByModelHash(self):
+        PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+        PREDICTED_IDS.clear()
+        Utils.write(Epoch.PATH.regression_model(REGRESSION_IDS[1]), f"{REGRESSION_IDS[1]}_RETRAINED_MODEL")
+        PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+        self.assertListEqual(PREDICTED_IDS, [REGRESSION_IDS[1]])
+
+        # The configs are read from the cache as long as it is valid
+        configs: Dict[str, IRegressionConfig] = PredictionModelFeatures.get_regression_configs(REGRESSION_IDS)
+        self.assertDictEqual(configs, { id: { "id": id } for id in REGRESSION_IDS })
+        self.assertListEqual(PREDICTED_IDS, [REGRESSION_IDS[1]])
+
+
+
+
+    # Can hash each model file once and hash it again only when it changes
+    def testModelHashIsReused(self):
+        hashed_paths: List[str] = []
+        get_file_hash = Utils.get_file_hash
+        def _get_file_hash(path: str) -> str:
+            hashed_paths.append(path)
+            return get_file_hash(path)
+        Utils.get_file_hash = staticmethod(_get_file_hash)
+        try:
+            PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+            PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+            PredictionModelFeatures.get_regression_configs(REGRESSION_IDS)
+            self.assertListEqual(hashed_paths, [Epoch.PATH.regression_model(id) for id in REGRESSION_IDS])
+
+            # A retrained model is hashed again
+            Utils.write(Epoch.PATH.regression_model(REGRESSION_IDS[0]), f"{REGRESSION_IDS[0]}_RETRAINED_MODEL")
+            PredictionModelFeatures.get_regression_configs(REGRESSION_IDS)
+            self.assertListEqual(hashed_paths[len(REGRESSION_IDS):], [Epoch.PATH.regression_model(REGRESSION_IDS[0])])
+        finally:
+            Utils.get_file_hash = staticmethod(get_file_hash)
+
+
+
+
+    # Can invalidate the cache when the range of the input dataset changes
+    def testCacheInvalidationByInputRange(self):
+        features: ITestDatasetFeatures = PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+        PREDICTED_IDS.clear()
+
+        # Extend the candlesticks
+        Candlestick.NORMALIZED_PREDICTION_DF = _make_normalized_prediction_candlesticks(Epoch.REGRESSION_LOOKBACK + 450)
+        extended_features: ITestDatasetFeatures = PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+        self.assertListEqual(PREDICTED_IDS, REGRESSION_IDS)
+        for id in REGRESSION_IDS:
+            self.assertEqual(len(extended_features[id]), 450 - Epoch.REGRESSION_PREDICTIONS)
+            self.assertListEqual(extended_features[id][:len(features[id])], features[id])
+
+        # A missing features file is predicted again
+        PREDICTED_IDS.clear()
+        Utils.remove_file(Epoch.PATH.prediction_models_features_cache(REGRESSION_IDS[2]))
+        PredictionModelFeatures.generate(REGRESSION_IDS, workers=1)
+        self.assertListEqual(PREDICTED_IDS, [REGRESSION_IDS[2]])
+
+
+
+
+    # Can normalize the features in a vectorized manner the same way they were normalized one by one
+    def testNormalizeFeatures(self):
+        rs: RandomState = RandomState(1)
+        current_prices: ndarray = around(rs.uniform(0, 2, 20000), 6)
+        predicted_prices: ndarray = around(current_prices * (1 + rs.normal(0, 0.008, 20000)), 6)
+
+        # Include equal, zero and extreme prices
+        predicted_prices[:500] = current_prices[:500]
+        current_prices[500:600] = 0
+        predicted_prices[600:700] = current_prices[600:700] * 3
+        predicted_prices[700:800] = 0
+        predicted_prices[800:900] = around(current_prices[800:900] * 1.0001, 6)
+
+        # Compare the features
+        features: ndarray = Regression.normalize_features(current_prices, predicted_prices.astype(float64))
+        self.assertListEqual(
+            features.tolist(),
+            [_normalize_feature(c, p) for c, p in zip(current_prices.tolist(), predicted_prices.tolist())]
+        )
+        self.assertTrue((features >= -1).all() and (features <= 1).all())
+
+
+
+
+
+
+
+# Test Execution
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+from typing import List, Union
+from unittest import TestCase, main
+from sys import modules, executable
+from os import open as open_fd, close as close_fd, fstat, stat, O_CREAT, O_RDWR
+from os.path import dirname
+from fcntl import flock, LOCK_EX, LOCK_NB
+from subprocess import Popen, PIPE
+from tempfile import mkdtemp
+from numpy import ndarray, zeros
+from modules._types import IRegressionTrainingConfig, IRegressionTrainingCertificate, IRegressionTrainAndTestDatasets
+from modules.utils.Utils import Utils
+from modules.epoch.Epoch import Epoch
+from modules.epoch.EpochPath import EpochPath
+from modules.regression.RegressionTraining import RegressionTraining
+from modules.regression.RegressionTrainingScheduler import RegressionTrainingScheduler
+from tests.synthetic_data import make_regression_ids
+
+
+
+
+
+
+## Helpers ##
+
+
+
+# Synthetic Regressions
+CONFIGS: List[IRegressionTrainingConfig] = [{ "id": id } for id in make_regression_ids(5)]
+
+# The regressions that have been trained
+TRAINED_IDS: List[str] = []
+
+# Script that locks a file and holds it until the process is terminated
+HOLD_LOCK_SCRIPT: str = """
+from sys import argv
+from time import sleep
+from os import open, O_CREAT, O_RDWR
+from fcntl import flock, LOCK_EX
+fd = open(argv[1], O_CREAT | O_RDWR)
+flock(fd, LOCK_EX)
+print("locked", flush=True)
+sleep(600)
+"""
+
+
+
+class _SyntheticTraining(RegressionTraining):
+    """Replaces the training of a regression. It saves the certificate right away
+    and records the regressions that were trained.
+    """
+    def __init__(self, config: IRegressionTrainingConfig, datasets: IRegressionTrainAndTestDatasets, verbose: bool = True):
+        self.id: str = config["id"]
+
+    def train(self) -> IRegressionTrainingCertificate:
+        TRAINED_IDS.append(self.id)
+        cert: IRegressionTrainingCertificate = { "id": self.id, "training_wall_time": 1, "training_throughput": 1 }
+        Utils.write(Epoch.PATH.regression_certificate(self.id), cert)
+        return cert
+
+    @staticmethod
+    def make_train_and_test_datasets(source: Union[ndarray, None] = None) -> IRegressionTrainAndTestDatasets:
+        return zeros((8, 4)), zeros((8, 1)), zeros((2, 4)), zeros((2, 1))
+
+
+
+
+def _save_certificate(id: str) -> None:
+    """Saves the certificate of a regression as if it had been trained by another worker.
+
+    Args:
+        id: str
+            The identifier of the regression.
+    """
+    Utils.write(Epoch.PATH.regression_certificate(id), { "id": id, "training_wall_time": 0, "training_throughput": 0 })
+
+
+
+
+def _hold_lock(id: str) -> Popen:
+    """Claims the job of a regression from a separate process, the way a worker would.
+
+    Args:
+        id: str
+            The identifier of the regression.
+
+    Returns:
+        Popen
+        The process that holds the lock. Once it is killed, the OS releases the lock.
+    """
+    process: Popen = Popen([executable, "-c", HOLD_LOCK_SCRIPT, Epoch.PATH.regression_training_lock(id)], stdout=PIPE, text=True)
+    if process.stdout.readline().strip() != "locked":
+        process.kill()
+        raise RuntimeError(f"The lock of {id} could not be held.")
+    return process
+
+
+
+
+
+
+# Test Class
+class RegressionTrainingSchedulerTestCase(TestCase):
+    # Before Tests
+    def setUp(self):
+        # Isolate the epoch's files
+        self.epoch_path: EpochPath = Epoch.PATH
+        Epoch.PATH = EpochPath(mkdtemp())
+        Utils.make_directory(dirname(Epoch.PATH.regression_training_lock(CONFIGS[0]["id"])))
+
+        # Replace the training of the regressions
+        self.regression_training = modules[RegressionTrainingScheduler.__module__].RegressionTraining
+        modules[RegressionTrainingScheduler.__module__].RegressionTraining = _SyntheticTraining
+        self.datasets: IRegressionTrainAndTestDatasets = _SyntheticTraining.make_train_and_test_datasets()
+        TRAINED_IDS.clear()
+
+    # After Tests
+    def tearDown(self):
+        Utils.remove_directory(Epoch.PATH.epoch_id)
+        Epoch.PATH = self.epoch_path
+        modules[RegressionTrainingScheduler.__module__].RegressionTraining = self.regression_training
+
+
+
+
+    # Can claim a job only if no other process holds its lock
+    def testClaimJob(self):
+        id: str = CONFIGS[0]["id"]
+        holder: Popen = _hold_lock(id)
+        try:
+            self.assertFalse(RegressionTrainingScheduler._train_job(CONFIGS[0], self.datasets, False))
+            self.assertListEqual(TRAINED_IDS, [])
+            self.assertIsNone(RegressionTraining.get_certificate(id))
+
+            # Other jobs can be claimed in the meantime
+            self.assertTrue(RegressionTrainingScheduler._train_job(CONFIGS[1], self.datasets, False))
+            self.assertListEqual(TRAINED_IDS, [CONFIGS[1]["id"]])
+        finally:
+            holder.kill()
+            holder.wait()
+
+
+
+
+    # Can claim a job again once the worker that held it crashes
+    def testReclaimJobAfterCrash(self):
+        id: str = CONFIGS[0]["id"]
+        holder: Popen = _hold_lock(id)
+        self.assertFalse(RegressionTrainingScheduler._train_job(CONFIGS[0], self.datasets, False))
+
+        # Kill the worker without releasing the lock
+        holder.kill()
+        holder.wait()
+        self.assertTrue(RegressionTrainingScheduler._train_job(CONFIGS[0], self.datasets, False))
+        self.assertListEqual(TRAINED_IDS, [id])
+        self.assertEqual(RegressionTraining.get_certificate(id)["id"], id)
+
+
+
+
+    # Can keep the lock file so a process that opened it while the job was being trained locks the same file
+    def testLockFileIsKept(self):
+        id: str = CONFIGS[0]["id"]
+        lock_path: str = Epoch.PATH.regression_training_lock(id)
+        fd: int = open_fd(lock_path, O_CREAT | O_RDWR)
+        try:
+            self.assertTrue(RegressionTrainingScheduler._train_job(CONFIGS[0], self.datasets, False))
+            self.assertTrue(Utils.file_exists(lock_path))
+            self.assertEqual(stat(lock_path).st_ino, fstat(fd).st_ino)
+
+            # The lock can be acquired by the contender and it excludes any new claims
+            flock(fd, LOCK_EX | LOCK_NB)
+            self.assertFalse(RegressionTrainingScheduler._train_job(CONFIGS[0], self.datasets, False))
+        finally:
+            close_fd(fd)
+        self.assertListEqual(TRAINED_IDS, [id])
+
+
+
+
+    # Can skip the jobs that already have a certificate
+    def testSkipCertifiedJobs(self):
+        _save_certificate(CONFIGS[0]["id"])
+        self.assertTrue(RegressionTrainingScheduler._train_job(CONFIGS[0], self.datasets, False))
+        self.assertListEqual(TRAINED_IDS, [])
+
+
+
+
+    # Can limit the number of workers to the number of pending configs
+    def testGetWorkers(self):
+        self.assertEqual(RegressionTrainingScheduler._get_workers(2, CONFIGS), 2)
+        self.assertEqual(RegressionTrainingScheduler._get_workers(8, CONFIGS), 5)
+        self.assertEqual(RegressionTrainingScheduler._get_workers(None, CONFIGS), min(Utils.get_tensorflow_workers(), 5))
+        self.assertEqual(RegressionTrainingScheduler._get_workers(0, CONFIGS), min(Utils.get_tensorflow_workers(), 5))
+
+        # The certified configs are not pending
+        for config in CONFIGS[:3]:
+            _save_certificate(config["id"])
+        self.assertEqual(RegressionTrainingScheduler._get_workers(8, CONFIGS), 2)
+        for config in CONFIGS[3:]:
+            _save_certificate(config["id"])
+        self.assertEqual(RegressionTrainingScheduler._get_workers(8, CONFIGS), 1)
+
+
+
+
+    # Can train the pending jobs of a batch and return the certificates in the original order
+    def testRunBatch(self):
+        _save_certificate(CONFIGS[1]["id"])
+        _save_certificate(CONFIGS[3]["id"])
+        certificates: List[IRegressionTrainingCertificate] = RegressionTrainingScheduler.run(
+            { "name": "KR_SYNTHETIC_1_1.json", "configs": CONFIGS }, 1
+        )
+        self.assertListEqual([cert["id"] for cert in certificates], [config["id"] for config in CONFIGS])
+        self.assertListEqual(TRAINED_IDS, [CONFIGS[0]["id"], CONFIGS[2]["id"], CONFIGS[4]["id"]])
+        self.assertEqual(certificates[1]["training_wall_time"], 0)
+
+
+
+
+
+
+# Test Execution
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,14 @@
 from typing import Tuple
 from unittest import TestCase, main
 from copy import deepcopy
-from numpy import ndarray, concatenate
+from math import floor
+from numpy import ndarray, concatenate, arange, array_equal
 from modules._types import IKerasModelConfig, IRegressionTrainingConfig, IRegressionTrainAndTestDatasets
 from modules.candlestick.Candlestick import Candlestick
 from modules.epoch.Epoch import Epoch
+from modules.regression.RegressionDataset import RegressionDataset
 from modules.regression.RegressionTraining import RegressionTraining
+from modules.keras_utils.WindowSequence import WindowSequence
 
 
 
@@ -154,6 +157,53 @@ class RegressionTrainingTestCase(TestCase):
 
 
 
+    # Can split the train dataset into sequences and only shuffle the train rows
+    def testSequences(self):
+        # Init a dataset in which each row can be identified by its features
+        features: ndarray = arange(1003 * 4).reshape(1003, 4)
+        labels: ndarray = arange(1003 * 2).reshape(1003, 2)
+
+        # The validation rows are taken from the end of the dataset
+        for validation_split in [0.2, 0.3, 0.35]:
+            train, validation = RegressionDataset.make_sequences(features, labels, validation_split, 64)
+            split: int = int(floor(features.shape[0] * (1 - validation_split)))
+            self.assertEqual(train.x.shape[0], split)
+            self.assertTrue(array_equal(concatenate((train.x, validation.x)), features))
+            self.assertTrue(array_equal(concatenate((train.y, validation.y)), labels))
+
+            # Only the train rows are shuffled and all of them are streamed once per epoch
+            train_x: ndarray = concatenate([train[i][0] for i in range(len(train))])
+            self.assertFalse(array_equal(train_x, train.x))
+            self.assertTrue(array_equal(train_x[train_x[:, 0].argsort()], train.x))
+            self.assertTrue(array_equal(concatenate([validation[i][0] for i in range(len(validation))]), validation.x))
+            self.assertTrue(array_equal(concatenate([validation[i][1] for i in range(len(validation))]), validation.y))
+
+
+
+
+    # Can shuffle the train rows differently on every epoch and the same way when the training is resumed
+    def testSequencesShufflingByEpoch(self):
+        features: ndarray = arange(500 * 4).reshape(500, 4)
+        labels: ndarray = arange(500 * 2).reshape(500, 2)
+
+        # Record the permutations of the first epochs
+        sequence: WindowSequence = WindowSequence(features, labels, 64, True, Epoch.SEED)
+        permutations: list = []
+        for _ in range(4):
+            permutations.append(sequence.indexes.copy())
+            sequence.on_epoch_end()
+        self.assertFalse(array_equal(permutations[0], permutations[1]))
+
+        # A resumed training shuffles the rows the same way the original would have
+        for initial_epoch in range(4):
+            resumed: WindowSequence = WindowSequence(features, labels, 64, True, Epoch.SEED, initial_epoch)
+            self.assertTrue(array_equal(resumed.indexes, permutations[initial_epoch]))
+
+
+
+
+
+
 # Test Execution
 if __name__ == '__main__':
     main()
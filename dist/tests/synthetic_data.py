@@ -0,0 +1,197 @@
+from typing import List, Dict
+from numpy import ndarray, arange, empty, around, exp, cumsum, maximum, minimum, absolute
+from numpy.random import RandomState
+from pandas import DataFrame
+from modules.prediction_model.PredictionModelBacktest import PredictionModelBacktest
+
+
+
+# SYNTHETIC DATA
+# Builders shared by the tests that need deterministic candlesticks, features and labels
+# without downloading or training anything. Keep in mind that this module is not
+# collected as a test file.
+
+
+
+
+
+## Candlesticks ##
+
+
+
+# The number of 1m candlesticks within a prediction candlestick (an index of the test dataset)
+MINUTES_PER_PREDICTION_CANDLESTICK: int = 15
+
+# The open time of the first candlestick
+START_TIME: int = 1609459200000
+
+
+
+def make_candlesticks(seed: int, minutes: int, large_wicks_probability: float = 0) -> DataFrame:
+    """Builds the 1m candlesticks dataframe based on a random walk. Some of the candlesticks
+    can have large wicks on both sides so the increase and decrease prices of a position
+    are hit at the same time.
+
+    Args:
+        seed: int
+            The seed used to generate the prices.
+        minutes: int
+            The number of 1m candlesticks.
+        large_wicks_probability: float
+            The probability of a candlestick having large wicks (0 - 1).
+
+    Returns:
+        DataFrame
+    """
+    rs: RandomState = RandomState(seed)
+    c: ndarray = around(30000 * exp(cumsum(rs.normal(0, 0.002, minutes))), 2)
+    o: ndarray = c.copy()
+    o[1:] = c[:-1]
+    wicks: ndarray = (rs.uniform(0, 1, minutes) < large_wicks_probability) * 0.06
+    ot: ndarray = START_TIME + arange(minutes) * 60000
+    return DataFrame({
+        "ot": ot,
+        "ct": ot + 59999,
+        "o": o,
+        "h": around(maximum(o, c) * (1 + absolute(rs.normal(0, 0.001, minutes)) + wicks), 2),
+        "l": around(minimum(o, c) * (1 - absolute(rs.normal(0, 0.001, minutes)) - wicks), 2),
+        "c": c,
+        "v": around(rs.uniform(1, 100, minutes), 2)
+    })
+
+
+
+
+def make_prediction_candlesticks(df: DataFrame) -> DataFrame:
+    """Builds the prediction candlesticks dataframe by grouping the 1m candlesticks.
+
+    Args:
+        df: DataFrame
+            The 1m candlesticks.
+
+    Returns:
+        DataFrame
+    """
+    groups = df.groupby(arange(df.shape[0]) // MINUTES_PER_PREDICTION_CANDLESTICK)
+    return DataFrame({
+        "ot": groups["ot"].first(),
+        "ct": groups["ct"].last(),
+        "o": groups["o"].first(),
+        "h": groups["h"].max(),
+        "l": groups["l"].min(),
+        "c": groups["c"].last(),
+        "v": groups["v"].sum()
+    }).reset_index(drop=True)
+
+
+
+
+def make_backtest_candlesticks(o: ndarray, h: ndarray, l: ndarray) -> ndarray:
+    """Builds the indexed 1m candlestick records used by the backtests out of the
+    open, high and low prices.
+
+    Args:
+        o: ndarray
+        h: ndarray
+        l: ndarray
+            The prices of the candlesticks.
+
+    Returns:
+        ndarray
+    """
+    candlesticks: ndarray = empty(o.shape[0], dtype=PredictionModelBacktest.CANDLESTICK_DTYPE)
+    candlesticks["ot"] = START_TIME + arange(o.shape[0]) * 60000
+    candlesticks["ct"] = candlesticks["ot"] + 59999
+    candlesticks["o"] = o
+    candlesticks["h"] = h
+    candlesticks["l"] = l
+    candlesticks["i"] = arange(o.shape[0]) // MINUTES_PER_PREDICTION_CANDLESTICK
+    return candlesticks
+
+
+
+
+def make_random_backtest_candlesticks(seed: int, indexes: int) -> ndarray:
+    """Builds the indexed 1m candlestick records used by the backtests based on a
+    random walk.
+
+    Args:
+        seed: int
+            The seed used to generate the prices.
+        indexes: int
+            The number of indexes (prediction candlesticks) in the test dataset.
+
+    Returns:
+        ndarray
+    """
+    df: DataFrame = make_candlesticks(seed, indexes * MINUTES_PER_PREDICTION_CANDLESTICK)
+    return make_backtest_candlesticks(df["o"].to_numpy(), df["h"].to_numpy(), df["l"].to_numpy())
+
+
+
+
+
+
+
+
+
+
+## Regressions ##
+
+
+
+
+def make_regression_ids(regressions: int) -> List[str]:
+    """Builds the IDs of the synthetic regressions.
+
+    Args:
+        regressions: int
+            The number of regressions.
+
+    Returns:
+        List[str]
+    """
+    return [f"KR_SYNTHETIC_{i}" for i in range(regressions)]
+
+
+
+
+def make_features(seed: int, regressions: int, features_num: int) -> ndarray:
+    """Builds a features matrix (regressions x features) with values ranging -1 to 1,
+    rounded to 6 decimals like the predicted ones. Roughly 10% of them are neutral.
+
+    Args:
+        seed: int
+            The seed used to generate the features.
+        regressions: int
+            The number of regressions.
+        features_num: int
+            The number of features per regression.
+
+    Returns:
+        ndarray
+    """
+    rs: RandomState = RandomState(seed)
+    features: ndarray = around(rs.uniform(-1, 1, (regressions, features_num)), 6)
+    features[rs.uniform(0, 1, features.shape) < 0.1] = 0
+    return features
+
+
+
+
+def make_labels(seed: int, price_change_requirements: List[float], labels_num: int) -> Dict[str, ndarray]:
+    """Builds the labels arrays for a list of price change requirements.
+
+    Args:
+        seed: int
+            The seed used to generate the labels.
+        price_change_requirements: List[float]
+            The price change requirements.
+        labels_num: int
+            The number of labels per price change requirement.
+
+    Returns:
+        Dict[str, ndarray]
+    """
+    rs: RandomState = RandomState(seed)
+    return { str(pcr): rs.choice([-1, 0, 1], labels_num).astype("int8") for pcr in price_change_requirements }
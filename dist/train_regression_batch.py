@@ -1,13 +1,13 @@
 from typing import List, Union
 from argparse import ArgumentParser
-from modules._types import IRegressionTrainingConfigBatch, IRegressionTrainingCertificate, \
-    IRegressionTrainAndTestDatasets
+from modules._types import IRegressionTrainingConfigBatch, IRegressionTrainingCertificate
 from modules.utils.Utils import Utils
 from modules.configuration.Configuration import Configuration
 from modules.candlestick.Candlestick import Candlestick
 from modules.epoch.Epoch import Epoch
 from modules.regression.RegressionTrainingConfig import RegressionTrainingConfig
 from modules.regression.RegressionTraining import RegressionTraining
+from modules.regression.RegressionTrainingScheduler import RegressionTrainingScheduler
 
 
 
@@ -15,90 +15,62 @@ from modules.regression.RegressionTraining import RegressionTraining
 # Args:
 #   --category "DNN"
 #   --batch_file_name "KR_LSTM_7_23.json"
-endpoint_name: str = "REGRESSION TRAINING"
-Utils.endpoint_header(Configuration.VERSION, endpoint_name)
+#   --workers? "2"
+# Keep in mind that the regressions can be trained by spawned processes which import this
+# file. Therefore, the script can only be executed as the main module.
+if __name__ == "__main__":
+    endpoint_name: str = "REGRESSION TRAINING"
+    Utils.endpoint_header(Configuration.VERSION, endpoint_name)
 
 
 
 
-# EPOCH INIT
-Epoch.init()
+    # EPOCH INIT
+    Epoch.init()
 
 
 
 
-# Extract the args
-parser = ArgumentParser()
-parser.add_argument("--category", dest="category")
-parser.add_argument("--batch_file_name", dest="batch_file_name")
-args = parser.parse_args()
+    # Extract the args
+    parser = ArgumentParser()
+    parser.add_argument("--category", dest="category")
+    parser.add_argument("--batch_file_name", dest="batch_file_name")
+    parser.add_argument("--workers", dest="workers", nargs='?')
+    args = parser.parse_args()
+    workers: Union[int, None] = int(args.workers) if isinstance(args.workers, str) and args.workers.isdigit() else None
 
 
 
-# CANDLESTICK INITIALIZATION
-# Initialize the Candlesticks Module based on the regression lookback.
-Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.START, Epoch.END)
+    # CANDLESTICK INITIALIZATION
+    # Initialize the Candlesticks Module based on the regression lookback.
+    Candlestick.init(Epoch.REGRESSION_LOOKBACK, Epoch.START, Epoch.END)
 
 
 
 
-# Retrieve the batch config
-config_batch: IRegressionTrainingConfigBatch = RegressionTrainingConfig.get_batch(args.category, args.batch_file_name)
+    # Retrieve the batch config
+    config_batch: IRegressionTrainingConfigBatch = RegressionTrainingConfig.get_batch(args.category, args.batch_file_name)
 
 
 
-# DATASETS
-# The packed datasets that will be used to train and evaluate regressions.
-datasets: IRegressionTrainAndTestDatasets = RegressionTraining.make_train_and_test_datasets()
 
+    # REGRESSION TRAINING EXECUTION
+    # Builds, trains, saves and evaluates models. Once models finish training, their file as well as the
+    # certificate is saved in the models directory. The models are trained by as many workers as the
+    # hardware allows, unless the number of workers is provided.
+    # When the process completes, it saves all the certificates into a single batch.
+    # Keep in mind that the training of a model will be skipped if the certificate exists.
+    certificates: List[IRegressionTrainingCertificate] = RegressionTrainingScheduler.run(config_batch, workers)
 
 
 
-# CERTIFICATES
-# This file will be used to create the certificates batch once all models finish training.
-certificates: List[IRegressionTrainingCertificate] = []
+    # Save the batched training certificates once they are all available
+    RegressionTraining.save_certificates_batch(config_batch["name"], certificates)
 
 
 
 
-# REGRESSION TRAINING EXECUTION
-# Builds, trains, saves and evaluates models. Once models finish training, their file as well as the
-# certificate is saved in the models directory. 
-# When the process completes, it saves all the certificates into a single batch.
-# Keep in mind that the training of a model will be skipped if the certificate exists.
-print(f"Batch: {config_batch['name']}\n")
-for index, model_config in enumerate(config_batch["configs"]):
-    # Retrieve the certificate (if any)
-    cert: Union[IRegressionTrainingCertificate, None] = RegressionTraining.get_certificate(model_config["id"])
 
-    # Check if the model needs to be trained
-    if cert is None:
-        # Log the progress
-        print(f"\n{index + 1}/{len(config_batch['configs'])}) {model_config['id']}")
 
-        # Initialize the training instance
-        training: RegressionTraining = RegressionTraining(model_config, datasets)
-
-        # Train and discover the model
-        cert = training.train()
-    
-    # Otherwise, skip the training
-    else:
-        # Log the progress
-        print(f"\n{index + 1}/{len(config_batch['configs'])}) {model_config['id']}: Skipped")
-
-    # Add the certificate to the list
-    certificates.append(cert)
-
-
-
-# Save the batched training certificates once they are all available
-RegressionTraining.save_certificates_batch(config_batch["name"], certificates)
-
-
-
-
-
-
-# End of Script
-Utils.endpoint_footer(endpoint_name)
\ No newline at end of file
+    # End of Script
+    Utils.endpoint_footer(endpoint_name)